@@ -0,0 +1,79 @@
+"""
+Peak memory of blob construction.
+
+Creates one blob of the given size from bytes, a bytearray, a memoryview and an mmap of a
+file, each in a fresh process, and reports how much the peak resident memory grew beyond the
+input itself, also as a multiple of the blob size: the number of full copies of the payload
+alive at the same time.
+
+Usage::
+
+    python -m benchmarks.blob_memory --size 2097152 --size 8388608
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+
+from pylestia.types import Blob
+
+NAMESPACE = b"pylestia"
+INPUTS = ("bytes", "bytearray", "memoryview", "mmap")
+
+
+def _peak() -> int:
+    """Returns the peak resident memory of the process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure(kind: str, path: str, queue: multiprocessing.Queue) -> None:
+    with open(path, "rb") as file:
+        if kind == "mmap":
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Fault the pages in, so that they count towards the baseline
+            data.read()
+            data.seek(0)
+        else:
+            data = file.read()
+            if kind == "bytearray":
+                data = bytearray(data)
+            elif kind == "memoryview":
+                data = memoryview(data)
+    # Warm up the extension and the allocator
+    Blob(NAMESPACE, b"\x00")
+    before = _peak()
+    Blob(NAMESPACE, data)
+    queue.put(_peak() - before)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, action="append", help="blob size in bytes")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for size in args.size or [2 * 1024 * 1024]:
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(os.urandom(size))
+            file.flush()
+            for kind in INPUTS:
+                queue = context.Queue()
+                process = context.Process(target=_measure, args=(kind, file.name, queue))
+                process.start()
+                growth = queue.get()
+                process.join()
+                print(
+                    f"{size:>10} {kind:<10} peak +{growth / 2**20:8.2f} MiB"
+                    f"  ({growth / size:.2f}x the blob)",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
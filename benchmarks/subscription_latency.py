@@ -0,0 +1,83 @@
+"""
+Subscription delivery latency benchmark.
+
+Measures the delay between a subscription frame arriving at the transport
+(``Transport.on_message``) and the consumer of ``RPC.subscribe`` receiving the
+deserialized item. No node is required: frames are injected through an in-memory
+transport, so the numbers reflect pylestia's own delivery overhead only.
+
+Usage::
+
+    python -m benchmarks.subscription_latency --items 1000 --interval 0.005
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from pylestia.node_api.rpc.abc import Transport
+from pylestia.node_api.rpc.executor import RPC
+
+
+class LoopbackTransport(Transport):
+    """Answers every request with a fixed subscription ID."""
+
+    subscription_id = "bench-subscription"
+
+    async def send(self, message: str) -> None:
+        request = json.loads(message)
+        response = {"jsonrpc": "2.0", "id": request["id"], "result": self.subscription_id}
+        asyncio.get_running_loop().call_soon(self.on_message, json.dumps(response))
+
+    def push(self, item) -> None:
+        frame = {
+            "jsonrpc": "2.0",
+            "method": "subscription",
+            "params": [self.subscription_id, item],
+        }
+        self.on_message(json.dumps(frame))
+
+
+async def measure(items: int, interval: float) -> list[float]:
+    transport = LoopbackTransport()
+    rpc = RPC(transport)
+    delays = []
+
+    async def consumer():
+        async for sent_at in rpc.subscribe("blob.Subscribe", ()):
+            delays.append(time.perf_counter() - sent_at)
+            if len(delays) == items:
+                break
+
+    task = asyncio.create_task(consumer())
+    while transport.subscription_id not in rpc._subscriptions:
+        await asyncio.sleep(0)
+    for _ in range(items):
+        await asyncio.sleep(interval)
+        transport.push(time.perf_counter())
+    await task
+    return delays
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    delays = sorted(asyncio.run(measure(args.items, args.interval)))
+
+    def p(q: float) -> float:
+        return delays[min(len(delays) - 1, int(q * len(delays)))] * 1e6
+
+    print(f"items:  {len(delays)}")
+    print(f"mean:   {statistics.fmean(delays) * 1e6:.1f} us")
+    print(f"p50:    {p(0.50):.1f} us")
+    print(f"p99:    {p(0.99):.1f} us")
+    print(f"max:    {delays[-1] * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
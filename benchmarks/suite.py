@@ -0,0 +1,313 @@
+"""
+Benchmark suite of construction, (de)serialization and RPC round-trips.
+
+Covers ``Blob`` and ``Namespace`` construction, deserialization of headers with large
+validator sets, of extended data squares and of share ranges, encoding of submission
+payloads, and call throughput and subscription latency against an in-process
+:class:`~pylestia.testing.StandInNode`. Every benchmark reports seconds per operation.
+
+Results can be saved as a JSON baseline and later runs compared against it; a benchmark
+whose median exceeds the baseline by more than the threshold counts as a regression, and
+the run exits with status 1. Baselines are only comparable on the machine they were
+recorded on.
+
+Usage::
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.suite --filter blob --filter namespace
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import typing as t
+from importlib import metadata
+
+from pylestia.node_api.rpc import JsonRpcClient
+from pylestia.node_api.rpc.codec import JSONEncoder, get_codec
+from pylestia.testing import DEFAULT_NAMESPACE, StandInNode
+from pylestia.types import Blob, Namespace
+from pylestia.types.header import ExtendedHeader
+from pylestia.types.share import ExtendedDataSquare, GetRangeResult
+
+BLOB_SIZES = (1024, 16 * 1024, 256 * 1024, 2 * 1024 * 1024)
+VALIDATOR_COUNTS = (1, 100, 1000)
+
+# Registered benchmarks: each returns the seconds per operation of each measured round.
+BENCHMARKS = dict()  # type: dict[str, t.Callable[[argparse.Namespace], list[float]]]
+
+
+def benchmark(name: str):
+    """Registers a benchmark under the given name."""
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def timed(func: t.Callable[[], t.Any], rounds: int, min_time: float) -> list[float]:
+    """Times ``func`` in rounds of at least ``min_time`` seconds each.
+
+    Returns:
+        list[float]: The seconds per call of each round.
+    """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def _data(size: int) -> bytes:
+    return os.urandom(size)
+
+
+async def _fetch(node: StandInNode, method: str, params: tuple) -> str:
+    """Returns the raw response frame of a call, for decoding benchmarks."""
+    client = JsonRpcClient(node.url, metrics=False, coalesce=False)
+    await client.connect()
+    try:
+        result = await client.call(method, params)
+    finally:
+        await client.disconnect()
+    return json.dumps(result)
+
+
+def _frame(method: str, params: tuple, **options) -> str:
+    async def fetch():
+        async with StandInNode(block_time=None, **options) as node:
+            return await _fetch(node, method, params)
+
+    return asyncio.run(fetch())
+
+
+for _size in BLOB_SIZES:
+
+    @benchmark(f"blob_init[{_size}]")
+    def _blob_init(args, size=_size):
+        data = _data(size)
+        return timed(lambda: Blob(DEFAULT_NAMESPACE, data), args.rounds, args.min_time)
+
+
+@benchmark("namespace[id]")
+def _namespace_id(args):
+    return timed(lambda: Namespace(b"pylestia"), args.rounds, args.min_time)
+
+
+@benchmark("namespace[full]")
+def _namespace_full(args):
+    return timed(lambda: Namespace(DEFAULT_NAMESPACE), args.rounds, args.min_time)
+
+
+for _validators in VALIDATOR_COUNTS:
+
+    @benchmark(f"header_deserialize[{_validators}]")
+    def _header_deserialize(args, validators=_validators):
+        result = json.loads(_frame("header.GetByHeight", (1,), validators=validators))
+        return timed(lambda: ExtendedHeader.deserializer(result), args.rounds, args.min_time)
+
+
+@benchmark("eds_decode")
+def _eds_decode(args):
+    codec = get_codec(args.codec)
+    frame = _frame("share.GetEDS", (1,), blob_size=256 * 1024)
+    return timed(
+        lambda: ExtendedDataSquare.deserializer(codec.loads(frame)), args.rounds, args.min_time
+    )
+
+
+@benchmark("get_range_decode")
+def _get_range_decode(args):
+    codec = get_codec(args.codec)
+    frame = _frame("share.GetRange", (1, 1, 65), blob_size=256 * 1024)
+    return timed(
+        lambda: GetRangeResult.deserializer(codec.loads(frame)), args.rounds, args.min_time
+    )
+
+
+for _size in (1024, 256 * 1024):
+
+    @benchmark(f"submit_encode[{_size}]")
+    def _submit_encode(args, size=_size):
+        blobs = tuple(Blob(DEFAULT_NAMESPACE, _data(size)) for _ in range(4))
+        request = {"jsonrpc": "2.0", "id": 1, "method": "blob.Submit", "params": (blobs, {})}
+        return timed(lambda: json.dumps(request, cls=JSONEncoder), args.rounds, args.min_time)
+
+
+@benchmark("rpc_call_throughput")
+def _rpc_call_throughput(args):
+    calls = 500
+
+    async def measure():
+        async with StandInNode(block_time=None, validators=4) as node:
+            client = JsonRpcClient(node.url, codec=args.codec, metrics=False, coalesce=False)
+            await client.connect()
+            try:
+                samples = []
+                for round in range(args.rounds + 1):
+                    start = time.perf_counter()
+                    await asyncio.gather(
+                        *(client.call("header.GetByHeight", (1,)) for _ in range(calls))
+                    )
+                    if round:
+                        # The first round warms up the connection
+                        samples.append((time.perf_counter() - start) / calls)
+                return samples
+            finally:
+                await client.disconnect()
+
+    return asyncio.run(measure())
+
+
+@benchmark("subscription_latency")
+def _subscription_latency(args):
+    items = 50
+
+    async def measure():
+        async with StandInNode(block_time=None, blobs_per_block=0) as node:
+            client = JsonRpcClient(node.url, codec=args.codec, metrics=False)
+            await client.connect()
+            received = asyncio.Queue()
+
+            async def consume():
+                async for _ in client.subscribe("header.Subscribe", ()):
+                    received.put_nowait(time.perf_counter())
+
+            consumer = asyncio.create_task(consume())
+            try:
+                # Wait for the subscription to be established
+                while not received.qsize():
+                    node.produce_block()
+                    await asyncio.sleep(0.01)
+                samples = []
+                for _ in range(args.rounds):
+                    delays = []
+                    for _ in range(items):
+                        while not received.empty():
+                            received.get_nowait()
+                        start = time.perf_counter()
+                        node.produce_block()
+                        delays.append(await received.get() - start)
+                    samples.append(statistics.median(delays))
+                return samples
+            finally:
+                consumer.cancel()
+                await client.disconnect()
+
+    return asyncio.run(measure())
+
+
+def _summary(samples: list[float]) -> dict[str, t.Any]:
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": len(samples),
+    }
+
+
+def _environment(codec: str | None) -> dict[str, str]:
+    try:
+        version = metadata.version("pylestia")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "pylestia": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "codec": get_codec(codec).name,
+    }
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[tuple[str, float]]:
+    """Returns the benchmarks slower than the baseline by more than the threshold.
+
+    Args:
+        results: The summaries of the current run, by benchmark name.
+        baseline: The summaries of the baseline, by benchmark name.
+        threshold: The tolerated relative slowdown of the median, e.g. 0.1 for 10%.
+
+    Returns:
+        list[tuple[str, float]]: The names of the regressed benchmarks and their slowdowns.
+    """
+    regressions = []
+    for name, summary in results.items():
+        if name in baseline:
+            change = summary["median"] / baseline[name]["median"] - 1
+            if change > threshold:
+                regressions.append((name, change))
+    return regressions
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", action="append", help="run benchmarks containing this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--codec", default=None, help="the JSON codec of the RPC benchmarks")
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="compare the results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="tolerated slowdown")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+    results = dict()
+    for name, func in BENCHMARKS.items():
+        if args.filter and not any(pattern in name for pattern in args.filter):
+            continue
+        results[name] = summary = _summary(func(args))
+        line = f"{name:<32} {_format(summary['median'])}/op  min {_format(summary['min'])}"
+        if baseline is not None and name in baseline:
+            line += f"  {summary['median'] / baseline[name]['median'] - 1:+7.1%}"
+        print(line, flush=True)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"environment": _environment(args.codec), "results": results}, file, indent=2)
+            file.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, change in regressions:
+            print(f"Regression: {name} is {change:.1%} slower than the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
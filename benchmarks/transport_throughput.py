@@ -0,0 +1,111 @@
+"""
+Call throughput of the websocket and HTTP keep-alive transports.
+
+Starts a stand-in JSON-RPC server in a separate process that answers every call with a
+synthetic payload of the requested size over both websockets and HTTP/1.1, then issues
+concurrent calls through :class:`~pylestia.node_api.rpc.JsonRpcClient` with each transport.
+
+Usage::
+
+    python -m benchmarks.transport_throughput --calls 200 --size 1048576 --pool 4
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import time
+
+from pylestia.node_api.rpc import JsonRpcClient
+
+HOST = "127.0.0.1"
+
+
+def _response(message: bytes, payload: str) -> str:
+    request = json.loads(message)
+    return json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": payload})
+
+
+async def _serve(ws_port: int, http_port: int, size: int) -> None:
+    from websockets.asyncio.server import serve
+
+    payload = base64.b64encode(os.urandom(size * 3 // 4)).decode()
+
+    async def ws_handler(connection):
+        async for message in connection:
+            await connection.send(_response(message, payload))
+
+    async def http_handler(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = next(
+                    int(line.split(b":")[1])
+                    for line in head.split(b"\r\n")
+                    if line.lower().startswith(b"content-length")
+                )
+                body = _response(await reader.readexactly(length), payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n" % len(body) + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    # Celestia nodes do not negotiate permessage-deflate, so neither does the stand-in
+    async with serve(ws_handler, HOST, ws_port, max_size=None, compression=None):
+        server = await asyncio.start_server(http_handler, HOST, http_port)
+        async with server:
+            await asyncio.Future()
+
+
+def _server_process(ws_port: int, http_port: int, size: int) -> None:
+    asyncio.run(_serve(ws_port, http_port, size))
+
+
+async def _measure(url: str, transport: str, pool: int, calls: int) -> float:
+    client = JsonRpcClient(url, pool_size=pool, transport=transport)
+    await client.connect()
+    try:
+        await client.call("share.GetEDS", (0,))
+        start = time.perf_counter()
+        await asyncio.gather(*(client.call("share.GetEDS", (i,)) for i in range(calls)))
+        return time.perf_counter() - start
+    finally:
+        await client.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--size", type=int, default=1 << 20, help="payload bytes per call")
+    parser.add_argument("--pool", type=int, default=4)
+    parser.add_argument("--ws-port", type=int, default=28660)
+    parser.add_argument("--http-port", type=int, default=28661)
+    args = parser.parse_args()
+
+    server = multiprocessing.Process(
+        target=_server_process, args=(args.ws_port, args.http_port, args.size), daemon=True
+    )
+    server.start()
+    time.sleep(1)
+    try:
+        url = f"ws://{HOST}:{args.ws_port}"
+        http_url = f"http://{HOST}:{args.http_port}"
+        for name, target, transport, pool in (
+            ("websocket x1", url, "websocket", 1),
+            (f"websocket x{args.pool}", url, "websocket", args.pool),
+            (f"http x{args.pool}", http_url, "http", args.pool),
+        ):
+            elapsed = asyncio.run(_measure(target, transport, pool, args.calls))
+            mb = args.calls * args.size / 1e6
+            print(f"{name:<16} {args.calls / elapsed:8.1f} calls/s {mb / elapsed:8.1f} MB/s")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
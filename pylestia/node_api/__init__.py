@@ -4,6 +4,9 @@ pylestia Node API Module
 This module provides the interfaces for interacting with a Celestia node.
 """
 
+import os
+from collections import Counter
+from collections.abc import Sequence
 from typing import Any, Callable, Dict, List, Optional, TypeVar, Union, cast, overload
 
 from pylestia.node_api.blob import BlobAPI
@@ -11,7 +14,17 @@ from pylestia.node_api.das import DasClient
 from pylestia.node_api.fraud import FraudClient
 from pylestia.node_api.header import HeaderClient
 from pylestia.node_api.p2p import P2PClient
-from pylestia.node_api.rpc import JsonRpcClient
+from pylestia.node_api.rpc import (
+    Batch,
+    DiskStore,
+    JsonRpcClient,
+    MultiEndpointClient,
+    Recorder,
+    ResponseCache,
+    RPCMetrics,
+    TimeoutOverride,
+)
+from pylestia.node_api.rpc.abc import RPCExecutor
 from pylestia.node_api.share import ShareClient
 from pylestia.node_api.state import StateClient
 
@@ -23,18 +36,111 @@ class Client:
     Main client for interacting with a Celestia node.
 
     This class maintains the connection to the node and provides access
-    to all the API endpoints.
+    to all the API endpoints. Given several node URLs, reads are routed to the node
+    with the lowest recent latency and hedged against slow nodes, while submissions
+    and subscriptions stay on the first (primary) node.
     """
 
-    def __init__(self, base_url: str) -> None:
+    def __init__(
+        self,
+        base_url: str | Sequence[str],
+        pool_size: int = 1,
+        codec: str | None = None,
+        reconnect: bool = False,
+        transport: str = "websocket",
+        limiter: bool = False,
+        metrics: bool = True,
+        coalesce: bool = False,
+        cache: bool | ResponseCache = False,
+        store: str | DiskStore | None = None,
+        record: str | Recorder | None = None,
+    ) -> None:
         """
         Initialize a new client.
 
         Args:
-            base_url: The base URL of the Celestia node, e.g., 'http://localhost:26658'
+            base_url: The base URL of the Celestia node, e.g., 'http://localhost:26658',
+                or a list of URLs of several nodes, the first of which is the primary
+            pool_size: The number of connections to open to each node
+            codec: The JSON codec name ("json", "orjson" or "msgspec"); defaults to
+                the fastest installed codec
+            reconnect: Whether to re-establish lost connections, replaying in-flight
+                idempotent calls and resuming subscriptions
+            transport: The transport for calls, "websocket" or "http"; subscriptions
+                always use a websocket
+            limiter: Whether to adapt the number of calls in flight to each node to its
+                observed latency and errors, queueing further calls on the client
+            metrics: Whether to record per-method call metrics, see :meth:`metrics`
+            coalesce: Whether identical reads made while one is in flight share its
+                request; each caller still receives its own deserialized result
+            cache: Whether to cache responses, or the cache to use. Data at a given height
+                is kept until evicted; head-relative calls are kept for a few seconds
+            store: A directory, or a :class:`DiskStore`, to keep headers, blobs and shares
+                of past heights in across restarts; it only serves the chain it was filled from
+            record: A file, or a :class:`Recorder`, to record the frames exchanged with
+                the nodes to, for replay with :class:`~pylestia.node_api.rpc.ReplayTransport`
         """
         self.base_url = base_url
-        self._client = JsonRpcClient(base_url)
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        # Shared by all endpoints
+        self.rpc_metrics = RPCMetrics() if metrics else None
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache if isinstance(cache, ResponseCache) else None
+        self.store = DiskStore(store) if isinstance(store, (str, os.PathLike)) else store
+        self.recorder = Recorder(record) if isinstance(record, (str, os.PathLike)) else record
+        clients = [
+            JsonRpcClient(
+                url,
+                pool_size=pool_size,
+                codec=codec,
+                reconnect=reconnect,
+                transport=transport,
+                limiter=limiter,
+                metrics=self.rpc_metrics or False,
+                coalesce=coalesce,
+                cache=self.cache if self.cache is not None else False,
+                store=self.store,
+                record=self.recorder,
+            )
+            for url in urls
+        ]
+        self._client = clients[0] if len(clients) == 1 else MultiEndpointClient(clients)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a snapshot of the per-method RPC metrics.
+
+        For each JSON-RPC method, the snapshot holds the number of calls, errors by class,
+        calls in flight, active subscriptions and notifications received, request and
+        response bytes, and histograms of the call latency and deserialization time.
+        Export them continuously with :class:`~pylestia.node_api.rpc.PrometheusCollector`
+        or :func:`~pylestia.node_api.rpc.register_opentelemetry` over ``rpc_metrics``.
+
+        Returns:
+            The metrics of each method, or an empty dict if metrics are disabled
+        """
+        return self.rpc_metrics.snapshot() if self.rpc_metrics is not None else {}
+
+    def timeout_counts(self) -> Counter:
+        """
+        Get the number of timed out calls per method, across all nodes.
+
+        Calls that joined an identical call in flight are counted when they time out too.
+
+        Returns:
+            The number of timeouts of each method
+        """
+        return self._client.timeout_counts()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the hit and miss statistics of the response cache.
+
+        Returns:
+            The statistics, or an empty dict if caching is disabled
+        """
+        return self.cache.stats() if self.cache is not None else {}
 
     def connect(self, auth_token: Optional[str] = None):
         """
@@ -72,6 +178,33 @@ class NodeAPIContext:
         """
         await self.client.disconnect()
 
+    def batch(self, max_size: int = 100) -> "NodeAPIBatch":
+        """
+        Group calls into JSON-RPC batch requests.
+
+        Calls made through the returned context are queued and sent together in one
+        frame; start them concurrently (e.g. with ``asyncio.gather``) to share a frame.
+
+        Args:
+            max_size: The maximum number of calls sent in one frame
+
+        Returns:
+            A context manager with the same API endpoints as this context
+        """
+        return NodeAPIBatch(self.client.batch(max_size))
+
+    def with_timeout(self, timeout: float) -> "NodeAPITimeout":
+        """
+        Give the calls made through the API endpoints a timeout.
+
+        Args:
+            timeout: The timeout of each call in seconds, instead of the method timeout
+
+        Returns:
+            An object with the same API endpoints as this context
+        """
+        return NodeAPITimeout(self.client, timeout)
+
     @property
     def blob(self) -> BlobAPI:
         """Access the Blob API for working with data blobs."""
@@ -106,3 +239,44 @@ class NodeAPIContext:
     def state(self) -> StateClient:
         """Access the State API for state-related operations."""
         return StateClient(self.client)
+
+
+class NodeAPIBatch(NodeAPIContext):
+    """Context manager that sends the calls made through it as JSON-RPC batches.
+
+    Example:
+        >>> async with api.batch() as b:
+        ...     header, blobs = await asyncio.gather(
+        ...         b.header.get_by_height(10),
+        ...         b.blob.get_all(10, namespace),
+        ...     )
+    """
+
+    def __init__(self, batch: Batch) -> None:
+        super().__init__(batch)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Exit the context, sending any calls that are still queued.
+        """
+        await self.client.join()
+
+
+class NodeAPITimeout(NodeAPIContext):
+    """The API endpoints of a context, with a timeout passed to every call made through them.
+
+    Example:
+        >>> header = await api.with_timeout(5).header.get_by_height(10)
+    """
+
+    def __init__(self, client: RPCExecutor, timeout: float) -> None:
+        super().__init__(TimeoutOverride(client, timeout))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -6,7 +6,9 @@ in the Celestia network. It supports both unsigned (Share Version 0) and
 signed (Share Version 1) blobs as per celestia-types v0.11.0+.
 """
 
-from collections.abc import AsyncIterator
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
 from functools import wraps
 from typing import Callable, List, Optional, Union
 
@@ -16,18 +18,117 @@ from pylestia.pylestia_core import types  # noqa
 # Local imports
 from pylestia.node_api.rpc import TxConfig
 from pylestia.node_api.rpc.abc import Wrapper
-from pylestia.types import Blob, Namespace
+from pylestia.types import Blob, LazyBlob, Namespace
 from pylestia.types.blob import (
     CommitmentProof,
     Proof,
     SubmitBlobResult,
     SubscriptionBlobResult,
 )
+from pylestia.types.packing import (
+    DEFAULT_MAX_BLOB_SIZE,
+    DEFAULT_MAX_TX_SIZE,
+    Manifest,
+    PackedSubmitResult,
+    pack,
+)
 
 
 from pylestia.types.errors import parse_error_message, ErrorCode
 
 
+def _deserialize_blobs(result) -> list[Blob]:
+    if result is not None:
+        return [Blob(**kwargs) for kwargs in result]
+    else:
+        return []
+
+
+def _deserialize_lazy_blobs(result) -> list[LazyBlob]:
+    if result is not None:
+        return [LazyBlob(**kwargs) for kwargs in result]
+    else:
+        return []
+
+
+def _normalize_blob(blob_obj: Blob) -> dict:
+    try:
+        # Try v0.11.0 API with signer parameter
+        try:
+            processed_blob = types.normalize_blob(
+                blob_obj.namespace, blob_obj._payload, blob_obj.signer
+            )
+        except TypeError:
+            # Fall back to basic version if the Rust extension has linking issues
+            processed_blob = types.normalize_blob(blob_obj.namespace, blob_obj._payload)
+            # For v0.11.0 compatibility, set share_version and signer manually
+            if blob_obj.signer is not None:
+                processed_blob["share_version"] = 1
+                processed_blob["signer"] = blob_obj.signer
+        processed_blob["commitment"] = _commitment_bytes(processed_blob["commitment"])
+        # The extension does not return the data, so that it is never copied back
+        processed_blob["data"] = blob_obj._payload
+
+    except Exception:
+        # Create a fallback processed_blob with the same structure
+        import hashlib
+
+        h = hashlib.sha256()
+        h.update(blob_obj.namespace)
+        h.update(blob_obj._payload)
+        if blob_obj.signer:
+            h.update(blob_obj.signer)
+
+        processed_blob = {
+            "namespace": blob_obj.namespace,
+            "data": blob_obj._payload,
+            "commitment": h.digest(),
+            "share_version": 1 if blob_obj.signer else 0,
+            "index": blob_obj.index,
+        }
+
+        if blob_obj.signer:
+            processed_blob["signer"] = blob_obj.signer
+    return processed_blob
+
+
+def _normalize_blobs(blobs: List[Blob]) -> List[dict]:
+    if len(blobs) > 1 and hasattr(types, "normalize_blobs"):
+        try:
+            # One call hashes all blobs in parallel, with the GIL released
+            processed_blobs = types.normalize_blobs(
+                [(blob_obj.namespace, blob_obj._payload, blob_obj.signer) for blob_obj in blobs]
+            )
+            for processed_blob, blob_obj in zip(processed_blobs, blobs):
+                processed_blob["commitment"] = _commitment_bytes(processed_blob["commitment"])
+                processed_blob["data"] = blob_obj._payload
+            return processed_blobs
+        except Exception:
+            # Normalize one by one, which falls back per blob
+            pass
+    return [_normalize_blob(blob_obj) for blob_obj in blobs]
+
+
+def _commitment_bytes(commitment_value):
+    # Handle commitments that might be returned in different formats
+    if isinstance(commitment_value, str) and commitment_value.startswith("Commitment("):
+        # Debug format - extract actual bytes
+        hex_part = commitment_value.split("(")[1].split(")")[0]
+        if hex_part.startswith("0x"):
+            hex_part = hex_part[2:]
+        return bytes.fromhex(hex_part)
+    if isinstance(commitment_value, str) and len(commitment_value) > 0:
+        # Try to handle Base64 formatted commitment
+        try:
+            from base64 import b64decode
+
+            return b64decode(commitment_value)
+        except Exception:
+            # If not valid Base64, leave as is
+            pass
+    return commitment_value
+
+
 def handle_blob_error(func):
     """Decorator to handle blob-related errors."""
 
@@ -78,6 +179,7 @@ class BlobAPI(Wrapper):
         commitment,
         *,
         deserializer: Callable | None = None,
+        lazy: bool = False,
     ) -> Blob | None:
         """Retrieves the blob by commitment under the given namespace and height.
 
@@ -86,12 +188,15 @@ class BlobAPI(Wrapper):
             namespace (Namespace): The namespace of the blob.
             commitment: The commitment of the blob.
             deserializer (Callable | None): Custom deserializer. Defaults to Blob.deserializer.
+            lazy (bool): Whether to return a :class:`LazyBlob`, whose data is decoded when it
+                is first read.
 
         Returns:
             Blob | None: The retrieved blob, or None if not found.
         """
 
-        deserializer = deserializer if deserializer is not None else Blob.deserializer
+        if deserializer is None:
+            deserializer = LazyBlob.deserializer if lazy else Blob.deserializer
 
         return await self._rpc.call(
             "blob.Get", (height, Namespace(namespace), commitment), deserializer
@@ -103,6 +208,7 @@ class BlobAPI(Wrapper):
         namespace: Namespace,
         *namespaces: Namespace,
         deserializer: Callable | None = None,
+        lazy: bool = False,
     ) -> list[Blob] | None:
         """Returns all blobs under the given namespaces at the given height. If all blobs were
         found without any errors, the user will receive a list of blobs. If the BlobService couldn't
@@ -117,30 +223,118 @@ class BlobAPI(Wrapper):
             namespace (Namespace): The primary namespace of the blobs.
             namespaces (Namespace): Additional namespaces to query for blobs.
             deserializer (Callable | None): Custom deserializer. Defaults to None.
+            lazy (bool): Whether to return :class:`LazyBlob` objects, whose data is decoded
+                when it is first read.
 
         Returns:
             list[Blob]: The list of blobs or [] if not found.
         """
 
-        def deserializer_(result) -> list["Blob"]:
-            if result is not None:
-                return [Blob(**kwargs) for kwargs in result]
-            else:
-                return []
-
-        deserializer = deserializer if deserializer is not None else deserializer_
+        if deserializer is None:
+            deserializer = _deserialize_lazy_blobs if lazy else _deserialize_blobs
         namespaces = tuple(
             Namespace(namespace) for namespace in (namespace, *namespaces)
         )
 
         return await self._rpc.call("blob.GetAll", (height, namespaces), deserializer)
 
+    async def iter_range(
+        self,
+        start: int,
+        end: int,
+        namespace: Namespace,
+        *namespaces: Namespace,
+        concurrency: int = 8,
+        deserializer: Callable | None = None,
+        lazy: bool = False,
+    ) -> AsyncIterator[tuple[int, list[Blob]]]:
+        """Yields the blobs under the given namespaces at each height of a range, in order.
+
+        Up to ``concurrency`` heights are fetched at the same time, starting with the next
+        one to be yielded. Fetching never runs further ahead than that, so at most
+        ``concurrency`` results are held at once however slowly they are consumed. If a fetch
+        fails, the error is raised at its height. Closing the iterator cancels the fetches
+        in progress.
+
+        Args:
+            start (int): The first height.
+            end (int): The height after the last one.
+            namespace (Namespace): The primary namespace of the blobs.
+            namespaces (Namespace): Additional namespaces to query for blobs.
+            concurrency (int): The number of heights fetched at the same time.
+            deserializer (Callable | None): Custom deserializer. Defaults to None.
+            lazy (bool): Whether to yield :class:`LazyBlob` objects, see :meth:`get_all`.
+
+        Yields:
+            tuple[int, list[Blob]]: Each height and its blobs, [] if there are none.
+        """
+        async for item in self.iter_heights(
+            range(start, end),
+            namespace,
+            *namespaces,
+            concurrency=concurrency,
+            deserializer=deserializer,
+            lazy=lazy,
+        ):
+            yield item
+
+    async def iter_heights(
+        self,
+        heights: Iterable[int],
+        namespace: Namespace,
+        *namespaces: Namespace,
+        concurrency: int = 8,
+        deserializer: Callable | None = None,
+        lazy: bool = False,
+    ) -> AsyncIterator[tuple[int, list[Blob]]]:
+        """Yields the blobs under the given namespaces at each of the given heights, in the
+        order of the heights, fetching them like :meth:`iter_range`.
+
+        Args:
+            heights (Iterable[int]): The heights.
+            namespace (Namespace): The primary namespace of the blobs.
+            namespaces (Namespace): Additional namespaces to query for blobs.
+            concurrency (int): The number of heights fetched at the same time.
+            deserializer (Callable | None): Custom deserializer. Defaults to None.
+            lazy (bool): Whether to yield :class:`LazyBlob` objects, see :meth:`get_all`.
+
+        Yields:
+            tuple[int, list[Blob]]: Each height and its blobs, [] if there are none.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        namespaces = (namespace, *namespaces)
+        heights = iter(heights)
+        fetches = deque()  # type: deque[tuple[int, asyncio.Task]]
+
+        def fetch_next() -> None:
+            height = next(heights, None)
+            if height is not None:
+                fetch = self.get_all(height, *namespaces, deserializer=deserializer, lazy=lazy)
+                fetches.append((height, asyncio.ensure_future(fetch)))
+
+        try:
+            for _ in range(concurrency):
+                fetch_next()
+            while fetches:
+                height, task = fetches[0]
+                blobs = await task
+                fetches.popleft()
+                fetch_next()
+                yield height, blobs if blobs is not None else []
+        finally:
+            for _, task in fetches:
+                task.cancel()
+
     async def submit(
         self, blob: Blob, *blobs: Blob, deserializer: Callable | None = None, **options
     ) -> SubmitBlobResult:
         """Sends Blobs and reports the height in which they were included. Allows sending
         multiple Blobs atomically synchronously. Uses default wallet registered on the Node.
 
+        The data of blobs created with :meth:`Blob.from_file` is base64 encoded chunk by chunk
+        while the request is sent, so that it is never held in memory as a whole.
+
         Args:
             blob (Blob): The main blob to submit.
             blobs (Blob): Additional blobs to submit.
@@ -159,77 +353,117 @@ class BlobAPI(Wrapper):
 
         deserializer = deserializer if deserializer is not None else deserializer_
 
-        # Process blobs using v0.11.0 API
-        processed_blobs = []
-        for blob_obj in (blob, *blobs):
-            if blob_obj.commitment is None:
-                # Need to normalize the blob
-                try:
-                    # Try v0.11.0 API with signer parameter
-                    try:
-                        processed_blob = types.normalize_blob(
-                            blob_obj.namespace, blob_obj.data, blob_obj.signer
-                        )
-                    except TypeError:
-                        # Fall back to basic version if the Rust extension has linking issues
-                        processed_blob = types.normalize_blob(
-                            blob_obj.namespace, blob_obj.data
-                        )
-                        # For v0.11.0 compatibility, set share_version and signer manually
-                        if blob_obj.signer is not None:
-                            processed_blob["share_version"] = 1
-                            processed_blob["signer"] = blob_obj.signer
-
-                    # Handle commitments that might be returned in different formats
-                    commitment_value = processed_blob["commitment"]
-                    if isinstance(
-                        commitment_value, str
-                    ) and commitment_value.startswith("Commitment("):
-                        # Debug format - extract actual bytes
-                        hex_part = commitment_value.split("(")[1].split(")")[0]
-                        if hex_part.startswith("0x"):
-                            hex_part = hex_part[2:]
-                        processed_blob["commitment"] = bytes.fromhex(hex_part)
-                    elif (
-                        isinstance(commitment_value, str) and len(commitment_value) > 0
-                    ):
-                        # Try to handle Base64 formatted commitment
-                        try:
-                            from base64 import b64decode
-
-                            processed_blob["commitment"] = b64decode(commitment_value)
-                        except Exception:
-                            # If not valid Base64, leave as is
-                            pass
-
-                except Exception as e:
-                    # Create a fallback processed_blob with the same structure
-                    import hashlib
-
-                    h = hashlib.sha256()
-                    h.update(blob_obj.namespace)
-                    h.update(blob_obj.data)
-                    if blob_obj.signer:
-                        h.update(blob_obj.signer)
-
-                    processed_blob = {
-                        "namespace": blob_obj.namespace,
-                        "data": blob_obj.data,
-                        "commitment": h.digest(),
-                        "share_version": 1 if blob_obj.signer else 0,
-                        "index": blob_obj.index,
-                    }
-
-                    if blob_obj.signer:
-                        processed_blob["signer"] = blob_obj.signer
-                processed_blobs.append(processed_blob)
-            else:
-                # Use the blob as is
-                processed_blobs.append(blob_obj)
+        # Process blobs using v0.11.0 API; blobs without a commitment are normalized
+        # together, so that their commitments are computed in parallel
+        pending = [blob_obj for blob_obj in (blob, *blobs) if blob_obj.commitment is None]
+        normalized = iter(_normalize_blobs(pending))
+        processed_blobs = [
+            next(normalized) if blob_obj.commitment is None else blob_obj
+            for blob_obj in (blob, *blobs)
+        ]
 
         blobs = tuple(processed_blobs)
         return await self._rpc.call("blob.Submit", (blobs, options), deserializer)
 
+    async def submit_packed(
+        self,
+        namespace: Namespace,
+        payloads: Iterable[bytes],
+        *,
+        max_blob_size: int = DEFAULT_MAX_BLOB_SIZE,
+        max_tx_size: int = DEFAULT_MAX_TX_SIZE,
+        **options,
+    ) -> PackedSubmitResult:
+        """Packs payloads into as few blobs and transactions as possible and submits them.
+
+        Payloads are laid out back to back and cut into blobs of ``max_blob_size``, so large
+        payloads are split across blobs and small ones share them. The blobs are grouped into
+        transactions of at most ``max_tx_size`` bytes, which are submitted one after another.
+        A :class:`~pylestia.types.packing.Manifest` blob is submitted with the last
+        transaction; pass its location to :meth:`get_packed` to read the payloads back.
+
+        Args:
+            namespace (Namespace): The namespace of the blobs.
+            payloads (Iterable[bytes]): The payloads, each bytes or another buffer.
+            max_blob_size (int): The maximum data size of a blob.
+            max_tx_size (int): The maximum total data size of the blobs of a transaction.
+            options: Additional configuration options of each transaction.
+
+        Returns:
+            PackedSubmitResult: The location of the manifest, and the manifest.
+        """
+        namespace = Namespace(namespace)
+        sizes, transactions = pack(payloads, max_blob_size, max_tx_size)
+        # Check that the manifest fits in a blob before submitting anything, estimating it
+        # with heights longer than any real one
+        blob_count = sum(map(len, transactions))
+        estimate = Manifest(sizes, [(10**12, b"\0" * 32, max_blob_size)] * blob_count)
+        if len(estimate.to_bytes()) > max_blob_size:
+            raise ValueError(f"The manifest of {len(sizes)} payloads exceeds the blob size")
+        references = []
+
+        async def submit(blobs: list[Blob]) -> None:
+            result = await self.submit(*blobs, **options)
+            references.extend((result.height, blob.commitment, blob.data_size) for blob in blobs)
+
+        for datas in transactions[:-1]:
+            await submit(Blob.create_many((namespace, data) for data in datas))
+
+        last = Blob.create_many((namespace, data) for data in (transactions or [[]])[-1])
+        # Blobs submitted with the manifest are at its own height, recorded as 0
+        manifest = Manifest(
+            sizes, references + [(0, blob.commitment, blob.data_size) for blob in last]
+        )
+        count = len(transactions)
+        if sum(blob.data_size for blob in last) + len(manifest.to_bytes()) > max_tx_size:
+            # The manifest does not fit; it follows in a transaction of its own
+            await submit(last)
+            manifest = Manifest(sizes, references)
+            last = []
+            count += 1
+        manifest_blob = Blob(namespace, manifest.to_bytes())
+        result = await self.submit(*last, manifest_blob, **options)
+        return PackedSubmitResult(result.height, manifest_blob.commitment, manifest, count or 1)
+
+    async def get_packed(
+        self,
+        height: int,
+        namespace: Namespace,
+        commitment,
+        *,
+        indexes: Iterable[int] | None = None,
+    ) -> list[bytes]:
+        """Reads back payloads submitted with :meth:`submit_packed`.
+
+        Only the blobs holding the requested payloads are fetched, concurrently.
+
+        Args:
+            height (int): The height of the manifest.
+            namespace (Namespace): The namespace of the blobs.
+            commitment: The commitment of the manifest blob.
+            indexes (Iterable[int] | None): The positions of the payloads to read, in the
+                order of submission; defaults to all of them.
+
+        Returns:
+            list[bytes]: The payloads, in the order of ``indexes``.
+        """
+        manifest_blob = await self.get(height, namespace, commitment)
+        if manifest_blob is None:
+            raise ValueError(f"No manifest blob found at height {height}")
+        manifest = Manifest.from_bytes(manifest_blob.data)
+        indexes = None if indexes is None else list(indexes)
+        positions = manifest.spans(indexes)
+
+        async def fetch(position: int) -> bytes:
+            blob_height, blob_commitment, _ = manifest.blobs[position]
+            blob = await self.get(blob_height or height, namespace, blob_commitment)
+            if blob is None:
+                raise ValueError(f"Blob {position} of the manifest at height {height} is missing")
+            return blob.data
+
+        datas = await asyncio.gather(*(fetch(position) for position in positions))
+        return manifest.unpack(dict(zip(positions, datas)), indexes)
+
     @handle_blob_error
     async def get_proof(
         self,
@@ -274,13 +508,19 @@ class BlobAPI(Wrapper):
         )
 
     async def subscribe(
-        self, namespace: Namespace, *, deserializer: Callable | None = None
+        self,
+        namespace: Namespace,
+        *,
+        deserializer: Callable | None = None,
+        lazy: bool = False,
     ) -> AsyncIterator[SubscriptionBlobResult | None]:
         """Subscribes to the blobs under the given namespace.
 
         Args:
             namespace (Namespace): The namespace to subscribe to.
             deserializer (Callable | None): Custom deserializer. Defaults to None.
+            lazy (bool): Whether the results hold :class:`LazyBlob` objects, whose data is
+                decoded when it is first read, instead of the blobs as received.
 
         Returns:
             AsyncIterator[SubscriptionBlobResult | None]: An async iterator of subscription results.
@@ -288,6 +528,9 @@ class BlobAPI(Wrapper):
 
         def deserializer_(result):
             if result is not None:
+                if lazy:
+                    blobs = tuple(_deserialize_lazy_blobs(result.get("blobs")))
+                    return SubscriptionBlobResult(result["height"], blobs)
                 return SubscriptionBlobResult(**result)
 
         deserializer = deserializer if deserializer is not None else deserializer_
@@ -296,3 +539,82 @@ class BlobAPI(Wrapper):
             "blob.Subscribe", (Namespace(namespace),), deserializer
         ):
             yield item
+
+    async def subscribe_resumable(
+        self,
+        namespace: Namespace,
+        since: int | None = None,
+        *,
+        concurrency: int = 8,
+        max_buffer: int = 64,
+        retry_delay: float = 1.0,
+        lazy: bool = False,
+    ) -> AsyncIterator[SubscriptionBlobResult]:
+        """Subscribes to the blobs under the given namespace without skipping any height.
+
+        Each height is yielded exactly once and in order. Heights the node did not push, because
+        the connection was re-established or the subscription ended, are fetched with
+        ``blob.GetAll``, ``concurrency`` at a time, before live results are yielded again. A
+        subscription the node ends is re-established after ``retry_delay`` seconds. Live
+        results wait in a buffer of ``max_buffer`` heights; when a slow consumer lets it
+        overflow, the oldest ones are dropped and fetched again once the consumer gets to them.
+
+        To resume across restarts, store the height of each result once it is processed and
+        pass the last one as ``since``.
+
+        Args:
+            namespace (Namespace): The namespace to subscribe to.
+            since (int | None): The last height already processed; the subscription starts
+                after it. If None, it starts at the first height the node pushes.
+            concurrency (int): The number of missed heights fetched at the same time.
+            max_buffer (int): The number of live results kept for a slow consumer.
+            retry_delay (float): Seconds to wait before subscribing again.
+            lazy (bool): Whether the results hold :class:`LazyBlob` objects, whose data is
+                decoded when it is first read.
+
+        Returns:
+            AsyncIterator[SubscriptionBlobResult]: An async iterator of subscription results.
+        """
+        namespace = Namespace(namespace)
+        next_height = None if since is None else since + 1
+        while True:
+            buffer = deque(maxlen=max_buffer)  # type: deque[dict]
+            ready = asyncio.Event()
+            reader = asyncio.ensure_future(self._buffer_live(namespace, buffer, ready))
+            try:
+                while True:
+                    while not buffer and not reader.done():
+                        ready.clear()
+                        await ready.wait()
+                    if not buffer:
+                        break
+                    result = buffer.popleft()
+                    height = int(result["height"])
+                    if next_height is None:
+                        next_height = height
+                    if height < next_height:
+                        # Pushed again after the subscription was re-established
+                        continue
+                    if height > next_height:
+                        async for missed, blobs in self.iter_range(
+                            next_height, height, namespace, concurrency=concurrency, lazy=lazy
+                        ):
+                            yield SubscriptionBlobResult(missed, tuple(blobs))
+                    next_height = height + 1
+                    deserialize = _deserialize_lazy_blobs if lazy else _deserialize_blobs
+                    blobs = deserialize(result.get("blobs"))
+                    yield SubscriptionBlobResult(height, tuple(blobs))
+            finally:
+                reader.cancel()
+            if reader.exception() is not None:
+                raise reader.exception()
+            await asyncio.sleep(retry_delay)
+
+    async def _buffer_live(self, namespace: Namespace, buffer: deque, ready: asyncio.Event) -> None:
+        try:
+            async for result in self._rpc.subscribe("blob.Subscribe", (namespace,)):
+                if result is not None:
+                    buffer.append(result)
+                    ready.set()
+        finally:
+            ready.set()
@@ -26,4 +26,5 @@ class FraudClient(Wrapper):
         Yields:
             dict[str, str]: A dictionary containing fraud proof data.
         """
-        return self._rpc.iter("fraud.Subscribe", (proof_type,))
+        async for proof in self._rpc.subscribe("fraud.Subscribe", (proof_type,)):
+            yield proof
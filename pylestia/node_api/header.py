@@ -6,6 +6,11 @@ from pylestia.types.header import ExtendedHeader, State
 from pylestia.node_api.rpc.abc import Wrapper
 
 
+def _deserialize_headers(result):
+    if result is not None:
+        return [ExtendedHeader(**kwargs) for kwargs in result]
+
+
 def handle_header_error(func):
     """Decorator to handle blob-related errors."""
 
@@ -82,11 +87,7 @@ class HeaderClient(Wrapper):
             list[ExtendedHeader]: A list of retrieved headers.
         """
 
-        def deserializer_(result):
-            if result is not None:
-                return [ExtendedHeader(**kwargs) for kwargs in result]
-
-        deserializer = deserializer if deserializer is not None else deserializer_
+        deserializer = deserializer if deserializer is not None else _deserialize_headers
 
         return await self._rpc.call(
             "header.GetRangeByHeight", (range_from, int(range_to)), deserializer
@@ -144,7 +145,7 @@ class HeaderClient(Wrapper):
             deserializer if deserializer is not None else ExtendedHeader.deserializer
         )
 
-        async for subs_header_result in self._rpc.iter(
+        async for subs_header_result in self._rpc.subscribe(
             "header.Subscribe", (), deserializer
         ):
             if subs_header_result is not None:
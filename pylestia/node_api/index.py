@@ -0,0 +1,284 @@
+"""
+Persistent index of the heights at which namespaces have blobs.
+
+Scanning a namespace with ``blob.GetAll`` costs one call per height, and most heights hold
+nothing. A :class:`BlobIndex` records, for a set of namespaces, the commitment, size and
+index of every blob at every height it has scanned, together with the ranges of heights it
+has covered. It is filled by a concurrent backfill of past heights and by following
+``blob.Subscribe`` for new ones, and kept in an sqlite database, so that later range
+queries only touch the heights that hold blobs.
+"""
+
+import asyncio
+import os
+import sqlite3
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from pylestia.types import Blob, Commitment, LazyBlob, Namespace
+
+if t.TYPE_CHECKING:
+    from .blob import BlobAPI
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    namespace BLOB NOT NULL,
+    height INTEGER NOT NULL,
+    commitment BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    position INTEGER,
+    PRIMARY KEY (namespace, height, commitment)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    namespace BLOB NOT NULL,
+    first INTEGER NOT NULL,
+    last INTEGER NOT NULL,
+    PRIMARY KEY (namespace, first)
+);
+"""
+
+
+@dataclass
+class IndexEntry:
+    """A blob recorded in the index.
+
+    Attributes:
+        height (int): The height of the blob.
+        commitment (Commitment): The commitment of the blob.
+        size (int): The size of the blob data in bytes.
+        index (int | None): The index of the blob in the data square, if known.
+    """
+
+    height: int
+    commitment: Commitment
+    size: int
+    index: int | None
+
+
+class BlobIndex:
+    """Persistent index of namespace → heights → blob commitments and sizes.
+
+    Heights count as covered for a namespace once they were scanned, whether they held blobs
+    or not; queries over covered ranges need no call to the node. Database access runs on a
+    dedicated worker thread, like :class:`~.rpc.store.DiskStore`.
+
+    Args:
+        blob_api: The blob API to scan through.
+        path: The sqlite database file; created if missing.
+        namespaces: The namespaces to index.
+        batch_size: The number of heights of a backfill written in one transaction.
+    """
+
+    def __init__(
+        self,
+        blob_api: "BlobAPI",
+        path: str | os.PathLike,
+        namespaces: t.Iterable[Namespace | str | bytes],
+        batch_size: int = 256,
+    ):
+        self.blob_api = blob_api
+        self.path = Path(path).expanduser()
+        self.namespaces = tuple(Namespace(namespace) for namespace in namespaces)
+        if not self.namespaces:
+            raise ValueError("At least one namespace must be indexed")
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pylestia-index")
+        self._db = None  # type: sqlite3.Connection | None
+
+    async def backfill(self, start: int, end: int, concurrency: int = 8) -> int:
+        """Scans the heights of a range that are not covered yet for all namespaces.
+
+        Args:
+            start: The first height.
+            end: The height after the last one.
+            concurrency: The number of heights fetched at the same time.
+
+        Returns:
+            int: The number of heights scanned.
+        """
+        gaps = []
+        for namespace in self.namespaces:
+            gaps.extend(await self.missing(namespace, start, end))
+        gaps = _merge(gaps)
+        scanned = 0
+        for gap_start, gap_end in gaps:
+            batch = []
+            async for height, blobs in self.blob_api.iter_range(
+                gap_start, gap_end, *self.namespaces, concurrency=concurrency, lazy=True
+            ):
+                batch.append((height, [_entry(blob) for blob in blobs]))
+                if len(batch) >= self.batch_size:
+                    await self._run(self._record, batch)
+                    scanned += len(batch)
+                    batch = []
+            if batch:
+                await self._run(self._record, batch)
+                scanned += len(batch)
+        return scanned
+
+    async def follow(self) -> None:
+        """Indexes the blobs of every new height, as the node pushes them, until cancelled.
+
+        Heights the node fails to push, e.g. while the connection is re-established, are
+        fetched; see :meth:`~.blob.BlobAPI.subscribe_resumable`.
+        """
+        await asyncio.gather(*(self._follow(namespace) for namespace in self.namespaces))
+
+    async def _follow(self, namespace: Namespace) -> None:
+        async for result in self.blob_api.subscribe_resumable(namespace, lazy=True):
+            entries = [_entry(blob) for blob in result.blobs]
+            await self._run(self._record, [(int(result.height), entries)], (namespace,))
+
+    async def entries(
+        self, namespace: Namespace | str | bytes, start: int, end: int
+    ) -> list[IndexEntry]:
+        """Returns the indexed blobs of a namespace within a range of heights, by height."""
+        rows = await self._run(self._entries, Namespace(namespace), start, end)
+        return [
+            IndexEntry(height, Commitment(commitment), size, index)
+            for height, commitment, size, index in rows
+        ]
+
+    async def heights(self, namespace: Namespace | str | bytes, start: int, end: int) -> list[int]:
+        """Returns the heights within a range at which a namespace has indexed blobs."""
+        return sorted({entry.height for entry in await self.entries(namespace, start, end)})
+
+    async def missing(
+        self, namespace: Namespace | str | bytes, start: int, end: int
+    ) -> list[tuple[int, int]]:
+        """Returns the ranges of heights within a range not covered for a namespace yet."""
+        covered = await self._run(self._coverage, Namespace(namespace), start, end)
+        gaps = []
+        for covered_start, covered_end in covered:
+            if covered_start > start:
+                gaps.append((start, covered_start))
+            start = max(start, covered_end)
+        if start < end:
+            gaps.append((start, end))
+        return gaps
+
+    async def iter_blobs(
+        self,
+        namespace: Namespace | str | bytes,
+        start: int,
+        end: int,
+        concurrency: int = 8,
+    ) -> t.AsyncIterator[tuple[int, list[Blob]]]:
+        """Yields the blobs of a namespace at the indexed heights of a range, in order.
+
+        The parts of the range not covered yet are backfilled first, then only the heights
+        that hold blobs of the namespace are fetched, ``concurrency`` at a time.
+
+        Yields:
+            tuple[int, list[Blob]]: Each height with blobs of the namespace, and those blobs.
+        """
+        namespace = Namespace(namespace)
+        if await self.missing(namespace, start, end):
+            await self.backfill(start, end, concurrency)
+        heights = await self.heights(namespace, start, end)
+        async for height, blobs in self.blob_api.iter_heights(
+            heights, namespace, concurrency=concurrency
+        ):
+            yield height, blobs
+
+    async def close(self) -> None:
+        """Closes the database and stops the worker thread."""
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, func: t.Callable, *args) -> t.Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # The methods below run on the worker thread.
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def _record(
+        self,
+        heights: list[tuple[int, list[tuple[bytes, bytes, int, int | None]]]],
+        namespaces: tuple[Namespace, ...] | None = None,
+    ) -> None:
+        """Records the blobs of scanned heights and marks the heights as covered."""
+        db = self._connect()
+        namespaces = self.namespaces if namespaces is None else namespaces
+        with db:
+            for height, entries in heights:
+                db.executemany(
+                    "INSERT OR REPLACE INTO blobs (namespace, height, commitment, size, position)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (namespace, height, commitment, size, position)
+                        for namespace, commitment, size, position in entries
+                        if namespace in namespaces
+                    ],
+                )
+            for namespace in namespaces:
+                for start, end in _merge((height, height + 1) for height, _ in heights):
+                    self._cover(db, bytes(namespace), start, end)
+
+    def _cover(self, db: sqlite3.Connection, namespace: bytes, start: int, end: int) -> None:
+        """Marks a range as covered, merging it with the ranges it overlaps or touches."""
+        rows = db.execute(
+            "SELECT first, last FROM coverage WHERE namespace = ? AND first <= ? AND last >= ?",
+            (namespace, end, start),
+        ).fetchall()
+        for row_start, row_end in rows:
+            start, end = min(start, row_start), max(end, row_end)
+        db.execute(
+            "DELETE FROM coverage WHERE namespace = ? AND first <= ? AND last >= ?",
+            (namespace, end, start),
+        )
+        db.execute(
+            "INSERT INTO coverage (namespace, first, last) VALUES (?, ?, ?)",
+            (namespace, start, end),
+        )
+
+    def _coverage(self, namespace: Namespace, start: int, end: int) -> list[tuple[int, int]]:
+        cursor = self._connect().execute(
+            "SELECT first, last FROM coverage WHERE namespace = ? AND first < ? AND last > ?"
+            " ORDER BY first",
+            (bytes(namespace), end, start),
+        )
+        return cursor.fetchall()
+
+    def _entries(self, namespace: Namespace, start: int, end: int) -> list[tuple]:
+        cursor = self._connect().execute(
+            "SELECT height, commitment, size, position FROM blobs"
+            " WHERE namespace = ? AND height >= ? AND height < ? ORDER BY height, position",
+            (bytes(namespace), start, end),
+        )
+        return cursor.fetchall()
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _entry(blob: Blob | dict) -> tuple[bytes, bytes, int, int | None]:
+    """Returns the namespace, commitment, size and index of a blob or its raw result."""
+    if isinstance(blob, dict):
+        blob = LazyBlob(**blob)
+    size = blob.data_size
+    return bytes(blob.namespace), bytes(blob.commitment), size, blob.index
+
+
+def _merge(ranges: t.Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merges ranges of heights that overlap or touch."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
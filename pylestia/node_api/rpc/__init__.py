@@ -1,52 +1,201 @@
 import asyncio
+import os
+import random
+from collections import Counter
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator, Callable, Dict, Optional, TypeVar, Union, cast
 from urllib.parse import urlparse
 
 from websockets import connect
+from websockets.exceptions import WebSocketException
 
-# In websockets 12.0, the connection types have changed
-# Use Protocol instead of ClientConnection/Connection
-from websockets.protocol import Protocol as ClientConnection
+from .abc import Transport, RPCExecutor, logger
+from .cache import ResponseCache
+from .codec import Codec
+from .executor import RPC, Batch, TimeoutOverride, TxConfig
+from .http import HttpTransport
+from .limiter import AdaptiveLimiter
+from .metrics import PrometheusCollector, RPCMetrics, register_opentelemetry
+from .replay import Recorder, ReplayTransport
+from .singleflight import SingleFlight
+from .store import DiskStore
+from .router import MultiEndpointClient
 
-from .abc import Transport, RPCExecutor
-from .executor import RPC, TxConfig
-
-__all__ = ["JsonRpcClient", "TxConfig"]
+__all__ = [
+    "JsonRpcClient",
+    "MultiEndpointClient",
+    "AdaptiveLimiter",
+    "RPCMetrics",
+    "ResponseCache",
+    "DiskStore",
+    "Recorder",
+    "ReplayTransport",
+    "PrometheusCollector",
+    "register_opentelemetry",
+    "Batch",
+    "TimeoutOverride",
+    "TxConfig",
+]
 
 T = TypeVar("T")
 
 
+class WebSocketTransport(Transport):
+    """Transport that sends messages over a websocket connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def send(self, message: str) -> None:
+        # An iterable such as a streamed message goes out as one fragmented message
+        await self.connection.send(message)
+
+
 class JsonRpcClient(RPCExecutor):
-    """Client for communicating with a Celestia node via JSON-RPC over WebSockets."""
+    """Client for communicating with a Celestia node via JSON-RPC over WebSockets.
+
+    The client may hold a pool of connections to the node. Each call is routed to the
+    connection with the fewest pending calls, so a large response on one connection does
+    not block calls on the others. A subscription stays on the connection it was created on.
+
+    With ``reconnect`` enabled, a lost connection is re-established with exponential backoff.
+    Idempotent calls that were in flight are sent again, subscriptions are re-established
+    under the same local iterators, and new calls wait until the connection is back.
+
+    With ``transport="http"``, calls are POSTed over a pool of ``pool_size`` HTTP/1.1
+    keep-alive connections instead; a websocket connection is opened on the first
+    subscription, since subscriptions cannot be carried over HTTP.
+
+    With a ``limiter``, the number of calls in flight to the node is limited across the whole
+    pool and adapted to the latency and errors observed, so that large fan-outs queue on the
+    client instead of overloading the node. Batched calls share a frame and are not limited.
+    """
 
-    def __init__(self, base_url: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 1,
+        codec: str | Codec | None = None,
+        *,
+        transport: str = "websocket",
+        reconnect: bool = False,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        max_reconnect_attempts: int | None = None,
+        method_timeouts: Dict[str, Union[float, Callable[[int], float]]] | None = None,
+        limiter: AdaptiveLimiter | bool = False,
+        metrics: RPCMetrics | bool = True,
+        coalesce: bool = False,
+        cache: ResponseCache | bool = False,
+        store: DiskStore | str | None = None,
+        record: Recorder | str | None = None,
+    ) -> None:
         """Initialize a new JSON-RPC client.
 
         Args:
             base_url: The base URL of the Celestia node, e.g., 'http://localhost:26658'
+            pool_size: The number of websocket connections to open to the node
+            codec: The JSON codec or its name; defaults to the fastest installed codec
+            transport: The transport for calls, "websocket" or "http"
+            reconnect: Whether to re-establish lost connections
+            reconnect_delay: The delay before the first reconnect attempt, in seconds
+            max_reconnect_delay: The upper bound of the backoff delay, in seconds
+            max_reconnect_attempts: The number of attempts before giving up; unlimited if None
+            method_timeouts: Per-method timeouts in seconds, merged over the defaults of
+                :data:`~.executor.METHOD_TIMEOUTS`; a callable receives the request size
+            limiter: An adaptive concurrency limiter for the calls, or True to use one with
+                the default settings
+            metrics: The per-method metrics to record into, True to record into a new
+                instance, or False to record none
+            coalesce: Whether identical idempotent calls in flight share one request
+            cache: The response cache to serve and store results with, or True to use
+                one with the default settings
+            store: The persistent store of immutable results, or the path of its directory.
+                It is bound to the chain of the node on connect, and closed on disconnect
+            record: A recorder of the frames sent and received, or the path of the file to
+                record them to, for replay with :class:`ReplayTransport`
         """
+        if pool_size < 1:
+            raise ValueError("Pool size must be at least 1")
+        if transport not in ("websocket", "http"):
+            raise ValueError("Unsupported transport, must be websocket or http")
         self.base_url = self._prepare_url(base_url)
-        self.connection = None
-        self.rpc = None
+        self.http_url = self.base_url.replace("ws", "http", 1) + "/"
+        self.transport = transport
+        self.pool_size = pool_size
+        self.codec = codec
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.method_timeouts = method_timeouts
+        self.limiter = AdaptiveLimiter() if limiter is True else limiter or None
+        self.rpc_metrics = RPCMetrics() if metrics is True else metrics or None
+        # Shared by the pool, so that identical calls on different connections coalesce
+        self.flights = SingleFlight() if coalesce else None
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache if isinstance(cache, ResponseCache) else None
+        self.store = DiskStore(store) if isinstance(store, (str, os.PathLike)) else store
+        self.recorder = Recorder(record) if isinstance(record, (str, os.PathLike)) else record
+        self._headers = []
+        self._closing = False
+        self.connections = []
+        self.rpcs = []  # type: list[RPC]
+        self._http_rpc = None  # type: RPC | None
+        self._listeners = []  # type: list[asyncio.Task]
+
+    @property
+    def connection(self):
+        """The first connection of the pool, or None if not connected."""
+        return self.connections[0] if self.connections else None
+
+    @property
+    def rpc(self) -> RPC | None:
+        """The executor of the pool connection with the fewest pending calls."""
+        if self._http_rpc is not None:
+            return self._http_rpc
+        if self.rpcs:
+            return min(self.rpcs, key=lambda rpc: len(rpc._pending))
+        return None
+
+    def pending_counts(self) -> list[int]:
+        """Returns the number of pending calls on each pool connection."""
+        if self._http_rpc is not None:
+            return [len(self._http_rpc._pending)]
+        return [len(rpc._pending) for rpc in self.rpcs]
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Returns a snapshot of the per-method metrics; empty if metrics are disabled."""
+        return self.rpc_metrics.snapshot() if self.rpc_metrics is not None else {}
+
+    def timeout_counts(self) -> Counter:
+        """Returns the number of timed out calls per method across the pool."""
+        counts = Counter()
+        for rpc in self.rpcs:
+            counts.update(rpc.timeouts)
+        if self._http_rpc is not None:
+            counts.update(self._http_rpc.timeouts)
+        return counts
 
     def _prepare_url(self, url: str) -> str:
         """Process the URL to ensure it has the correct protocol."""
-        if not url.startswith(("ws://", "wss://")):
+        if "://" not in url:
             # If no protocol specified, use ws://
             url = f"ws://{url}"
 
         # Parse the URL to validate and normalize it
         parsed = urlparse(url)
-        if parsed.scheme not in ("ws", "wss"):
-            raise ValueError("Unsupported URL scheme, must be ws or wss")
+        scheme = {"http": "ws", "https": "wss"}.get(parsed.scheme, parsed.scheme)
+        if scheme not in ("ws", "wss"):
+            raise ValueError("Unsupported URL scheme, must be ws, wss, http or https")
 
         # Ensure port is specified
         port = parsed.port or 26658
-        return f"{parsed.scheme}://{parsed.hostname}:{port}"
+        return f"{scheme}://{parsed.hostname}:{port}"
 
     async def connect(self, auth_token: Optional[str] = None) -> None:
-        """Connect to the Celestia node.
+        """Connect to the Celestia node, opening every connection of the pool.
 
         Args:
             auth_token: Optional authentication token for the node
@@ -54,52 +203,156 @@ class JsonRpcClient(RPCExecutor):
         headers = []
         if auth_token:
             headers.append(("Authorization", f"Bearer {auth_token}"))
+        self._headers = headers
+        self._closing = False
 
-        # Create the connection
-        connection = await connect(self.base_url, additional_headers=headers)
+        if self.transport == "http":
+            http = HttpTransport(self.http_url, headers, pool_size=self.pool_size)
+            self._http_rpc = RPC(
+                self._record(http),
+                codec=self.codec,
+                method_timeouts=self.method_timeouts,
+                limiter=self.limiter,
+                metrics=self.rpc_metrics,
+                flights=self.flights,
+                cache=self.cache,
+                store=self.store,
+            )
+        else:
+            await self._open(self.pool_size)
+        if self.store is not None:
+            try:
+                head = await self.call("header.LocalHead")
+                await self.store.bind(head["header"]["chain_id"])
+            except BaseException:
+                await self.disconnect()
+                raise
 
-        # Set up the transport
-        class WebSocketTransport(Transport):
-            def __init__(self, connection):
-                self.connection = connection
+    async def _open(self, count: int) -> None:
+        """Open websocket connections and start their listeners.
 
-            async def send(self, message: str) -> None:
-                await self.connection.send(message)
+        Args:
+            count: The number of connections to open
+        """
+        connections = await asyncio.gather(*(self._connect() for _ in range(count)))
 
-        transport = WebSocketTransport(connection)
-        self.rpc = RPC(transport)
-        self.connection = connection
+        for connection in connections:
+            index = len(self.connections)
+            self.rpcs.append(
+                RPC(
+                    self._record(WebSocketTransport(connection)),
+                    codec=self.codec,
+                    method_timeouts=self.method_timeouts,
+                    limiter=self.limiter,
+                    metrics=self.rpc_metrics,
+                    flights=self.flights,
+                    cache=self.cache,
+                    store=self.store,
+                )
+            )
+            self.connections.append(connection)
 
-        # Start the message listener
-        asyncio.create_task(self._listen(connection, transport))
+            # Start the message listener
+            self._listeners.append(asyncio.create_task(self._listen(index)))
 
-    async def _listen(self, connection: ClientConnection, transport: Transport) -> None:
-        """Listen for messages from the connection.
+    def _record(self, transport: Transport) -> Transport:
+        """Wrap a transport to record its frames, if recording is enabled."""
+        return self.recorder.wrap(transport) if self.recorder is not None else transport
+
+    def _connect(self):
+        """Open a websocket connection to the node."""
+        # Responses such as share.GetEDS easily exceed the default 1 MiB message limit
+        return connect(self.base_url, additional_headers=self._headers, max_size=None)
+
+    async def _listen(self, index: int) -> None:
+        """Listen for messages from a pool connection, re-establishing it if enabled.
 
         Args:
-            connection: The WebSocket connection
-            transport: The transport to handle messages
+            index: The index of the connection in the pool
+        """
+        connection, rpc = self.connections[index], self.rpcs[index]
+        while True:
+            transport = rpc.transport
+            try:
+                async for message in connection:
+                    transport.on_message(message)
+            except asyncio.CancelledError:
+                transport.on_close(None)
+                return
+            except Exception as exc:
+                error = exc
+            else:
+                error = None
+
+            if not self.reconnect or self._closing:
+                transport.on_close(error)
+                return
+
+            rpc.suspend(error)
+            try:
+                connection = await self._reconnect(error)
+            except asyncio.CancelledError:
+                connection = None
+            if connection is None or self._closing:
+                if connection is not None:
+                    await connection.close()
+                transport.on_close(error)
+                return
+            self.connections[index] = connection
+            try:
+                await rpc.resume(self._record(WebSocketTransport(connection)))
+            except (OSError, WebSocketException):
+                # The new connection is already gone; the next iteration handles it
+                pass
+
+    async def _reconnect(self, error: Exception | None):
+        """Open a new connection, backing off exponentially between failed attempts.
+
+        Returns:
+            The new connection, or None if the client is closing or the attempts ran out
         """
-        try:
-            async for message in connection:
-                transport.on_message(message)
-        except asyncio.CancelledError:
-            transport.on_close(None)
-        except Exception as exc:
-            transport.on_close(exc)
+        attempt = 0
+        delay = self.reconnect_delay
+        while not self._closing:
+            if self.max_reconnect_attempts is not None and attempt >= self.max_reconnect_attempts:
+                logger.warning("Giving up reconnecting to %s: %s", self.base_url, error)
+                return None
+            attempt += 1
+            # Full jitter keeps a pool of connections from reconnecting in lockstep
+            await asyncio.sleep(random.uniform(0, delay))
+            try:
+                return await self._connect()
+            except (OSError, WebSocketException, asyncio.TimeoutError) as exc:
+                error = exc
+                delay = min(delay * 2, self.max_reconnect_delay)
+        return None
 
     async def disconnect(self) -> None:
-        """Disconnect from the Celestia node."""
-        if self.connection:
-            await self.connection.close()
-            self.connection = None
-            self.rpc = None
+        """Disconnect from the Celestia node, closing every connection of the pool."""
+        self._closing = True
+        if self._http_rpc is not None:
+            await self._http_rpc.transport.close()
+            self._http_rpc = None
+        connections, self.connections = self.connections, []
+        self.rpcs = []
+        listeners, self._listeners = self._listeners, []
+        if connections:
+            await asyncio.gather(*(connection.close() for connection in connections))
+        for listener in listeners:
+            # Stops listeners that are waiting to reconnect
+            listener.cancel()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.store is not None:
+            await self.store.close()
 
     async def call(
         self,
         method: str,
         params: tuple = None,
         deserializer: Optional[Callable[[Any], T]] = None,
+        *,
+        timeout: Optional[float] = None,
     ) -> Optional[T]:
         """Call an RPC method.
 
@@ -107,6 +360,7 @@ class JsonRpcClient(RPCExecutor):
             method: The method name
             params: The parameters to pass to the method
             deserializer: Optional function to deserialize the result
+            timeout: The timeout of this call in seconds; defaults to the method timeout
 
         Returns:
             The result of the method call, optionally deserialized
@@ -115,7 +369,21 @@ class JsonRpcClient(RPCExecutor):
             raise RuntimeError("Not connected to the node. Call connect() first.")
 
         # Use the RPC implementation from executor.py
-        return await self.rpc.call(method, params, deserializer)
+        return await self.rpc.call(method, params, deserializer, timeout=timeout)
+
+    def batch(self, max_size: int = 100) -> Batch:
+        """Create a batch executor that sends calls as JSON-RPC batch requests.
+
+        Args:
+            max_size: The maximum number of calls sent in one frame
+
+        Returns:
+            A :class:`Batch` bound to the current connection
+        """
+        if not self.rpc:
+            raise RuntimeError("Not connected to the node. Call connect() first.")
+
+        return self.rpc.batch(max_size)
 
     async def subscribe(
         self,
@@ -136,6 +404,10 @@ class JsonRpcClient(RPCExecutor):
         if not self.rpc:
             raise RuntimeError("Not connected to the node. Call connect() first.")
 
-        # Use the RPC implementation from executor.py
-        async for result in self.rpc.subscribe(method, params, deserializer):
+        if self._http_rpc is not None and not self.rpcs:
+            await self._open(1)
+
+        # The subscription stays on the connection selected here
+        rpc = min(self.rpcs, key=lambda rpc: len(rpc._pending))
+        async for result in rpc.subscribe(method, params, deserializer):
             yield result
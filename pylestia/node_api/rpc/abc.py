@@ -9,10 +9,18 @@ logger = logging.Logger("WS JSON-RPC")
 class Transport(ABC):
     on_message: t.Callable[[bytes | str], None]
     on_close: t.Callable[[Exception | None], None]
+    # Fails the calls with the given IDs that were lost on the way to the node
+    on_failure: t.Callable[[list[t.Any], Exception], None]
+    # Whether a request sent earlier can be cancelled with a later message
+    supports_cancel: bool = True
 
     @abstractmethod
     async def send(self, message: str) -> None:
-        """Send a message to the connection."""
+        """Send a message to the connection.
+
+        The message may also be a :class:`~.codec.StreamedMessage`, an iterable of text
+        fragments; transports that cannot send fragments send ``str(message)``.
+        """
 
 
 class RPCExecutor(ABC):
@@ -23,8 +31,13 @@ class RPCExecutor(ABC):
         method: str,
         params: tuple[t.Any, ...] = None,
         deserializer: t.Callable[[t.Any], t.Any] = None,
+        *,
+        timeout: float | None = None,
     ) -> t.Any | None:
-        """This method must implement calling an RPC method and returning the result."""
+        """This method must implement calling an RPC method and returning the result.
+
+        A ``timeout`` in seconds overrides the default deadline of the call.
+        """
 
     @abstractmethod
     async def subscribe(
@@ -0,0 +1,148 @@
+"""
+Cache of RPC responses.
+
+Headers, shares, blobs and proofs at a given height never change once the height exists, so
+their responses are kept until they are evicted. Responses relative to the chain head, such
+as ``header.NetworkHead`` or ``state.Balance``, are kept for a short time only. The cache
+holds raw results; each hit is deserialized again, so callers never share mutable objects.
+"""
+
+import time
+import typing as t
+from collections import Counter, OrderedDict
+
+# Time to live of the cached responses of each method in seconds; None keeps them until evicted.
+# Methods that are not listed are never cached.
+CACHE_TTLS = {
+    "header.GetByHash": None,
+    "header.GetByHeight": None,
+    "header.GetRangeByHeight": None,
+    "share.GetEDS": None,
+    "share.GetNamespaceData": None,
+    "share.GetRange": None,
+    "share.GetShare": None,
+    "share.GetSamples": None,
+    "blob.Get": None,
+    "blob.GetAll": None,
+    "blob.GetProof": None,
+    "blob.Included": None,
+    "header.LocalHead": 1.0,
+    "header.NetworkHead": 1.0,
+    "header.SyncState": 1.0,
+    "das.SamplingStats": 1.0,
+    "state.Balance": 5.0,
+    "state.BalanceForAddress": 5.0,
+}  # type: dict[str, float | None]
+
+# Returned by :meth:`ResponseCache.get` on a miss, since None is a valid result.
+MISS = object()
+
+
+class _Entry:
+    def __init__(self, result: t.Any, size: int, expires: float | None):
+        self.result = result
+        self.size = size
+        self.expires = expires
+
+
+class ResponseCache:
+    """LRU cache of raw RPC results with a byte budget.
+
+    Entries are keyed by method and encoded params and weighted by the size of their response
+    frame. When the budget is exceeded, the least recently used entries are evicted.
+
+    Args:
+        max_bytes: The byte budget of the cache.
+        ttls: Per-method time to live in seconds, merged over :data:`CACHE_TTLS`; None keeps
+            responses until evicted, and a ttl of 0 disables caching of the method.
+
+    Attributes:
+        hits (Counter[str]): The number of hits per method.
+        misses (Counter[str]): The number of misses per method.
+        evictions (int): The number of entries evicted to stay within the budget.
+        size (int): The total size of the cached responses in bytes.
+    """
+
+    def __init__(
+        self, max_bytes: int = 64 * 1024 * 1024, ttls: dict[str, float | None] | None = None
+    ):
+        self.max_bytes = max_bytes
+        self.ttls = CACHE_TTLS if ttls is None else {**CACHE_TTLS, **ttls}
+        self.hits = Counter()  # type: Counter[str]
+        self.misses = Counter()  # type: Counter[str]
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()  # type: OrderedDict[tuple[str, str], _Entry]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def caches(self, method: str) -> bool:
+        """Whether responses of the method are cached."""
+        return method in self.ttls and self.ttls[method] != 0
+
+    def get(self, method: str, key: str) -> t.Any:
+        """Returns the cached result of a call, or :data:`MISS`.
+
+        Args:
+            method: The method name.
+            key: The canonical encoding of the params.
+        """
+        entry = self._entries.get((method, key))
+        if entry is not None and entry.expires is not None and entry.expires < time.monotonic():
+            self._remove((method, key))
+            entry = None
+        if entry is None:
+            self.misses[method] += 1
+            return MISS
+        self._entries.move_to_end((method, key))
+        self.hits[method] += 1
+        return entry.result
+
+    def put(self, method: str, key: str, result: t.Any, size: int) -> None:
+        """Caches the result of a call.
+
+        Args:
+            method: The method name.
+            key: The canonical encoding of the params.
+            result: The raw result.
+            size: The size of the response in bytes.
+        """
+        if not self.caches(method) or size > self.max_bytes:
+            return
+        ttl = self.ttls[method]
+        self._remove((method, key))
+        self._entries[(method, key)] = _Entry(
+            result, size, None if ttl is None else time.monotonic() + ttl
+        )
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict[str, t.Any]:
+        """Returns the hit and miss statistics of the cache."""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else None,
+            "evictions": self.evictions,
+            "methods": {
+                method: {"hits": self.hits[method], "misses": self.misses[method]}
+                for method in self.hits.keys() | self.misses.keys()
+            },
+        }
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
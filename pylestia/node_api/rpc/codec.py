@@ -0,0 +1,235 @@
+"""
+JSON codecs for the RPC hot path.
+
+Every request is encoded and every response frame is decoded through a :class:`Codec`.
+The standard library codec is always available; faster codecs backed by ``orjson`` or
+``msgspec`` are used automatically when those packages are installed.
+
+Messages carrying memory-mapped data, such as blobs from :meth:`~pylestia.types.Blob.from_file`,
+can be encoded as a :class:`StreamedMessage`, which base64 encodes that data chunk by chunk
+while it is sent instead of building the whole frame in memory.
+"""
+
+import json
+import mmap
+import re
+import secrets
+import typing as t
+from abc import ABC, abstractmethod
+from base64 import b64encode
+from dataclasses import fields, is_dataclass
+
+from pylestia.types import Base64, Blob
+
+
+def _fields(obj: t.Any) -> dict:
+    """Returns the fields of a dataclass; the data of a blob as the buffer it was given as, so
+    that it is encoded without a copy."""
+    if isinstance(obj, Blob):
+        return {
+            field.name: obj._payload if field.name == "data" else getattr(obj, field.name)
+            for field in fields(obj)
+        }
+    return {field.name: getattr(obj, field.name) for field in fields(obj)}
+
+
+class JSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if is_dataclass(obj):
+            # Shallow conversion; nested dataclasses are handled by subsequent calls.
+            return _fields(obj)
+        if isinstance(obj, Base64):
+            return str(obj)
+        if isinstance(obj, (bytearray, memoryview, mmap.mmap)):
+            return b64encode(obj).decode("ascii")
+        return super().default(obj)
+
+
+def _default(obj: t.Any) -> t.Any:
+    """Fallback hook of the third-party encoders for types they do not handle natively."""
+    if isinstance(obj, Base64):
+        return str(obj)
+    if is_dataclass(obj):
+        return _fields(obj)
+    if isinstance(obj, (bytearray, memoryview, mmap.mmap)):
+        return b64encode(obj).decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def params_key(params: t.Any) -> str:
+    """Returns the canonical JSON text of the params of a call, which keys its cached and
+    coalesced results the same whichever codec encodes the messages."""
+    return json.dumps(params or (), separators=(",", ":"), sort_keys=True, cls=JSONEncoder)
+
+
+class Codec(ABC):
+    """Encodes outgoing messages and decodes incoming frames."""
+
+    name: str
+
+    @abstractmethod
+    def dumps(self, obj: t.Any) -> str:
+        """Encodes a message into a JSON text frame."""
+
+    @abstractmethod
+    def loads(self, data: str | bytes) -> t.Any:
+        """Decodes a JSON frame."""
+
+
+class StdlibCodec(Codec):
+    """Codec backed by the standard library ``json`` module."""
+
+    name = "json"
+
+    def dumps(self, obj: t.Any) -> str:
+        return json.dumps(obj, cls=JSONEncoder)
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """Codec backed by ``orjson``.
+
+    Dataclasses are passed to the fallback hook, since orjson reads them from their
+    ``__dict__``, which misses fields that are properties, like the data of a blob.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._option = orjson.OPT_PASSTHROUGH_DATACLASS
+        self._loads = orjson.loads
+
+    def dumps(self, obj: t.Any) -> str:
+        return self._dumps(obj, default=_default, option=self._option).decode("utf-8")
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return self._loads(data)
+
+
+class MsgspecCodec(Codec):
+    """Codec backed by ``msgspec.json``."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: t.Any) -> str:
+        return self._encoder.encode(obj).decode("utf-8")
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return self._decoder.decode(data)
+
+
+class StreamedMessage:
+    """A message whose memory-mapped values are base64 encoded chunk by chunk.
+
+    The rest of the message is encoded by the codec up front. Iterating over the message
+    yields its JSON text in fragments, each mapped value in chunks of ``chunk_size`` bytes, so
+    that only one chunk of its base64 text is in memory at a time. Websocket transports send
+    the fragments as one fragmented message.
+
+    Args:
+        codec: The codec of the rest of the message.
+        obj: The message.
+        chunk_size: The number of bytes of mapped data encoded at a time; a multiple of 3.
+    """
+
+    def __init__(self, codec: Codec, obj: t.Any, chunk_size: int = 3 * 64 * 1024):
+        self.chunk_size = chunk_size
+        self._mapped = []  # type: list[mmap.mmap]
+        token = f"pylestia-mapped-{secrets.token_hex(8)}-"
+        text = codec.dumps(self._extract(obj, token))
+        # Odd parts are the indexes of the mapped values, between the JSON text around them
+        self._parts = re.split(f'"{token}(\\d+)"', text)
+
+    @classmethod
+    def encode(cls, codec: Codec, obj: t.Any) -> "StreamedMessage | str":
+        """Returns a streamed message if the message carries mapped values, else its text."""
+        if _has_mapped(obj):
+            return cls(codec, obj)
+        return codec.dumps(obj)
+
+    def _extract(self, obj: t.Any, token: str) -> t.Any:
+        """Replaces the mapped values of a message with numbered placeholders."""
+        if isinstance(obj, mmap.mmap):
+            self._mapped.append(obj)
+            return f"{token}{len(self._mapped) - 1}"
+        if isinstance(obj, (list, tuple)):
+            return [self._extract(item, token) for item in obj]
+        if isinstance(obj, dict):
+            return {key: self._extract(value, token) for key, value in obj.items()}
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return {key: self._extract(value, token) for key, value in _fields(obj).items()}
+        return obj
+
+    def __iter__(self) -> t.Iterator[str]:
+        for index, part in enumerate(self._parts):
+            if index % 2 == 0:
+                if part:
+                    yield part
+                continue
+            data = memoryview(self._mapped[int(part)])
+            yield '"'
+            for start in range(0, len(data), self.chunk_size):
+                yield b64encode(data[start : start + self.chunk_size]).decode("ascii")
+            yield '"'
+
+    def __len__(self) -> int:
+        size = 0
+        for index, part in enumerate(self._parts):
+            if index % 2 == 0:
+                size += len(part)
+            else:
+                size += 4 * ((len(self._mapped[int(part)]) + 2) // 3) + 2
+        return size
+
+    def __str__(self) -> str:
+        return "".join(self)
+
+
+def _has_mapped(obj: t.Any) -> bool:
+    if isinstance(obj, mmap.mmap):
+        return True
+    if isinstance(obj, (list, tuple)):
+        return any(_has_mapped(item) for item in obj)
+    if isinstance(obj, dict):
+        return any(_has_mapped(value) for value in obj.values())
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return any(_has_mapped(value) for value in _fields(obj).values())
+    return False
+
+
+CODECS = {codec.name: codec for codec in (StdlibCodec, OrjsonCodec, MsgspecCodec)}
+
+
+def get_codec(codec: str | Codec | None = None) -> Codec:
+    """Returns a codec instance.
+
+    Args:
+        codec: A codec instance, a codec name (``"json"``, ``"orjson"`` or ``"msgspec"``), or
+            None to select the fastest installed codec, falling back to the standard library.
+
+    Returns:
+        Codec: The codec instance.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    if codec is not None:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        return CODECS[codec]()
+    for codec_cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec_cls()
+        except ImportError:
+            continue
+    return StdlibCodec()
@@ -1,17 +1,28 @@
 import asyncio
-import json
 import sys
+import time
 import typing as t
 import uuid
+import weakref
 from asyncio import Future
-from collections import deque
+from collections import Counter
 from collections.abc import AsyncGenerator
-from dataclasses import is_dataclass, asdict
 
-from ajsonrpc.core import JSONRPC20Response, JSONRPC20Request
+from websockets.exceptions import WebSocketException
 
-from pylestia.types import Base64
 from .abc import RPCExecutor, Transport, logger
+from .cache import MISS, ResponseCache
+from .codec import (
+    Codec,
+    JSONEncoder,  # noqa: F401 - imported from here before the codecs moved
+    StreamedMessage,
+    get_codec,
+    params_key,
+)
+from .limiter import AdaptiveLimiter
+from .metrics import RPCMetrics
+from .singleflight import SingleFlight
+from .store import DiskStore
 
 
 class TxConfig(t.TypedDict):
@@ -67,59 +78,260 @@ RPC_VALUE_ERRORS = [
     "invalid namespace type",
 ]
 
+# Read-only methods that are safe to send to the node more than once.
+IDEMPOTENT_METHODS = frozenset(
+    {
+        "blob.Get",
+        "blob.GetAll",
+        "blob.GetProof",
+        "blob.Included",
+        "das.SamplingStats",
+        "das.WaitCatchUp",
+        "fraud.Get",
+        "header.GetByHash",
+        "header.GetByHeight",
+        "header.GetRangeByHeight",
+        "header.LocalHead",
+        "header.NetworkHead",
+        "header.SyncState",
+        "header.SyncWait",
+        "header.WaitForHeight",
+        "p2p.BandwidthForPeer",
+        "p2p.BandwidthForProtocol",
+        "p2p.BandwidthStats",
+        "p2p.Connectedness",
+        "p2p.Info",
+        "p2p.IsProtected",
+        "p2p.ListBlockedPeers",
+        "p2p.NATStatus",
+        "p2p.PeerInfo",
+        "p2p.Peers",
+        "p2p.PubSubPeers",
+        "p2p.PubSubTopics",
+        "p2p.ResourceState",
+        "share.GetEDS",
+        "share.GetNamespaceData",
+        "share.GetRange",
+        "share.GetSamples",
+        "share.GetShare",
+        "share.SharesAvailable",
+        "state.AccountAddress",
+        "state.Balance",
+        "state.BalanceForAddress",
+        "state.QueryDelegation",
+        "state.QueryRedelegations",
+        "state.QueryUnbonding",
+    }
+)
 
-class JSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if is_dataclass(obj):
-            return asdict(obj)
-        if isinstance(obj, Base64):
-            return str(obj)
-        return super().default(obj)
+# Default deadlines of methods that should not wait for the global timeout, in seconds.
+# A callable receives the size of the encoded request in bytes.
+METHOD_TIMEOUTS = {
+    "header.LocalHead": 10,
+    "header.NetworkHead": 10,
+    "header.SyncState": 10,
+    "das.SamplingStats": 10,
+    "p2p.Info": 10,
+    "state.AccountAddress": 10,
+    "state.Balance": 30,
+    "state.BalanceForAddress": 30,
+    "header.GetByHash": 30,
+    "header.GetByHeight": 30,
+    "blob.Get": 60,
+    "blob.GetAll": 60,
+    "blob.GetProof": 60,
+    "share.GetShare": 30,
+    "share.GetRange": 60,
+    "share.GetNamespaceData": 60,
+    "share.GetEDS": 120,
+    # Inclusion takes a few blocks; larger payloads take longer to propagate
+    "blob.Submit": lambda size: 60 + size / 50_000,
+}
+
+# Methods whose params may carry memory-mapped blob data, which is streamed while it is sent.
+STREAMED_METHODS = frozenset({"blob.Submit", "state.SubmitPayForBlob"})
+
+# Method used to ask the node to abandon a request it is still working on.
+CANCEL_METHOD = "xrpc.cancel"
+
+# Notification by which the node ends a subscription, e.g. one whose consumer fell behind.
+CHANNEL_CLOSE_METHOD = "xrpc.ch.close"
+
+# Marks the end of a subscription whose transport was closed without an error.
+_CLOSED = object()
+
+
+class RPCError:
+    """The error object of a JSON-RPC response.
+
+    Attributes:
+        body (dict): The raw error object, with ``code``, ``message`` and optional ``data``.
+    """
+
+    def __init__(self, body: dict):
+        self.body = body
+
+    @property
+    def code(self) -> int | None:
+        return self.body.get("code")
+
+    @property
+    def message(self) -> str | None:
+        return self.body.get("message")
+
+    def __repr__(self) -> str:
+        return f"RPCError({self.body!r})"
+
+
+def _is_transport_error(exc: BaseException) -> bool:
+    """Whether the call failed on the way to the node rather than being answered with an error."""
+    return isinstance(
+        exc, (ConnectionError, OSError, asyncio.TimeoutError, WebSocketException)
+    ) and not (len(exc.args) > 1 and isinstance(exc.args[1], RPCError))
+
+
+class _Subscription:
+    """A local subscription; its server-side ID changes when it is re-established."""
+
+    def __init__(self, id: str, method: str, params: tuple[t.Any, ...]):
+        self.id = id
+        self.method = method
+        self.params = params
+        self.queue = asyncio.Queue()
 
 
 class RPC(RPCExecutor):
-    """RPC encoder / executor / decoder"""
+    """RPC encoder / executor / decoder
+
+    Each call has a deadline: the ``timeout`` argument of :meth:`call` if given, otherwise the
+    entry for the method in ``method_timeouts``, otherwise the global ``timeout``. A call that
+    times out or is cancelled is removed from the pending calls at once, and the node is asked
+    to abandon it. :attr:`timeouts` and :attr:`cancellations` count such calls per method.
+
+    When the transport is lost, the owner of the executor may :meth:`suspend` it instead of
+    closing it and later :meth:`resume` it on a new transport. Pending idempotent calls are then
+    sent again and subscriptions are re-established under their existing local iterators.
+
+    With a ``limiter``, a call waits for a slot of the :class:`~.limiter.AdaptiveLimiter`
+    before it is sent; the wait does not count towards its deadline. A limiter may be shared
+    by several executors to limit the calls to one node across connections.
+
+    With ``metrics``, calls, errors, latencies, sizes and deserialization times are recorded
+    per method into the given :class:`~.metrics.RPCMetrics`.
+
+    With ``flights``, an idempotent call made while an identical call (same method and params)
+    is in flight joins it instead of sending a new request, and shares its raw result, which
+    each caller deserializes on its own. Each caller keeps its own ``timeout``; the request is
+    cancelled when no caller waits for it any more.
+
+    With a ``cache``, results of the methods it caches are served from it when present and
+    stored in it after a successful call. A ``store`` adds a persistent tier below the cache:
+    results it holds are read from disk, and results fetched from the node are written to it.
+    """
 
-    def __init__(self, transport: Transport, timeout: float = 180):
+    def __init__(
+        self,
+        transport: Transport,
+        timeout: float = 180,
+        codec: str | Codec | None = None,
+        method_timeouts: dict[str, float | t.Callable[[int], float]] | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        metrics: RPCMetrics | None = None,
+        flights: SingleFlight | None = None,
+        cache: ResponseCache | None = None,
+        store: DiskStore | None = None,
+    ):
         self.timeout = timeout
+        self.limiter = limiter
+        self.metrics = metrics
+        self.flights = flights
+        self.cache = cache
+        self.store = store
+        self.method_timeouts = (
+            METHOD_TIMEOUTS if method_timeouts is None else {**METHOD_TIMEOUTS, **method_timeouts}
+        )
+        self.timeouts = Counter()  # type: Counter[str]
+        self.cancellations = Counter()  # type: Counter[str]
+        self._background = set()  # type: set[asyncio.Task]
+        self.codec = get_codec(codec)
         self.transport = transport
         self.transport.on_message = self.on_transport_response
         self.transport.on_close = self.on_transport_close
+        self.transport.on_failure = self.on_transport_failure
         self._pending = dict()  # type: dict[str, Future]
-        self._subscriptions = dict()  # type: dict[str, deque[t.Any]]
+        self._requests = dict()  # type: dict[str, dict]
+        self._subscriptions = dict()  # type: dict[str, _Subscription]
+        self._resubscribing = dict()  # type: dict[str, _Subscription]
+        # Notifications that arrive before the response to their subscription call
+        self._early = dict()  # type: dict[str, list[t.Any]]
+        self._subscribing = 0
+        self._methods = dict()  # type: dict[str, str]
+        self._sizes = dict()  # type: dict[str, int]
+        self._ready = asyncio.Event()
+        self._ready.set()
+
+    def on_transport_response(self, message: str | bytes):
+        size = len(message)
+        message = self.codec.loads(message)
+        if isinstance(message, list):
+            # Responses of a batch share its size; an empty batch answers nothing
+            share = size // max(len(message), 1)
+            for item in message:
+                self._dispatch(item, share)
+        else:
+            self._dispatch(message, size)
 
-    def on_transport_response(self, message: str):
-        message = json.loads(message)
-        if "method" in message:
+    def _dispatch(self, message: dict, size: int = 0):
+        if message.get("method") == CHANNEL_CLOSE_METHOD:
+            subscription = self._subscriptions.pop((message.get("params") or [None])[0], None)
+            if subscription is not None:
+                subscription.queue.put_nowait(_CLOSED)
+        elif "method" in message:
             subscription_id, item = message["params"]
             subscription = self._subscriptions.get(subscription_id, None)
             if subscription is not None:
-                subscription.append(item)
-        else:
-            response = JSONRPC20Response(result=False)
-            response.body = message
-            if future := self._pending.get(response.id):
-                if response.error is not None:
-                    error_body = getattr(response.error, "body", None)
-                    error_message = (
-                        error_body.get("message", None).lower() if error_body else None
-                    )
-                    if any(keyword in error_message for keyword in RPC_VALUE_ERRORS):
-                        future.set_exception(ValueError(error_message))
-                    elif error_message is None or error_body is None:
-                        future.set_exception(
-                            ConnectionError("RPC failed; undefined error")
-                        )
-                    else:
-                        future.set_exception(
-                            ConnectionError(
-                                f"RPC failed; {error_message}", response.error
-                            )
-                        )
-                else:
-                    future.set_result(response.result)
+                if self.metrics is not None:
+                    self.metrics.received(subscription.method, size, notification=True)
+                subscription.queue.put_nowait(item)
+            elif self._subscribing:
+                self._early.setdefault(subscription_id, []).append(item)
+        elif (subscription := self._resubscribing.pop(message.get("id"), None)) is not None:
+            if message.get("error") is None:
+                subscription.id = message.get("result")
+                self._subscriptions[subscription.id] = subscription
             else:
-                logger.warning("Received message with unexpected ID.")
+                subscription.queue.put_nowait(self._error(message["error"]))
+        elif (future := self._pending.get(message.get("id"))) is not None:
+            if future.done():
+                return
+            if self.metrics is not None:
+                self.metrics.received(self._methods.get(message["id"], "unknown"), size)
+            if message["id"] in self._sizes:
+                self._sizes[message["id"]] = size
+            error = message.get("error")
+            if error is None:
+                future.set_result(message.get("result"))
+            else:
+                future.set_exception(self._error(error))
+        else:
+            logger.warning("Received message with unexpected ID.")
+
+    @staticmethod
+    def _error(error: dict) -> Exception:
+        error_message = error.get("message") if isinstance(error, dict) else None
+        if error_message is None:
+            return ConnectionError("RPC failed; undefined error")
+        error_message = error_message.lower()
+        if any(keyword in error_message for keyword in RPC_VALUE_ERRORS):
+            return ValueError(error_message)
+        return ConnectionError(f"RPC failed; {error_message}", RPCError(error))
+
+    def on_transport_failure(self, ids: list[t.Any], exc: Exception):
+        """Fails pending calls whose request or response was lost on the way to the node."""
+        for id in ids:
+            future = self._pending.get(id)
+            if future is not None and not future.done():
+                future.set_exception(exc)
 
     def on_transport_close(self, exc: Exception = None):
         if exc:
@@ -127,32 +339,250 @@ class RPC(RPCExecutor):
             exc = e.with_traceback(exc.__traceback__)
 
         for future in self._pending.values():
+            if future.done():
+                continue
             if exc:
                 future.set_exception(exc)
             else:
                 future.set_exception(ConnectionError("RPC failed; transport closed"))
 
-        for id in tuple(self._subscriptions.keys()):
-            subscription = self._subscriptions.pop(id)
-            if exc:
-                subscription.append(exc)
+        for subscription in (*self._subscriptions.values(), *self._resubscribing.values()):
+            subscription.queue.put_nowait(exc if exc else _CLOSED)
+        self._subscriptions.clear()
+        self._resubscribing.clear()
+        self._ready.set()
+
+    def suspend(self, exc: Exception = None):
+        """Holds the executor until :meth:`resume` after the transport was lost.
+
+        Pending calls of non-idempotent methods fail, since it is unknown whether the node
+        executed them. Idempotent calls and subscriptions are kept, and new calls wait for
+        the executor to be resumed.
+
+        Args:
+            exc: The error that caused the transport to be lost, if any.
+        """
+        self._ready.clear()
+        error = "RPC failed; transport lost"
+        if exc:
+            error = f"{error} by error {exc}"
+        for id, future in tuple(self._pending.items()):
+            if id not in self._requests and not future.done():
+                future.set_exception(ConnectionError(error))
+        for subscription in self._resubscribing.values():
+            self._subscriptions[subscription.id] = subscription
+        self._resubscribing.clear()
+
+    async def resume(self, transport: Transport):
+        """Resumes a suspended executor on a new transport.
+
+        Sends the pending idempotent calls again and re-establishes every subscription.
+
+        Args:
+            transport: The new transport.
+        """
+        self.transport = transport
+        self.transport.on_message = self.on_transport_response
+        self.transport.on_close = self.on_transport_close
+        self.transport.on_failure = self.on_transport_failure
+        for id in tuple(self._pending):
+            if (request := self._requests.get(id)) is not None:
+                await self.transport.send(self.codec.dumps(request))
+        subscriptions = tuple(self._subscriptions.values())
+        self._subscriptions.clear()
+        for subscription in subscriptions:
+            id, request = self._request(subscription.method, subscription.params)
+            self._resubscribing[id] = subscription
+            await self.transport.send(self.codec.dumps(request))
+        self._ready.set()
 
     async def call(
         self,
         method: str,
         params: tuple[t.Any, ...] = None,
         deserializer: t.Callable[[t.Any], t.Any] = None,
+        *,
+        timeout: float | None = None,
     ) -> t.Any | None:
-        params = params or ()
-        deserializer = deserializer or (lambda a: a)
+        cached = self.cache is not None and self.cache.caches(method)
+        stored = self.store is not None and self.store.stores(method)
+        coalesced = self.flights is not None and method in IDEMPOTENT_METHODS
+        if not cached and not stored and not coalesced:
+            result = await self._call(method, params, timeout)
+            return self._deserialize(method, deserializer, result)
+
+        key = params_key(params)
+        if cached and (result := self.cache.get(method, key)) is not MISS:
+            return self._deserialize(method, deserializer, result)
+        cache_key = key if cached else None
+        store_key = key if stored else None
+        if not coalesced:
+            result = await self._load(method, params, timeout, cache_key, store_key)
+            return self._deserialize(method, deserializer, result)
+
+        flight, joined = self.flights.join(
+            method, key, lambda: self._load(method, params, None, cache_key, store_key)
+        )
+        if joined and self.metrics is not None:
+            self.metrics[method].coalesced += 1
+        try:
+            result = await flight.wait(timeout)
+        except asyncio.TimeoutError:
+            # A request that timed out itself was counted once; count the callers that joined
+            # it, and those that gave up on it first
+            if joined or not flight.task.done():
+                self.timeouts[method] += 1
+            raise
+        return self._deserialize(method, deserializer, result)
+
+    async def _load(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] | None,
+        timeout: float | None,
+        cache_key: str | None,
+        store_key: str | None,
+    ) -> t.Any:
+        """Returns the raw result of a call from the disk store under ``store_key`` if it holds
+        it, otherwise from the node, writing the result through to the store."""
+        if store_key is None:
+            return await self._call(method, params, timeout, cache_key)
+        data = await self.store.get(method, store_key)
+        if data is not None:
+            result = self.codec.loads(data)
+            if cache_key is not None:
+                self.cache.put(method, cache_key, result, len(data))
+            return result
+        result = await self._call(method, params, timeout, cache_key)
+        await self.store.put(method, store_key, self.codec.dumps(result))
+        return result
+
+    async def _call(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        timeout: float | None = None,
+        cache_key: str | None = None,
+    ) -> t.Any:
+        """Sends a call and returns its raw result, caching it under ``cache_key`` if given."""
+        id, request = self._request(method, params)
+        if method in STREAMED_METHODS:
+            message = StreamedMessage.encode(self.codec, request)
+        else:
+            message = self.codec.dumps(request)
+        future = None
+        limiter = self.limiter
+        if limiter is not None:
+            start = await limiter.acquire()
+        metrics = self.metrics
+        if metrics is not None:
+            sent = metrics.started(method, len(message))
+        try:
+            async with asyncio.timeout(self.deadline(method, len(message), timeout)):
+                await self._ready.wait()
+                future = self._register(id, request)
+                if cache_key is not None:
+                    self._sizes[id] = 0
+                await self.transport.send(message)
+                result = await future
+        except BaseException as exc:
+            self._abandon(id, future, method, exc)
+            self._sizes.pop(id, None)
+            if limiter is not None:
+                # A cancelled call tells nothing about the node
+                cancelled = isinstance(exc, asyncio.CancelledError)
+                limiter.release(method, start, None if cancelled else _is_transport_error(exc))
+            if metrics is not None:
+                metrics.finished(method, sent, exc)
+            raise
+        if limiter is not None:
+            limiter.release(method, start, False)
+        if metrics is not None:
+            metrics.finished(method, sent)
+        if cache_key is not None:
+            self.cache.put(method, cache_key, result, self._sizes.pop(id, 0))
+        return result
+
+    def _deserialize(
+        self,
+        method: str,
+        deserializer: t.Callable[[t.Any], t.Any] | None,
+        result: t.Any,
+    ) -> t.Any:
+        """Applies the deserializer of a call."""
+        if deserializer is None:
+            return result
+        start = time.perf_counter()
+        try:
+            return deserializer(result)
+        finally:
+            if self.metrics is not None:
+                self.metrics.deserialized(method, start)
+
+    def deadline(self, method: str, size: int = 0, timeout: float | None = None) -> float:
+        """Returns the timeout of a call, in seconds.
+
+        Args:
+            method: The method name.
+            size: The size of the encoded request in bytes.
+            timeout: The timeout given for the call, if any.
+        """
+        if timeout is not None:
+            return timeout
+        method_timeout = self.method_timeouts.get(method)
+        if method_timeout is None:
+            return self.timeout
+        if callable(method_timeout):
+            return method_timeout(size)
+        return method_timeout
+
+    def _abandon(self, id: str, future: Future | None, method: str, exc: BaseException):
+        """Forgets a call that failed, timed out or was cancelled."""
+        self._pending.pop(id, None)
+        self._requests.pop(id, None)
+        self._methods.pop(id, None)
+        if isinstance(exc, asyncio.TimeoutError):
+            self.timeouts[method] += 1
+        elif isinstance(exc, asyncio.CancelledError):
+            self.cancellations[method] += 1
+        else:
+            return
+        if future is not None and future.cancelled() and self.transport.supports_cancel:
+            # The node may still be working on the request; ask it to stop
+            message = self.codec.dumps({"jsonrpc": "2.0", "method": CANCEL_METHOD, "params": (id,)})
+            task = asyncio.ensure_future(self._send_quietly(message))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _send_quietly(self, message: str):
+        try:
+            await self.transport.send(message)
+        except Exception as exc:
+            logger.debug("Cannot send cancellation: %s", exc)
+
+    def _request(self, method: str, params: tuple[t.Any, ...] = None) -> tuple[str, dict]:
         id = str(uuid.uuid4())
-        request = JSONRPC20Request(method, params, id)
-        await self.transport.send(json.dumps(request.body, cls=JSONEncoder))
+        return id, {"jsonrpc": "2.0", "method": method, "params": params or (), "id": id}
+
+    def _register(self, id: str, request: dict) -> Future:
         future = self._pending[id] = Future()
-        future.add_done_callback(lambda _: self._pending.pop(id, None))
-        async with asyncio.timeout(self.timeout):
-            result = await future
-            return deserializer(result)
+        if request["method"] in IDEMPOTENT_METHODS:
+            # Kept so that the call can be sent again after the transport is resumed
+            self._requests[id] = request
+        if self.metrics is not None:
+            self._methods[id] = request["method"]
+
+        def cleanup(_):
+            self._pending.pop(id, None)
+            self._requests.pop(id, None)
+            self._methods.pop(id, None)
+
+        future.add_done_callback(cleanup)
+        return future
+
+    def batch(self, max_size: int = 100) -> "Batch":
+        """Returns a :class:`Batch` that sends calls through this executor as JSON-RPC batches."""
+        return Batch(self, max_size)
 
     async def subscribe(
         self,
@@ -161,16 +591,190 @@ class RPC(RPCExecutor):
         deserializer: t.Callable[[t.Any], t.Any] = None,
     ) -> AsyncGenerator[t.Any, None]:
         deserializer = deserializer or (lambda a: a)
-        subscription_id = await self.call(method, params)
+        params = params or ()
+        self._subscribing += 1
+        try:
+            subscription = _Subscription(await self.call(method, params), method, params)
+            early = self._early.pop(subscription.id, ())
+        finally:
+            self._subscribing -= 1
+            if not self._subscribing:
+                self._early.clear()
+        for item in early:
+            subscription.queue.put_nowait(item)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics[method].subscriptions += 1
         try:
-            subscription = self._subscriptions[subscription_id] = deque()
-            while subscription_id in self._subscriptions:
-                if len(subscription):
-                    item = subscription.popleft()
-                    if isinstance(item, Exception):
-                        raise item
+            self._subscriptions[subscription.id] = subscription
+            while True:
+                item = await subscription.queue.get()
+                if item is _CLOSED:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if metrics is None:
                     yield deserializer(item)
-                else:
-                    await asyncio.sleep(0.1)
+                    continue
+                start = time.perf_counter()
+                item = deserializer(item)
+                metrics.deserialized(method, start)
+                yield item
         finally:
-            self._subscriptions.pop(subscription_id, None)
+            if metrics is not None:
+                metrics[method].subscriptions -= 1
+            if self._subscriptions.get(subscription.id) is subscription:
+                del self._subscriptions[subscription.id]
+            for id, pending in tuple(self._resubscribing.items()):
+                if pending is subscription:
+                    del self._resubscribing[id]
+
+
+class Batch(RPCExecutor):
+    """Collects RPC calls and sends them to the node as JSON-RPC 2.0 batch requests.
+
+    Calls are queued and sent as one JSON array frame at the end of the current event loop
+    iteration, when ``max_size`` calls are queued, or when :meth:`flush` is called, whichever
+    comes first. Calls started together, e.g. with ``asyncio.gather``, therefore share a frame.
+    Responses are matched back to their calls by ID, so each call resolves independently.
+    Subscriptions cannot be batched and are passed through to the underlying executor.
+    """
+
+    def __init__(self, rpc: RPC, max_size: int = 100):
+        self.rpc = rpc
+        self.max_size = max_size
+        self._queue = []  # type: list[tuple[dict, Future]]
+        self._futures = set()  # type: set[Future]
+        self._ids = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[Future, str]
+        self._tasks = set()  # type: set[asyncio.Task]
+
+    def queue(self, method: str, params: tuple[t.Any, ...] = None) -> Future:
+        """Queues a call and returns the future of its raw result."""
+        id, request = self.rpc._request(method, params)
+        future = self.rpc._register(id, request)
+        self._ids[future] = id
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        self._queue.append((request, future))
+        if len(self._queue) == 1:
+            asyncio.get_running_loop().call_soon(self._schedule_flush)
+        elif len(self._queue) >= self.max_size:
+            self._schedule_flush()
+        return future
+
+    def _schedule_flush(self):
+        if self._queue:
+            task = asyncio.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Sends all queued calls, at most ``max_size`` calls per frame."""
+        await self.rpc._ready.wait()
+        while self._queue:
+            queue = []
+            for request, future in self._queue[: self.max_size]:
+                if future.done():
+                    # Cancelled or timed out while queued; never sent, so nothing to answer
+                    self._forget(request["id"])
+                else:
+                    queue.append((request, future))
+            del self._queue[: self.max_size]
+            if not queue:
+                continue
+            requests = [request for request, _ in queue]
+            message = requests[0] if len(requests) == 1 else requests
+            try:
+                await self.rpc.transport.send(self.rpc.codec.dumps(message))
+            except Exception as exc:
+                for _, future in queue:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _forget(self, id: str) -> None:
+        self.rpc._pending.pop(id, None)
+        self.rpc._requests.pop(id, None)
+        self.rpc._methods.pop(id, None)
+
+    async def join(self) -> None:
+        """Flushes queued calls and waits until every call of this batch is resolved."""
+        await self.flush()
+        if self._futures:
+            await asyncio.wait(tuple(self._futures), timeout=self.rpc.timeout)
+
+    async def call(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+        *,
+        timeout: float | None = None,
+    ) -> t.Any | None:
+        future = self.queue(method, params)
+        metrics = self.rpc.metrics
+        if metrics is not None:
+            sent = metrics.started(method)
+        try:
+            async with asyncio.timeout(self.rpc.deadline(method, timeout=timeout)):
+                result = await future
+        except BaseException as exc:
+            self.rpc._abandon(self._ids[future], future, method, exc)
+            if metrics is not None:
+                metrics.finished(method, sent, exc)
+            raise
+        if metrics is not None:
+            metrics.finished(method, sent)
+        return self.rpc._deserialize(method, deserializer, result)
+
+    async def subscribe(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+    ) -> AsyncGenerator[t.Any, None]:
+        async for item in self.rpc.subscribe(method, params, deserializer):
+            yield item
+
+
+class TimeoutOverride(RPCExecutor):
+    """Passes a timeout to every call made through another executor.
+
+    The typed API wrappers over it thereby call with ``timeout`` without taking the argument
+    themselves. A timeout given to a call still takes precedence; subscriptions have none.
+
+    Args:
+        rpc: The executor: a client, a router or a batch.
+        timeout: The timeout of the calls, in seconds.
+    """
+
+    def __init__(self, rpc: RPCExecutor, timeout: float):
+        self.rpc = rpc
+        self.timeout = timeout
+
+    async def call(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+        *,
+        timeout: float | None = None,
+    ) -> t.Any | None:
+        timeout = self.timeout if timeout is None else timeout
+        return await self.rpc.call(method, params, deserializer, timeout=timeout)
+
+    def batch(self, max_size: int = 100) -> "TimeoutOverride":
+        """Returns a batch executor whose calls have the same timeout."""
+        return TimeoutOverride(self.rpc.batch(max_size), self.timeout)
+
+    async def join(self) -> None:
+        """Waits until every call of the underlying batch is resolved."""
+        await self.rpc.join()
+
+    async def subscribe(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+    ) -> AsyncGenerator[t.Any, None]:
+        async for item in self.rpc.subscribe(method, params, deserializer):
+            yield item
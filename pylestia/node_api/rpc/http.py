@@ -0,0 +1,176 @@
+"""
+HTTP/1.1 keep-alive transport for JSON-RPC calls.
+
+Each message is POSTed to the node over a bounded pool of persistent TCP connections, so large
+responses travel on parallel streams and are not subject to websocket frame size limits.
+HTTP cannot carry subscriptions; those still need a websocket connection.
+"""
+
+import asyncio
+import json
+import ssl
+import typing as t
+from urllib.parse import urlparse
+
+from .abc import Transport, logger
+from .executor import IDEMPOTENT_METHODS
+
+
+class HttpError(ConnectionError):
+    """Raised when the node answers with a non-successful HTTP status."""
+
+
+def _idempotent(message: str) -> bool:
+    """Whether every call of a message is safe to send to the node more than once."""
+    requests = json.loads(message)
+    requests = requests if isinstance(requests, list) else [requests]
+    return all(request.get("method") in IDEMPOTENT_METHODS for request in requests)
+
+
+class HttpTransport(Transport):
+    """Transport that POSTs messages over a pool of HTTP/1.1 keep-alive connections.
+
+    :meth:`send` returns as soon as the request is scheduled; the response is delivered
+    through ``on_message`` like any other transport. At most ``pool_size`` requests are
+    on the wire at once; further requests wait for a free connection. Calls of a request
+    that fails on the way to the node are failed through ``on_failure`` with a
+    :class:`ConnectionError`.
+    """
+
+    supports_cancel = False
+
+    def __init__(
+        self,
+        url: str,
+        headers: t.Sequence[tuple[str, str]] = (),
+        pool_size: int = 8,
+    ):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError("Unsupported URL scheme, must be http or https")
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.path = parsed.path or "/"
+        self.ssl = ssl.create_default_context() if parsed.scheme == "https" else None
+        self.pool_size = pool_size
+        self._head = "".join(
+            f"{name}: {value}\r\n"
+            for name, value in (
+                ("Host", f"{self.host}:{self.port}"),
+                ("Content-Type", "application/json"),
+                ("Connection", "keep-alive"),
+                *headers,
+            )
+        )
+        self._idle = []  # type: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        self._slots = asyncio.Semaphore(pool_size)
+        self._tasks = set()  # type: set[asyncio.Task]
+        self._closed = False
+
+    async def send(self, message: str) -> None:
+        if self._closed:
+            raise ConnectionError("HTTP transport is closed")
+        # Streamed messages are joined, since the body length is sent up front
+        task = asyncio.create_task(self._post(str(message)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Closes all connections and fails requests that are still in flight."""
+        self._closed = True
+        for task in tuple(self._tasks):
+            task.cancel()
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        self.on_close(None)
+
+    async def _post(self, message: str) -> None:
+        body = message.encode("utf-8")
+        request = (
+            f"POST {self.path} HTTP/1.1\r\n{self._head}Content-Length: {len(body)}\r\n\r\n"
+        ).encode("ascii") + body
+        async with self._slots:
+            try:
+                while True:
+                    reused = bool(self._idle)
+                    reader, writer = await self._acquire()
+                    sent = False
+                    try:
+                        writer.write(request)
+                        await writer.drain()
+                        sent = True
+                        status, keep_alive, response = await self._receive(reader)
+                        break
+                    except (OSError, asyncio.IncompleteReadError) as exc:
+                        writer.close()
+                        # A reused connection may have been closed by the node in the
+                        # meantime. The request is sent again on a fresh one only if the node
+                        # cannot have received it, or if it is safe to execute twice.
+                        if not reused or (sent and not _idempotent(message)):
+                            raise ConnectionError(f"HTTP request failed; {exc}") from exc
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if not isinstance(exc, ConnectionError):
+                    exc = ConnectionError(f"HTTP request failed; {exc}")
+                self._fail(message, exc)
+                return
+
+        if keep_alive and not self._closed:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+        if status != 200:
+            self._fail(message, HttpError(f"HTTP {status}: {response[:200]!r}"))
+        elif response:
+            self.on_message(response)
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    @staticmethod
+    async def _receive(reader: asyncio.StreamReader) -> tuple[int, bool, bytes]:
+        status_line = await reader.readuntil(b"\r\n")
+        version, status = status_line.split(b" ", 2)[:2]
+        headers = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            # Skip trailers
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif int(status) in (204, 304):
+            body = b""
+        else:
+            # The body is delimited by the end of the connection
+            body = await reader.read()
+            headers["connection"] = "close"
+
+        connection = headers.get("connection", "")
+        keep_alive = connection != "close" and (
+            version != b"HTTP/1.0" or connection == "keep-alive"
+        )
+        return int(status), keep_alive, body
+
+    def _fail(self, message: str, exc: ConnectionError) -> None:
+        """Fails the calls of a message that got no response."""
+        logger.warning("HTTP transport request failed: %s", exc)
+        requests = json.loads(message)
+        requests = requests if isinstance(requests, list) else [requests]
+        self.on_failure([request["id"] for request in requests if "id" in request], exc)
@@ -0,0 +1,139 @@
+"""
+Adaptive limit of the number of RPC calls in flight.
+
+Firing thousands of calls at once (e.g. ``asyncio.gather`` over a range of heights) overloads
+the node until responses time out together. The limiter keeps calls beyond the current limit
+waiting on the client side and adjusts the limit to what the node sustains: additive increase
+while latency stays near its baseline, multiplicative decrease on timeouts, transport errors
+or a latency spike.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """AIMD limiter of concurrent calls.
+
+    Every call that completes within ``tolerance`` times the baseline latency of its method
+    grows the limit by ``1 / limit``, i.e. by one per round of calls. A call that is dropped
+    (timed out or failed on the way to the node) or slower than that shrinks the limit by the
+    ``backoff`` factor. Only calls started after the last decrease can shrink the limit again,
+    so a burst of timeouts from one overloaded round counts as a single congestion signal.
+
+    The baseline of a method is the lowest latency observed for it within the last one to two
+    ``window`` periods, so that it follows lasting changes of the node or the network.
+
+    Args:
+        initial_limit: The number of calls allowed in flight at first.
+        min_limit: The lower bound of the limit.
+        max_limit: The upper bound of the limit.
+        backoff: The factor applied to the limit on congestion.
+        tolerance: How many times the baseline latency a call may take before it counts
+            as congestion.
+        min_latency: Latencies below this many seconds never count as congestion, which keeps
+            jitter of very fast calls from shrinking the limit.
+        window: The period after which old latency observations are forgotten, in seconds.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        min_latency: float = 0.005,
+        window: float = 60.0,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.min_latency = min_latency
+        self.window = window
+        self.in_flight = 0
+        self._baselines = dict()  # type: dict[str, float]
+        self._previous_baselines = dict()  # type: dict[str, float]
+        self._window_start = time.perf_counter()
+        self._waiters = deque()  # type: deque[asyncio.Future]
+        self._last_decrease = 0.0
+
+    @property
+    def waiting(self) -> int:
+        """The number of calls waiting for a slot."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    def baseline(self, method: str) -> float | None:
+        """Returns the baseline latency of a method in seconds, or None if not observed."""
+        baselines = [
+            baseline
+            for baseline in (self._baselines.get(method), self._previous_baselines.get(method))
+            if baseline is not None
+        ]
+        return min(baselines) if baselines else None
+
+    async def acquire(self) -> float:
+        """Waits for a free slot.
+
+        Returns:
+            float: The start time of the call, to be passed to :meth:`release`.
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return time.perf_counter()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self.in_flight -= 1
+                self._wake()
+            raise
+        return time.perf_counter()
+
+    def release(self, method: str, start: float, dropped: bool | None) -> None:
+        """Frees the slot of a finished call and adjusts the limit.
+
+        Args:
+            method: The method of the call.
+            start: The start time returned by :meth:`acquire`.
+            dropped: Whether the call timed out or failed on the way to the node; None if the
+                call says nothing about the node, e.g. because it was cancelled.
+        """
+        self.in_flight -= 1
+        if dropped is not None:
+            self._observe(method, start, time.perf_counter() - start, dropped)
+        self._wake()
+
+    def _observe(self, method: str, start: float, latency: float, dropped: bool) -> None:
+        now = time.perf_counter()
+        if now - self._window_start >= self.window:
+            self._previous_baselines, self._baselines = self._baselines, {}
+            self._window_start = now
+        current = self._baselines.get(method)
+        if not dropped and (current is None or latency < current):
+            self._baselines[method] = latency
+
+        baseline = self.baseline(method)
+        congested = dropped or latency > max(self.tolerance * baseline, self.min_latency)
+        if congested:
+            if start >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
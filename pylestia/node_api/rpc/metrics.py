@@ -0,0 +1,316 @@
+"""
+Per-method metrics of the RPC traffic.
+
+:class:`RPCMetrics` records, for every JSON-RPC method, the number of calls sent and of calls
+that joined an identical call in flight, errors by class, latency and deserialization time
+histograms, request and response bytes, calls in flight and active subscriptions.
+:meth:`RPCMetrics.snapshot` returns a plain dictionary of the current
+values; :class:`PrometheusCollector` and :func:`register_opentelemetry` export them to
+``prometheus_client`` and OpenTelemetry, if those packages are installed.
+"""
+
+import asyncio
+import math
+import time
+import typing as t
+from bisect import bisect_left
+from collections import Counter
+
+from websockets.exceptions import WebSocketException
+
+from pylestia.types.errors import parse_error_message
+
+# Upper bounds of the histogram buckets, in seconds.
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, math.inf,
+)  # fmt: skip
+
+
+def classify_error(exc: BaseException) -> str:
+    """Returns the class of a call failure used to group errors.
+
+    Error responses whose message matches an :class:`~pylestia.types.errors.ErrorCode` are
+    named after the code, whether they are raised as ``ValueError`` or ``ConnectionError``;
+    other ``ValueError`` are ``"value_error"`` and other error responses ``"rpc_error"``.
+    Failures without a response are ``"timeout"``, ``"cancelled"`` or, when the node could not
+    be reached, ``"transport_error"``; anything else is ``"error"``.
+    """
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    # Error responses are plain ConnectionErrors that carry the RPCError as the second argument;
+    # OS-level subclasses such as ConnectionRefusedError carry an errno instead
+    response = type(exc) is ConnectionError and len(exc.args) > 1
+    if isinstance(exc, ValueError) or response:
+        parsed = parse_error_message(str(exc.args[0]) if exc.args else "")
+        if parsed is not None:
+            return parsed[0].name
+        return "value_error" if isinstance(exc, ValueError) else "rpc_error"
+    if isinstance(exc, (OSError, WebSocketException)):
+        return "transport_error"
+    return "error"
+
+
+class Histogram:
+    """Histogram of observations over fixed bucket bounds.
+
+    Attributes:
+        counts (list[int]): The number of observations per bucket.
+        sum (float): The sum of all observations.
+        count (int): The number of observations.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Returns the upper bound of the bucket that holds the ``q`` quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, t.Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(self.buckets, self.counts)),
+        }
+
+
+class MethodMetrics:
+    """Metrics of one JSON-RPC method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = Counter()  # type: Counter[str]
+        self.in_flight = 0
+        self.subscriptions = 0
+        self.notifications = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+        self.deserialize = Histogram()
+
+    def snapshot(self) -> dict[str, t.Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": dict(self.errors),
+            "in_flight": self.in_flight,
+            "subscriptions": self.subscriptions,
+            "notifications": self.notifications,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.snapshot(),
+            "deserialize": self.deserialize.snapshot(),
+        }
+
+
+class RPCMetrics:
+    """Per-method metrics, shared by the executors of a client.
+
+    Latency is measured from sending the request to receiving its response, excluding time
+    spent waiting for the concurrency limiter. The response bytes of a batch frame are split
+    evenly among its calls, and batched calls do not record request bytes.
+
+    Attributes:
+        methods (dict[str, MethodMetrics]): The metrics of each method seen so far.
+        observers (list[Callable]): Called as ``observer(method, latency, error_class)`` after
+            every finished call; ``error_class`` is None for successful calls.
+    """
+
+    def __init__(self):
+        self.methods = dict()  # type: dict[str, MethodMetrics]
+        self.observers = []  # type: list[t.Callable[[str, float, str | None], None]]
+
+    def __getitem__(self, method: str) -> MethodMetrics:
+        metrics = self.methods.get(method)
+        if metrics is None:
+            metrics = self.methods[method] = MethodMetrics()
+        return metrics
+
+    def started(self, method: str, size: int | None = None) -> float:
+        """Records the start of a call and returns its start time."""
+        metrics = self[method]
+        metrics.calls += 1
+        metrics.in_flight += 1
+        if size is not None:
+            metrics.request_bytes += size
+        return time.perf_counter()
+
+    def finished(self, method: str, start: float, exc: BaseException | None = None) -> None:
+        """Records the end of a call started at ``start``."""
+        latency = time.perf_counter() - start
+        metrics = self[method]
+        metrics.in_flight -= 1
+        error = None
+        if exc is None:
+            metrics.latency.observe(latency)
+        else:
+            error = classify_error(exc)
+            metrics.errors[error] += 1
+        for observer in self.observers:
+            observer(method, latency, error)
+
+    def deserialized(self, method: str, start: float) -> None:
+        """Records the time spent deserializing a result since ``start``."""
+        self[method].deserialize.observe(time.perf_counter() - start)
+
+    def received(self, method: str, size: int, notification: bool = False) -> None:
+        """Records a response or a subscription notification of ``size`` bytes."""
+        metrics = self[method]
+        metrics.response_bytes += size
+        if notification:
+            metrics.notifications += 1
+
+    def snapshot(self) -> dict[str, dict[str, t.Any]]:
+        """Returns the current metrics of each method as plain dictionaries."""
+        return {method: metrics.snapshot() for method, metrics in self.methods.items()}
+
+
+class PrometheusCollector:
+    """Exports :class:`RPCMetrics` through ``prometheus_client``.
+
+    Example:
+        >>> from prometheus_client import REGISTRY
+        >>> REGISTRY.register(PrometheusCollector(client.rpc_metrics))
+
+    Args:
+        metrics: The metrics to export.
+        prefix: The prefix of the exported metric names.
+    """
+
+    def __init__(self, metrics: RPCMetrics, prefix: str = "pylestia_rpc"):
+        from prometheus_client.core import (
+            CounterMetricFamily,
+            GaugeMetricFamily,
+            HistogramMetricFamily,
+        )
+
+        self._counter = CounterMetricFamily
+        self._gauge = GaugeMetricFamily
+        self._histogram = HistogramMetricFamily
+        self.metrics = metrics
+        self.prefix = prefix
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        prefix = self.prefix
+        calls = self._counter(f"{prefix}_calls", "RPC calls sent.", labels=["method"])
+        coalesced = self._counter(
+            f"{prefix}_coalesced", "Calls that joined an identical call.", labels=["method"]
+        )
+        errors = self._counter(f"{prefix}_errors", "Failed RPC calls.", labels=["method", "error"])
+        sent = self._counter(f"{prefix}_request_bytes", "Bytes sent.", labels=["method"])
+        received = self._counter(f"{prefix}_response_bytes", "Bytes received.", labels=["method"])
+        notifications = self._counter(
+            f"{prefix}_notifications", "Subscription items received.", labels=["method"]
+        )
+        in_flight = self._gauge(f"{prefix}_in_flight", "RPC calls in flight.", labels=["method"])
+        subscriptions = self._gauge(
+            f"{prefix}_subscriptions", "Active subscriptions.", labels=["method"]
+        )
+        latency = self._histogram(
+            f"{prefix}_latency_seconds", "RPC call latency.", labels=["method"]
+        )
+        deserialize = self._histogram(
+            f"{prefix}_deserialize_seconds", "Result deserialization time.", labels=["method"]
+        )
+
+        for method, metrics in tuple(self.metrics.methods.items()):
+            calls.add_metric([method], metrics.calls)
+            coalesced.add_metric([method], metrics.coalesced)
+            for error, count in metrics.errors.items():
+                errors.add_metric([method, error], count)
+            sent.add_metric([method], metrics.request_bytes)
+            received.add_metric([method], metrics.response_bytes)
+            notifications.add_metric([method], metrics.notifications)
+            in_flight.add_metric([method], metrics.in_flight)
+            subscriptions.add_metric([method], metrics.subscriptions)
+            histograms = ((latency, metrics.latency), (deserialize, metrics.deserialize))
+            for family, histogram in histograms:
+                buckets, cumulative = [], 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    buckets.append(("+Inf" if bound == math.inf else str(bound), cumulative))
+                family.add_metric([method], buckets, histogram.sum)
+
+        yield from (calls, coalesced, errors, sent, received, notifications)
+        yield from (in_flight, subscriptions, latency, deserialize)
+
+
+def register_opentelemetry(metrics: RPCMetrics, meter=None) -> None:
+    """Exports :class:`RPCMetrics` through the OpenTelemetry metrics API.
+
+    Counters and gauges are observed from ``metrics`` on collection; call latencies are
+    recorded into an OpenTelemetry histogram as calls finish.
+
+    Args:
+        metrics: The metrics to export.
+        meter: The meter to create the instruments with; defaults to the ``pylestia`` meter
+            of the global meter provider.
+    """
+    from opentelemetry import metrics as otel
+
+    meter = meter or otel.get_meter("pylestia")
+
+    def observe(value: t.Callable[[MethodMetrics], int]):
+        def callback(_options):
+            return [
+                otel.Observation(value(method_metrics), {"rpc.method": method})
+                for method, method_metrics in tuple(metrics.methods.items())
+            ]
+
+        return [callback]
+
+    def observe_errors(_options):
+        return [
+            otel.Observation(count, {"rpc.method": method, "error.type": error})
+            for method, method_metrics in tuple(metrics.methods.items())
+            for error, count in method_metrics.errors.items()
+        ]
+
+    meter.create_observable_counter("rpc.client.calls", observe(lambda m: m.calls))
+    meter.create_observable_counter("rpc.client.coalesced", observe(lambda m: m.coalesced))
+    meter.create_observable_counter("rpc.client.errors", [observe_errors])
+    meter.create_observable_counter(
+        "rpc.client.request.size", observe(lambda m: m.request_bytes), unit="By"
+    )
+    meter.create_observable_counter(
+        "rpc.client.response.size", observe(lambda m: m.response_bytes), unit="By"
+    )
+    meter.create_observable_up_down_counter("rpc.client.in_flight", observe(lambda m: m.in_flight))
+    meter.create_observable_up_down_counter(
+        "rpc.client.subscriptions", observe(lambda m: m.subscriptions)
+    )
+    duration = meter.create_histogram("rpc.client.duration", unit="s")
+
+    def record(method: str, latency: float, error: str | None):
+        attributes = {"rpc.method": method}
+        if error is not None:
+            attributes["error.type"] = error
+        duration.record(latency, attributes)
+
+    metrics.observers.append(record)
@@ -0,0 +1,284 @@
+"""
+Recording and replay of the frames exchanged with a node.
+
+A :class:`Recorder` captures every frame a client sends and receives, with its time and
+connection, through :class:`RecordingTransport` wrappers. Recordings are written as JSON
+lines, one frame per line. A :class:`ReplayTransport` then answers the same calls with the
+recorded responses and subscription notifications, with the original timing or as fast as
+possible, so that decoding and consumer code can be profiled on real payloads without a node.
+"""
+
+import asyncio
+import json
+import os
+import time
+import typing as t
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+
+from .abc import Transport, logger
+
+
+class Recorder:
+    """Collects the frames of recording transports.
+
+    Frames are kept in :attr:`records` and, if a path is given, appended to that file as JSON
+    lines of ``{"time", "connection", "direction", "frame"}``. The time is in seconds since
+    the recorder was created; the direction is ``"send"`` or ``"receive"``.
+
+    Args:
+        path: The file to write the recording to, or None to keep it in memory only.
+        keep: Whether to keep the records in memory when writing them to a file.
+
+    Attributes:
+        records (list[dict]): The records kept in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None, keep: bool | None = None):
+        self.path = Path(path).expanduser() if path is not None else None
+        self.keep = path is None if keep is None else keep
+        self.records = []  # type: list[dict]
+        self._file = None  # type: t.TextIO | None
+        self._connections = 0
+        self._start = time.monotonic()
+
+    def wrap(self, transport: Transport) -> "RecordingTransport":
+        """Returns a transport that records the frames of ``transport`` as a new connection."""
+        self._connections += 1
+        return RecordingTransport(transport, self, self._connections)
+
+    def record(self, connection: int, direction: str, frame: str | bytes) -> None:
+        """Records a frame."""
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8")
+        record = {
+            "time": time.monotonic() - self._start,
+            "connection": connection,
+            "direction": direction,
+            "frame": frame,
+        }
+        if self.keep:
+            self.records.append(record)
+        if self.path is not None:
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(json.dumps(record) + "\n")
+            except OSError as exc:
+                logger.warning("Recording to %s failed: %s", self.path, exc)
+
+    def close(self) -> None:
+        """Flushes and closes the recording file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordingTransport(Transport):
+    """Transport that records the frames of another transport.
+
+    Incoming frames are recorded whether the wrapped transport delivers them itself or its
+    owner delivers them through :attr:`on_message`.
+    """
+
+    def __init__(self, transport: Transport, recorder: Recorder, connection: int):
+        self.transport = transport
+        self.recorder = recorder
+        self.connection = connection
+        self.supports_cancel = transport.supports_cancel
+        self._on_message = None  # type: t.Callable[[bytes | str], None] | None
+        self._on_close = None  # type: t.Callable[[Exception | None], None] | None
+        self._on_failure = None  # type: t.Callable[[list[t.Any], Exception], None] | None
+        transport.on_message = self._receive
+        transport.on_close = self._close
+        transport.on_failure = self._fail
+
+    @property
+    def on_message(self) -> t.Callable[[bytes | str], None]:
+        return self._receive
+
+    @on_message.setter
+    def on_message(self, callback: t.Callable[[bytes | str], None]) -> None:
+        self._on_message = callback
+
+    @property
+    def on_close(self) -> t.Callable[[Exception | None], None]:
+        return self._close
+
+    @on_close.setter
+    def on_close(self, callback: t.Callable[[Exception | None], None]) -> None:
+        self._on_close = callback
+
+    @property
+    def on_failure(self) -> t.Callable[[list[t.Any], Exception], None]:
+        return self._fail
+
+    @on_failure.setter
+    def on_failure(self, callback: t.Callable[[list[t.Any], Exception], None]) -> None:
+        self._on_failure = callback
+
+    async def send(self, message: str) -> None:
+        self.recorder.record(self.connection, "send", str(message))
+        await self.transport.send(message)
+
+    async def close(self) -> None:
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            await close()
+
+    def _receive(self, message: bytes | str) -> None:
+        self.recorder.record(self.connection, "receive", message)
+        self._on_message(message)
+
+    def _close(self, exc: Exception | None = None) -> None:
+        self._on_close(exc)
+
+    def _fail(self, ids: list[t.Any], exc: Exception) -> None:
+        self._on_failure(ids, exc)
+
+
+def load_recording(path: str | os.PathLike) -> list[dict]:
+    """Reads the records of a recording file."""
+    with open(Path(path).expanduser(), encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def _key(method: str, params: t.Any) -> tuple[str, str]:
+    return method, json.dumps(params or [], sort_keys=True, separators=(",", ":"))
+
+
+def _items(frame: str) -> list[dict]:
+    message = json.loads(frame)
+    return message if isinstance(message, list) else [message]
+
+
+class _Response:
+    def __init__(self, message: dict, latency: float, notifications: list[tuple[float, dict]]):
+        self.message = message
+        self.latency = latency
+        # Offsets from the response and notification messages of the subscription it started
+        self.notifications = notifications
+
+
+class ReplayTransport(Transport):
+    """Transport that answers calls with the responses of a recording.
+
+    Each request is matched to the recorded calls of the same method and params, in recorded
+    order; once they are used up, the last one is answered again. The response carries the
+    ID of the new request. After the response to a subscription, its recorded notifications
+    follow. Calls without a recorded response fail with a JSON-RPC error.
+
+    Use it in place of a node connection::
+
+        rpc = RPC(ReplayTransport("traffic.jsonl", speed=None))
+        header = await HeaderClient(rpc).get_by_height(100)
+
+    Args:
+        recording: The records of a :class:`Recorder`, or the path of a recording file.
+        speed: The factor by which the recorded timing is sped up: 1.0 keeps the response
+            latencies and notification intervals of the recording, and None delivers
+            everything as fast as possible.
+
+    Attributes:
+        unmatched (Counter[str]): The number of calls per method without a recorded response.
+    """
+
+    supports_cancel = False
+
+    def __init__(self, recording: t.Iterable[dict] | str | os.PathLike, speed: float | None = 1.0):
+        if isinstance(recording, (str, os.PathLike)):
+            recording = load_recording(recording)
+        self.speed = speed
+        self.unmatched = Counter()  # type: Counter[str]
+        self._responses = dict()  # type: dict[tuple[str, str], deque[_Response]]
+        self._handles = []  # type: list[asyncio.TimerHandle]
+        self._closed = False
+        self._index(recording)
+
+    def _index(self, records: t.Iterable[dict]) -> None:
+        requests = dict()  # type: dict[t.Any, tuple[tuple[str, str], float]]
+        responses = []  # type: list[tuple[tuple[str, str], float, float, dict]]
+        notifications = defaultdict(list)  # type: defaultdict[t.Any, list[tuple[float, dict]]]
+        for record in records:
+            for message in _items(record["frame"]):
+                if record["direction"] == "send":
+                    if "id" in message and "method" in message:
+                        key = _key(message["method"], message.get("params"))
+                        requests[message["id"]] = (key, record["time"])
+                elif "method" in message:
+                    subscription_id = (message.get("params") or [None])[0]
+                    notifications[subscription_id].append((record["time"], message))
+                elif message.get("id") in requests:
+                    key, sent = requests.pop(message["id"])
+                    responses.append((key, sent, record["time"], message))
+
+        for key, sent, received, message in responses:
+            following = []
+            if message.get("error") is None and isinstance(message.get("result"), (str, int)):
+                following = [
+                    (at - received, notification)
+                    for at, notification in notifications.get(message["result"], ())
+                    if at >= received
+                ]
+            self._responses.setdefault(key, deque()).append(
+                _Response(message, received - sent, following)
+            )
+
+    async def send(self, message: str) -> None:
+        if self._closed:
+            raise ConnectionError("Replay transport is closed")
+        batch = json.loads(str(message))
+        answers = [
+            (request, self._match(request))
+            for request in (batch if isinstance(batch, list) else [batch])
+            # Notifications such as cancellations need no answer
+            if "id" in request and "method" in request
+        ]
+        if isinstance(batch, list):
+            if answers:
+                latency = max(response.latency if response else 0.0 for _, response in answers)
+                self._later(latency, [self._answer(*answer) for answer in answers])
+        else:
+            for request, response in answers:
+                self._later(response.latency if response else 0.0, self._answer(request, response))
+        for _, response in answers:
+            if response is not None:
+                for offset, notification in response.notifications:
+                    self._later(response.latency + offset, notification)
+
+    async def close(self) -> None:
+        """Stops delivering frames and fails the calls still waiting for them."""
+        self._closed = True
+        for handle in self._handles:
+            handle.cancel()
+        self._handles.clear()
+        self.on_close(None)
+
+    def _match(self, request: dict) -> _Response | None:
+        responses = self._responses.get(_key(request["method"], request.get("params")))
+        if not responses:
+            self.unmatched[request["method"]] += 1
+            return None
+        return responses.popleft() if len(responses) > 1 else responses[0]
+
+    def _answer(self, request: dict, response: _Response | None) -> dict:
+        if response is None:
+            error = {"code": -32601, "message": f"no recorded response to {request['method']}"}
+            return {"jsonrpc": "2.0", "id": request["id"], "error": error}
+        return {**response.message, "id": request["id"]}
+
+    def _later(self, delay: float, message: t.Any) -> None:
+        frame = json.dumps(message)
+        loop = asyncio.get_running_loop()
+        if self.speed is None:
+            loop.call_soon(self._deliver, frame)
+            return
+        if len(self._handles) > 1024:
+            now = loop.time()
+            self._handles = [handle for handle in self._handles if handle.when() > now]
+        self._handles.append(loop.call_later(max(0.0, delay / self.speed), self._deliver, frame))
+
+    def _deliver(self, frame: str) -> None:
+        if not self._closed:
+            self.on_message(frame)
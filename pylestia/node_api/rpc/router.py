@@ -0,0 +1,252 @@
+"""
+Routing of RPC calls across several Celestia nodes.
+
+Reads go to the endpoint with the lowest recent latency and are hedged: if the first node has
+not answered by its p95 latency, the same request is sent to the next best node and the first
+answer wins. A read that fails on the way to a node is sent to the next best node, and the
+failed node is left out of routing for a while. Submissions, batches and subscriptions stick
+to the primary (first) endpoint.
+"""
+
+import asyncio
+import time
+import typing as t
+from collections import Counter, deque
+from collections.abc import AsyncGenerator, Sequence
+
+from .abc import RPCExecutor, logger
+from .executor import IDEMPOTENT_METHODS, _is_transport_error
+
+# Reads that wait for the node to reach a state; a hedge would only wait alongside them.
+LONG_POLL_METHODS = frozenset({"das.WaitCatchUp", "header.SyncWait", "header.WaitForHeight"})
+
+
+class EndpointStats:
+    """Recent latency observations of one endpoint.
+
+    Attributes:
+        ewma (float | None): Exponentially weighted moving average of the latency, in seconds.
+        samples (deque[float]): The most recent latency samples, in seconds.
+        errors (int): The number of transport failures observed.
+        down_until (float): The monotonic time until which the endpoint is left out of
+            routing after transport failures.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 256):
+        self.alpha = alpha
+        self.ewma = None  # type: float | None
+        self.samples = deque(maxlen=window)  # type: deque[float]
+        self.errors = 0
+        self.down_until = 0.0
+        self._failures = 0
+
+    def observe(self, latency: float) -> None:
+        self.samples.append(latency)
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            self.ewma += self.alpha * (latency - self.ewma)
+
+    def failed(self, latency: float, cooldown: float, max_cooldown: float) -> None:
+        """Records a transport failure, leaving the endpoint out of routing for a cooldown
+        that doubles with each consecutive failure."""
+        self.errors += 1
+        # Penalize the endpoint so that it is ranked behind healthy ones once it is back
+        self.observe(max(latency, self.ewma or 0.0) * 2)
+        self.down_until = time.monotonic() + min(cooldown * 2**self._failures, max_cooldown)
+        self._failures += 1
+
+    def succeeded(self, latency: float) -> None:
+        self.observe(latency)
+        self._failures = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class MultiEndpointClient(RPCExecutor):
+    """Executor that spreads calls across several nodes.
+
+    Args:
+        clients: Executors for each endpoint; the first one is the primary.
+        hedge: Whether to hedge idempotent reads.
+        hedge_delay: The hedge delay used until an endpoint has ``min_samples`` observations.
+        min_samples: The number of observations needed before the p95 latency is trusted.
+        cooldown: Seconds an endpoint is left out of routing after a transport failure;
+            doubled for each consecutive failure.
+        max_cooldown: The upper bound of the cooldown, in seconds.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[RPCExecutor],
+        hedge: bool = True,
+        hedge_delay: float = 0.1,
+        min_samples: int = 20,
+        cooldown: float = 1.0,
+        max_cooldown: float = 30.0,
+    ):
+        if not clients:
+            raise ValueError("At least one endpoint is required")
+        self.clients = list(clients)
+        self.primary = self.clients[0]
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.stats = {id(client): EndpointStats() for client in self.clients}
+        self._available = list(self.clients)
+
+    async def connect(self, auth_token: str | None = None) -> None:
+        """Connects to every endpoint. Endpoints other than the primary may fail to connect;
+        they are then left out of routing until the next :meth:`connect`."""
+        results = await asyncio.gather(
+            *(client.connect(auth_token) for client in self.clients), return_exceptions=True
+        )
+        if isinstance(results[0], BaseException):
+            await asyncio.gather(
+                *(
+                    client.disconnect()
+                    for client, result in zip(self.clients, results)
+                    if not isinstance(result, BaseException)
+                ),
+                return_exceptions=True,
+            )
+            raise results[0]
+        self._available = []
+        for client, result in zip(self.clients, results):
+            if isinstance(result, BaseException):
+                url = getattr(client, "base_url", client)
+                logger.warning("Cannot connect to %s: %s", url, result)
+            else:
+                self._available.append(client)
+
+    async def disconnect(self) -> None:
+        """Disconnects from every endpoint."""
+        await asyncio.gather(
+            *(client.disconnect() for client in self._available), return_exceptions=True
+        )
+
+    def latencies(self) -> dict[str, float | None]:
+        """Returns the moving average latency of each endpoint, in seconds."""
+        return {
+            getattr(client, "base_url", str(index)): self.stats[id(client)].ewma
+            for index, client in enumerate(self.clients)
+        }
+
+    def timeout_counts(self) -> Counter:
+        """Returns the number of timed out calls per method across the endpoints."""
+        counts = Counter()
+        for client in self.clients:
+            counts.update(client.timeout_counts())
+        return counts
+
+    def _ranked(self) -> list[RPCExecutor]:
+        now = time.monotonic()
+        up = [client for client in self._available if self.stats[id(client)].down_until <= now]
+        # Endpoints without observations are tried first so that every node gets measured
+        return sorted(
+            up or self._available,
+            key=lambda client: (
+                self.stats[id(client)].ewma is not None,
+                self.stats[id(client)].ewma or 0.0,
+            ),
+        )
+
+    def _hedge_delay(self, client: RPCExecutor) -> float:
+        stats = self.stats[id(client)]
+        if len(stats.samples) < self.min_samples:
+            return self.hedge_delay
+        return stats.percentile(0.95)
+
+    async def _timed_call(
+        self, client: RPCExecutor, method: str, params: tuple, timeout: float | None
+    ) -> t.Any:
+        stats = self.stats[id(client)]
+        start = time.perf_counter()
+        try:
+            result = await client.call(method, params, timeout=timeout)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            if _is_transport_error(exc):
+                url = getattr(client, "base_url", client)
+                logger.warning("Call of %s to %s failed: %s", method, url, exc)
+                stats.failed(time.perf_counter() - start, self.cooldown, self.max_cooldown)
+            else:
+                stats.succeeded(time.perf_counter() - start)
+            raise
+        stats.succeeded(time.perf_counter() - start)
+        return result
+
+    async def call(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+        *,
+        timeout: float | None = None,
+    ) -> t.Any | None:
+        deserializer = deserializer or (lambda a: a)
+        if method not in IDEMPOTENT_METHODS:
+            return await self.primary.call(method, params, deserializer, timeout=timeout)
+
+        ranked = self._ranked()
+        hedge = self.hedge and method not in LONG_POLL_METHODS
+        candidates = iter(ranked)
+        tasks = []  # type: list[asyncio.Task]
+        pending = set()  # type: set[asyncio.Task]
+        errors = []  # type: list[BaseException]
+
+        def start_next() -> None:
+            client = next(candidates, None)
+            if client is not None:
+                task = asyncio.create_task(self._timed_call(client, method, params, timeout))
+                tasks.append(task)
+                pending.add(task)
+
+        start_next()
+        try:
+            async with asyncio.timeout(timeout):
+                while pending:
+                    delay = None
+                    if hedge and len(tasks) == 1 and len(ranked) > 1:
+                        delay = self._hedge_delay(ranked[0])
+                    done, _ = await asyncio.wait(
+                        pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    pending.difference_update(done)
+                    failed = not done
+                    for task in done:
+                        exc = task.exception()
+                        if exc is None or not _is_transport_error(exc):
+                            return deserializer(task.result())
+                        errors.append(exc)
+                        failed = True
+                    if failed:
+                        # Hedge after the delay, or fail over after a transport failure
+                        start_next()
+            # Every endpoint failed on the way to the node; report the best one's error
+            raise errors[0]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def batch(self, max_size: int = 100):
+        """Returns a batch executor bound to the primary endpoint, since a batch may carry
+        writes."""
+        return self.primary.batch(max_size)
+
+    async def subscribe(
+        self,
+        method: str,
+        params: tuple[t.Any, ...] = None,
+        deserializer: t.Callable[[t.Any], t.Any] = None,
+    ) -> AsyncGenerator[t.Any, None]:
+        async for item in self.primary.subscribe(method, params, deserializer):
+            yield item
@@ -0,0 +1,85 @@
+"""
+Coalescing of identical RPC calls in flight.
+
+When many coroutines ask for the same data at once, e.g. ``header.GetByHeight`` or
+``blob.GetAll`` for a freshly produced block, only the first call is sent to the node;
+the others join it and share its raw result.
+"""
+
+import asyncio
+import typing as t
+from collections import Counter
+
+
+class Flight:
+    """A call in flight and the callers waiting for it.
+
+    The call is cancelled when the last caller stops waiting. Callers share the raw result
+    only; each deserializes it on its own, so that no two callers receive the same objects.
+    """
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        # Set once the call is being cancelled, so that no new caller joins it
+        self.abandoned = False
+
+    async def wait(self, timeout: float | None = None) -> t.Any:
+        """Waits for the raw result of the call.
+
+        Args:
+            timeout: How long this caller waits, in seconds; the call itself keeps its deadline.
+        """
+        self.waiters += 1
+        try:
+            if timeout is None:
+                return await asyncio.shield(self.task)
+            return await asyncio.wait_for(asyncio.shield(self.task), timeout)
+        finally:
+            self.waiters -= 1
+            if not self.waiters and not self.task.done():
+                self.abandoned = True
+                self.task.cancel()
+
+
+class SingleFlight:
+    """Table of the calls in flight, keyed by method and encoded params.
+
+    Attributes:
+        hits (Counter[str]): The number of calls per method that joined a call in flight.
+    """
+
+    def __init__(self):
+        self._flights = dict()  # type: dict[tuple[str, str], Flight]
+        self.hits = Counter()  # type: Counter[str]
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def join(
+        self, method: str, key: str, call: t.Callable[[], t.Awaitable[t.Any]]
+    ) -> tuple[Flight, bool]:
+        """Returns the flight of an identical call, starting ``call`` if there is none.
+
+        Args:
+            method: The method name.
+            key: The canonical encoding of the params.
+            call: Starts the call; it must return the raw result.
+
+        Returns:
+            tuple[Flight, bool]: The flight, and whether it was already in flight.
+        """
+        flight_key = (method, key)
+        flight = self._flights.get(flight_key)
+        if flight is not None and not flight.abandoned:
+            self.hits[method] += 1
+            return flight, True
+
+        flight = self._flights[flight_key] = Flight(asyncio.ensure_future(call()))
+
+        def land(_):
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+        flight.task.add_done_callback(land)
+        return flight, False
@@ -0,0 +1,281 @@
+"""
+Persistent store of RPC responses.
+
+Results of calls whose data never changes, such as headers, blobs and shares at a given
+height, are written to a local directory and served from it after a restart. An sqlite
+database indexes the entries; small payloads are kept inline, larger ones in files named by
+the SHA-256 of their content, so identical payloads are stored once. A store records the chain
+ID of its data, since heights of different chains hold different data.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+import typing as t
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .abc import logger
+from .cache import CACHE_TTLS
+
+# Methods stored by default: those whose responses never change.
+STORED_METHODS = frozenset(method for method, ttl in CACHE_TTLS.items() if ttl is None)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    method TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB,
+    digest TEXT,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (method, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class DiskStore:
+    """Size-capped on-disk store of encoded RPC results.
+
+    Disk access runs on a dedicated worker thread, so it never blocks the event loop. When
+    the stored payloads exceed ``max_bytes``, the least recently read entries are removed.
+    Failures to read or write the store are logged and treated as misses.
+
+    The store is bound to the chain ID it is first opened with, given here or by
+    :meth:`bind`; opening it for another chain raises a ``ValueError``.
+
+    Args:
+        path: The directory of the store; created if missing.
+        max_bytes: The size cap of the stored payloads.
+        methods: The methods to store; defaults to :data:`STORED_METHODS`.
+        inline_size: Payloads up to this size are kept in the database instead of files.
+        chain_id: The chain ID of the data, checked against the store when it is opened.
+
+    Attributes:
+        hits (Counter[str]): The number of reads per method served from the store.
+        misses (Counter[str]): The number of reads per method the store could not serve.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = 1024**3,
+        methods: t.Collection[str] = STORED_METHODS,
+        inline_size: int = 16 * 1024,
+        chain_id: str | None = None,
+    ):
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.methods = frozenset(methods)
+        self.inline_size = inline_size
+        self.chain_id = chain_id
+        self.hits = Counter()  # type: Counter[str]
+        self.misses = Counter()  # type: Counter[str]
+        self._executor = None  # type: ThreadPoolExecutor | None
+        self._db = None  # type: sqlite3.Connection | None
+        self._size = None  # type: int | None
+
+    def stores(self, method: str) -> bool:
+        """Whether responses of the method are stored."""
+        return method in self.methods
+
+    async def get(self, method: str, key: str) -> bytes | None:
+        """Returns the stored payload of a call, or None.
+
+        Args:
+            method: The method name.
+            key: The canonical encoding of the params.
+        """
+        data = await self._run(self._get, method, key)
+        if data is None:
+            self.misses[method] += 1
+        else:
+            self.hits[method] += 1
+        return data
+
+    async def put(self, method: str, key: str, data: str | bytes) -> None:
+        """Stores the payload of a call, evicting old entries to stay within the size cap.
+
+        Args:
+            method: The method name.
+            key: The canonical encoding of the params.
+            data: The encoded result.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        await self._run(self._put, method, key, data)
+
+    async def size(self) -> int:
+        """Returns the total size of the stored payloads in bytes."""
+        return await self._run(self._total_size) or 0
+
+    async def bind(self, chain_id: str) -> None:
+        """Binds the store to a chain, recording its ID if the store has none yet.
+
+        Args:
+            chain_id: The chain ID of the node the results come from.
+
+        Raises:
+            ValueError: If the store holds data of another chain.
+        """
+        await self._run(self._bind, chain_id)
+
+    async def close(self) -> None:
+        """Closes the database and stops the worker thread; the store reopens when used."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, self._close)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Disk store %s failed: %s", self.path, exc)
+        finally:
+            executor.shutdown(wait=False)
+
+    async def _run(self, func: t.Callable, *args) -> t.Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pylestia-store")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Disk store %s failed: %s", self.path, exc)
+            return None
+
+    # The methods below run on the worker thread.
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            (self.path / "objects").mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path / "index.sqlite3", check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            if self.chain_id is not None:
+                try:
+                    self._check_chain(db, self.chain_id)
+                except BaseException:
+                    db.close()
+                    raise
+            self._db = db
+        return self._db
+
+    def _bind(self, chain_id: str) -> None:
+        self._check_chain(self._connect(), chain_id)
+        self.chain_id = chain_id
+
+    def _check_chain(self, db: sqlite3.Connection, chain_id: str) -> None:
+        row = db.execute("SELECT value FROM meta WHERE name = 'chain_id'").fetchone()
+        if row is None:
+            db.execute("INSERT INTO meta (name, value) VALUES ('chain_id', ?)", (chain_id,))
+            db.commit()
+        elif row[0] != chain_id:
+            raise ValueError(f"Disk store {self.path} holds data of chain {row[0]}, not {chain_id}")
+
+    def _object(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    def _get(self, method: str, key: str) -> bytes | None:
+        db = self._connect()
+        row = db.execute(
+            "SELECT data, digest FROM entries WHERE method = ? AND key = ?", (method, key)
+        ).fetchone()
+        if row is None:
+            return None
+        data, digest = row
+        if data is None:
+            try:
+                data = self._object(digest).read_bytes()
+            except FileNotFoundError:
+                # Removed behind our back; forget the entry
+                self._delete(db, method, key)
+                db.commit()
+                return None
+        db.execute(
+            "UPDATE entries SET accessed = ? WHERE method = ? AND key = ?",
+            (time.time(), method, key),
+        )
+        db.commit()
+        return data
+
+    def _put(self, method: str, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        db = self._connect()
+        self._total_size()
+        try:
+            self._delete(db, method, key)
+            digest = None
+            if len(data) > self.inline_size:
+                digest = hashlib.sha256(data).hexdigest()
+                self._write_object(digest, data)
+            db.execute(
+                "INSERT INTO entries (method, key, size, data, digest, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (method, key, len(data), None if digest else data, digest, time.time()),
+            )
+            self._size += len(data)
+            self._evict(db)
+            db.commit()
+        except BaseException:
+            db.rollback()
+            self._size = None
+            raise
+
+    def _write_object(self, digest: str, data: bytes) -> None:
+        path = self._object(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file first, so that a crash never leaves a partial object
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            db = self._connect()
+            self._size = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return self._size
+
+    def _delete(self, db: sqlite3.Connection, method: str, key: str) -> None:
+        row = db.execute(
+            "SELECT size, digest FROM entries WHERE method = ? AND key = ?", (method, key)
+        ).fetchone()
+        if row is None:
+            return
+        size, digest = row
+        db.execute("DELETE FROM entries WHERE method = ? AND key = ?", (method, key))
+        if self._size is not None:
+            self._size -= size
+        if digest is not None:
+            (shared,) = db.execute(
+                "SELECT COUNT(*) FROM entries WHERE digest = ?", (digest,)
+            ).fetchone()
+            if not shared:
+                self._object(digest).unlink(missing_ok=True)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        while self._size > self.max_bytes:
+            rows = db.execute(
+                "SELECT method, key FROM entries ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for method, key in rows:
+                self._delete(db, method, key)
+                if self._size <= self.max_bytes:
+                    break
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -11,6 +11,13 @@ from pylestia.types.share import (
 from pylestia.node_api.rpc.abc import Wrapper
 
 
+def _deserialize_namespace_data(result):
+    if result is not None:
+        return [NamespaceData(**data) for data in result]
+    else:
+        return []
+
+
 class ShareClient(Wrapper):
     """Client for interacting with Celestia's Share API."""
 
@@ -50,13 +57,7 @@ class ShareClient(Wrapper):
             list[NamespaceData]: A list of NamespaceData objects or [] if not found.
         """
 
-        def deserializer_(result):
-            if result is not None:
-                return [NamespaceData(**data) for data in result]
-            else:
-                return []
-
-        deserializer = deserializer if deserializer is not None else deserializer_
+        deserializer = deserializer if deserializer is not None else _deserialize_namespace_data
 
         return await self._rpc.call(
             "share.GetNamespaceData", (height, Namespace(namespace)), deserializer
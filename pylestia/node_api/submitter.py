@@ -0,0 +1,196 @@
+"""
+Batching queue of blob submissions.
+
+Each :meth:`BlobAPI.submit <pylestia.node_api.blob.BlobAPI.submit>` is one PayForBlob
+transaction that returns once it is included in a block. Producers of many small writes
+instead hand their blobs to a :class:`BlobSubmitter`, which collects them for a short time
+and submits them together, with several transactions in flight.
+"""
+
+import asyncio
+import typing as t
+from collections import Counter
+
+from pylestia.node_api.rpc.abc import logger
+from pylestia.types import Blob
+from pylestia.types.blob import SubmitBlobResult
+from pylestia.types.errors import is_transient_error
+from pylestia.types.packing import DEFAULT_MAX_TX_SIZE
+
+if t.TYPE_CHECKING:
+    from pylestia.node_api.blob import BlobAPI
+
+
+class _Entry:
+    def __init__(self, blob: Blob, future: asyncio.Future):
+        self.blob = blob
+        self.future = future
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether the node answered with an error after which the submission may succeed."""
+    message = exc.args[0] if exc.args and isinstance(exc.args[0], str) else str(exc)
+    return isinstance(exc, (ConnectionError, ValueError)) and is_transient_error(message)
+
+
+class BlobSubmitter:
+    """Collects blobs and submits them as multi-blob transactions.
+
+    A batch is submitted once it holds ``max_blobs`` blobs, once another blob would take it
+    over ``max_bytes`` of data, or ``max_delay`` seconds after its first blob arrived. Up to
+    ``max_in_flight`` batches are submitted at the same time; further batches wait for one
+    of them to finish.
+
+    A batch that fails with a transient error (see
+    :func:`~pylestia.types.errors.is_transient_error`) is submitted again after an
+    exponential backoff, up to ``retries`` times. A batch rejected for an invalid blob is
+    split in halves, which are submitted separately, so that only the futures of invalid
+    blobs fail. Transport failures are not retried, since the transaction may have been
+    included; their futures fail with the error.
+
+    Use it as an async context manager, which submits the blobs still collected on exit::
+
+        async with BlobSubmitter(api.blob) as submitter:
+            results = await asyncio.gather(*(submitter.submit(blob) for blob in blobs))
+
+    Args:
+        blob_api: The blob API to submit through.
+        max_delay: The seconds a blob waits for others to join its batch.
+        max_blobs: The maximum number of blobs of a transaction.
+        max_bytes: The maximum total data size of the blobs of a transaction.
+        max_in_flight: The maximum number of transactions submitted at the same time.
+        retries: The number of times a batch is submitted again after a transient error.
+        backoff: The seconds before the first retry; doubled for each further one.
+        options: Additional configuration options of each transaction.
+
+    Attributes:
+        stats (Counter[str]): Numbers of ``"blobs"`` and ``"transactions"`` submitted,
+            ``"retries"`` and ``"splits"`` of failed batches, and ``"failed"`` blobs.
+    """
+
+    def __init__(
+        self,
+        blob_api: "BlobAPI",
+        *,
+        max_delay: float = 0.5,
+        max_blobs: int = 100,
+        max_bytes: int = DEFAULT_MAX_TX_SIZE,
+        max_in_flight: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+        **options,
+    ):
+        self.blob_api = blob_api
+        self.max_delay = max_delay
+        self.max_blobs = max_blobs
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.options = options
+        self.stats = Counter()  # type: Counter[str]
+        self._batch = []  # type: list[_Entry]
+        self._batch_bytes = 0
+        self._timer = None  # type: asyncio.TimerHandle | None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tasks = set()  # type: set[asyncio.Task]
+        self._closed = False
+
+    def put(self, blob: Blob) -> asyncio.Future:
+        """Queues a blob for submission.
+
+        Returns:
+            asyncio.Future: Resolves to the :class:`SubmitBlobResult` of the blob, with the
+            height of its transaction and its commitment.
+        """
+        if self._closed:
+            raise RuntimeError("The submitter is closed")
+        future = asyncio.get_running_loop().create_future()
+        size = blob.data_size
+        if self._batch and self._batch_bytes + size > self.max_bytes:
+            self._dispatch()
+        self._batch.append(_Entry(blob, future))
+        self._batch_bytes += size
+        if len(self._batch) >= self.max_blobs or self._batch_bytes >= self.max_bytes:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._dispatch)
+        return future
+
+    async def submit(self, blob: Blob) -> SubmitBlobResult:
+        """Queues a blob and waits until it is included.
+
+        Returns:
+            SubmitBlobResult: The height of the transaction of the blob, and its commitment.
+        """
+        return await self.put(blob)
+
+    async def flush(self) -> None:
+        """Submits the blobs collected so far and waits for all submissions to finish."""
+        self._dispatch()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flushes the submitter and refuses further blobs."""
+        self._closed = True
+        await self.flush()
+
+    async def __aenter__(self) -> "BlobSubmitter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _dispatch(self) -> None:
+        """Starts the submission of the collected batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._submit(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _submit(self, batch: list[_Entry]) -> None:
+        # Blobs whose callers stopped waiting are left out
+        batch = [entry for entry in batch if not entry.future.done()]
+        if not batch:
+            return
+        attempt = 0
+        while True:
+            try:
+                async with self._slots:
+                    result = await self.blob_api.submit(
+                        *(entry.blob for entry in batch), **self.options
+                    )
+            except Exception as exc:
+                if _is_transient(exc) and attempt < self.retries:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * 2**attempt)
+                    attempt += 1
+                    continue
+                if isinstance(exc, ValueError) and len(batch) > 1:
+                    # Isolate the invalid blobs
+                    self.stats["splits"] += 1
+                    middle = len(batch) // 2
+                    await asyncio.gather(self._submit(batch[:middle]), self._submit(batch[middle:]))
+                    return
+                logger.warning("Submission of %d blobs failed: %s", len(batch), exc)
+                self.stats["failed"] += len(batch)
+                for entry in batch:
+                    if not entry.future.done():
+                        entry.future.set_exception(exc)
+                return
+            except BaseException:
+                for entry in batch:
+                    if not entry.future.done():
+                        entry.future.cancel()
+                raise
+            break
+
+        self.stats["transactions"] += 1
+        self.stats["blobs"] += len(batch)
+        for entry in batch:
+            if not entry.future.done():
+                entry.future.set_result(SubmitBlobResult(result.height, (entry.blob.commitment,)))
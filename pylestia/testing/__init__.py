@@ -0,0 +1,10 @@
+"""
+Tools for testing and benchmarking code that talks to Celestia nodes.
+
+:class:`StandInNode` serves the node API over websockets with synthetic data, so clients
+can be exercised without a Celestia network.
+"""
+
+from .node import DEFAULT_NAMESPACE, RPCFault, StandInNode
+
+__all__ = ["StandInNode", "RPCFault", "DEFAULT_NAMESPACE"]
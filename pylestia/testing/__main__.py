@@ -0,0 +1,49 @@
+"""
+Runs a stand-in Celestia node until interrupted.
+
+Usage::
+
+    python -m pylestia.testing --port 26658 --block-time 1 --blob-size 65536
+"""
+
+import argparse
+import asyncio
+
+from .node import StandInNode
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    async with StandInNode(
+        args.host,
+        args.port,
+        block_time=args.block_time,
+        blobs_per_block=args.blobs_per_block,
+        blob_size=args.blob_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as node:
+        print(f"Serving a stand-in node at {node.url}", flush=True)
+        await asyncio.Future()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=26658)
+    parser.add_argument("--block-time", type=float, default=1.0, help="seconds between blocks")
+    parser.add_argument("--blobs-per-block", type=int, default=1)
+    parser.add_argument("--blob-size", type=int, default=1024, help="bytes per blob")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
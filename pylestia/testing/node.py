@@ -0,0 +1,998 @@
+"""
+Stand-in Celestia node for load tests and offline benchmarks.
+
+:class:`StandInNode` is an asyncio websocket JSON-RPC server answering the methods called by
+the pylestia clients with synthetic but structurally valid payloads. It produces blocks on a
+clock, each holding blobs of a configurable size, includes submitted blobs in the next block,
+pushes headers and blobs to subscribers, and can delay or fail calls on purpose.
+
+Nothing is verified: hashes, roots, proofs and signatures are deterministic filler of the
+right shape and size, and the data square is laid out in a simplified share format.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+import typing as t
+from collections import Counter
+from datetime import datetime, timezone
+
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+NAMESPACE_SIZE = 29
+SHARE_SIZE = 512
+# Namespace of the transaction shares that precede the blobs of a block.
+TX_NAMESPACE = bytes(NAMESPACE_SIZE - 1) + b"\x01"
+# Namespace of the shares that pad the original data square.
+TAIL_PADDING_NAMESPACE = b"\x00" + b"\xff" * (NAMESPACE_SIZE - 2) + b"\xfe"
+# Namespace of the parity shares of the extended data square.
+PARITY_NAMESPACE = b"\xff" * NAMESPACE_SIZE
+# Namespace of the synthetic blobs if none are given.
+DEFAULT_NAMESPACE = bytes(NAMESPACE_SIZE - 10) + b"stand-in\x00\x00"
+
+# Notification method go-jsonrpc uses for values of subscription channels.
+NOTIFICATION_METHOD = "xrpc.ch.val"
+CANCEL_METHOD = "xrpc.cancel"
+CHANNEL_CLOSE_METHOD = "xrpc.ch.close"
+
+
+class RPCFault(Exception):
+    """Answers the call being handled with a JSON-RPC error.
+
+    Args:
+        message: The error message.
+        code: The error code.
+    """
+
+    def __init__(self, message: str, code: int = 1):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _digest(*parts: t.Any) -> bytes:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+    return h.digest()
+
+
+def _nmt_node(namespace: bytes, *parts: t.Any) -> str:
+    # Nodes of namespaced Merkle trees are the min and max namespace followed by the hash
+    return _b64(namespace + namespace + _digest(*parts))
+
+
+def _block_id(block_hash: str) -> dict:
+    parts = {"total": 1, "hash": _digest(block_hash, "parts").hex().upper()}
+    return {"hash": block_hash, "parts": parts}
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _namespace(value: str | bytes) -> bytes:
+    if isinstance(value, str):
+        value = base64.b64decode(value)
+    # Version 0 namespaces may be given by their ID only
+    return bytes(NAMESPACE_SIZE - len(value)) + value if len(value) < NAMESPACE_SIZE else value
+
+
+# Data bytes in the first share of a blob, after the info byte and sequence length, and in
+# each further share, after the info byte.
+_FIRST_SHARE_CAPACITY = SHARE_SIZE - NAMESPACE_SIZE - 5
+_SHARE_CAPACITY = SHARE_SIZE - NAMESPACE_SIZE - 1
+
+
+def _share_count(size: int) -> int:
+    return 1 + max(0, -(-(size - _FIRST_SHARE_CAPACITY) // _SHARE_CAPACITY))
+
+
+def _split(namespace: bytes, data: bytes, share_version: int) -> list[bytes]:
+    """Splits blob data into shares of namespace, info byte, sequence length and data."""
+    shares = [
+        namespace
+        + bytes([share_version << 1 | 1])
+        + len(data).to_bytes(4, "big")
+        + data[:_FIRST_SHARE_CAPACITY].ljust(_FIRST_SHARE_CAPACITY, b"\x00")
+    ]
+    for offset in range(_FIRST_SHARE_CAPACITY, len(data), _SHARE_CAPACITY):
+        chunk = data[offset : offset + _SHARE_CAPACITY].ljust(_SHARE_CAPACITY, b"\x00")
+        shares.append(namespace + bytes([share_version << 1]) + chunk)
+    return shares
+
+
+class _Block:
+    """A produced block: its header, blobs and lazily built data square."""
+
+    def __init__(
+        self, height: int, timestamp: float, last_hash: str, blobs: list[dict], node: "StandInNode"
+    ):
+        self.height = height
+        self.time = _timestamp(timestamp)
+        self.last_hash = last_hash
+        self.hash = _digest(last_hash, height).hex().upper()
+        self.blobs = sorted(blobs, key=lambda blob: blob["namespace"])
+        self._node = node
+        self._header = None  # type: dict | None
+        self._shares = None  # type: list[bytes] | None
+        self._eds = None  # type: list[str] | None
+
+        # A transaction share comes first, then the blobs ordered by namespace
+        index = 1 if self.blobs else 0
+        for blob in self.blobs:
+            blob["index"] = index
+            index += _share_count(len(base64.b64decode(blob["data"])))
+        self.width = 1
+        while self.width * self.width < index:
+            self.width *= 2
+
+    def shares(self) -> list[bytes]:
+        """The shares of the original data square, row by row."""
+        if self._shares is None:
+            shares = []
+            if self.blobs:
+                transaction = _digest(self.hash, "tx").ljust(_SHARE_CAPACITY, b"\x00")
+                shares.append(TX_NAMESPACE + b"\x01" + transaction)
+            for blob in self.blobs:
+                shares.extend(
+                    _split(
+                        _namespace(blob["namespace"]),
+                        base64.b64decode(blob["data"]),
+                        blob["share_version"],
+                    )
+                )
+            padding = TAIL_PADDING_NAMESPACE + bytes(SHARE_SIZE - NAMESPACE_SIZE)
+            shares.extend([padding] * (self.width * self.width - len(shares)))
+            self._shares = shares
+        return self._shares
+
+    def eds(self) -> list[str]:
+        """The encoded shares of the extended data square, row by row."""
+        if self._eds is None:
+            shares, width = self.shares(), self.width
+            eds = []
+            for row in range(2 * width):
+                for col in range(2 * width):
+                    share = shares[(row % width) * width + col % width]
+                    if row >= width or col >= width:
+                        share = PARITY_NAMESPACE + share[NAMESPACE_SIZE:]
+                    eds.append(_b64(share))
+            self._eds = eds
+        return self._eds
+
+    def header(self) -> dict:
+        """The extended header of the block."""
+        if self._header is None:
+            node, digest = self._node, self.hash
+            validators = [
+                {
+                    "address": _digest(node.chain_id, "validator", i)[:20].hex().upper(),
+                    "pub_key": {
+                        "type": "tendermint/PubKeyEd25519",
+                        "value": _b64(_digest(node.chain_id, "key", i)),
+                    },
+                    "voting_power": "1000",
+                    "proposer_priority": "0",
+                }
+                for i in range(node.validators)
+            ]
+            proposer = validators[self.height % len(validators)]
+            self._header = {
+                "header": {
+                    "version": {"block": "11", "app": "3"},
+                    "chain_id": node.chain_id,
+                    "height": str(self.height),
+                    "time": self.time,
+                    "last_block_id": _block_id(self.last_hash),
+                    **{
+                        name: _digest(digest, name).hex().upper()
+                        for name in (
+                            "last_commit_hash",
+                            "data_hash",
+                            "validators_hash",
+                            "next_validators_hash",
+                            "consensus_hash",
+                            "app_hash",
+                            "last_results_hash",
+                            "evidence_hash",
+                        )
+                    },
+                    "proposer_address": proposer["address"],
+                },
+                "validator_set": {"validators": validators, "proposer": proposer},
+                "commit": {
+                    "height": str(self.height),
+                    "round": 0,
+                    "block_id": _block_id(digest),
+                    "signatures": [
+                        {
+                            "block_id_flag": 2,
+                            "validator_address": validator["address"],
+                            "timestamp": self.time,
+                            "signature": _b64(_digest(digest, i) + _digest(i, digest)),
+                        }
+                        for i, validator in enumerate(validators)
+                    ],
+                },
+                "dah": {
+                    "row_roots": [
+                        _nmt_node(bytes(NAMESPACE_SIZE), digest, "row", i)
+                        for i in range(2 * self.width)
+                    ],
+                    "column_roots": [
+                        _nmt_node(bytes(NAMESPACE_SIZE), digest, "col", i)
+                        for i in range(2 * self.width)
+                    ],
+                },
+            }
+        return self._header
+
+    def proof(self, start: int, end: int, namespace: bytes) -> dict:
+        """A namespace proof of the shares ``[start, end)`` of a row."""
+        nodes = [
+            _nmt_node(namespace, self.hash, start, end, level)
+            for level in range((2 * self.width).bit_length())
+        ]
+        return {"start": start, "end": end, "nodes": nodes, "is_max_namespace_ignored": True}
+
+    def share_proofs(self, start: int, end: int, namespace: bytes) -> list[dict]:
+        """Namespace proofs of the shares ``[start, end)`` of the original square, per row."""
+        width = self.width
+        return [
+            self.proof(
+                max(start, row * width) - row * width,
+                min(end, (row + 1) * width) - row * width,
+                namespace,
+            )
+            for row in range(start // width, (end - 1) // width + 1)
+        ]
+
+    def row_proof(self, start_row: int, end_row: int) -> dict:
+        """A proof of the row roots ``[start_row, end_row]`` against the data root."""
+        roots = self.header()["dah"]["row_roots"]
+        proofs = [
+            {
+                "leaf_hash": _b64(_digest(roots[row])),
+                "aunts": [
+                    _b64(_digest(self.hash, row, level))
+                    for level in range((4 * self.width).bit_length() - 1)
+                ],
+                "total": 4 * self.width,
+                "index": row,
+            }
+            for row in range(start_row, end_row + 1)
+        ]
+        return {
+            "row_roots": roots[start_row : end_row + 1],
+            "proofs": proofs,
+            "start_row": start_row,
+            "end_row": end_row,
+        }
+
+    def find(self, namespace: bytes, commitment: str | None = None) -> list[dict]:
+        """The blobs of a namespace, or the one with the given commitment."""
+        namespace = _b64(namespace)
+        return [
+            blob
+            for blob in self.blobs
+            if blob["namespace"] == namespace
+            and (commitment is None or blob["commitment"] == commitment)
+        ]
+
+
+class _Connection:
+    """A client connection: its calls in progress and subscriptions."""
+
+    def __init__(self, websocket: ServerConnection):
+        self.websocket = websocket
+        self.calls = dict()  # type: dict[t.Any, asyncio.Task]
+        self.subscriptions = dict()  # type: dict[int, tuple[str, tuple]]
+
+
+class StandInNode:
+    """Websocket JSON-RPC server standing in for a Celestia node.
+
+    Blocks are produced every ``block_time`` seconds, or by :meth:`produce_block`. Each block
+    holds ``blobs_per_block`` blobs of random data in each of ``namespaces``, plus the blobs
+    submitted since the previous block; ``blob.Submit`` and transactions return once the next
+    block is produced, like on a real node. The data square is derived from the blobs, so
+    ``share.*`` results agree with each other and with ``blob.*``.
+
+    Use it as an async context manager::
+
+        async with StandInNode(block_time=0.5, blob_size=64 * 1024) as node:
+            async with Client(node.url).connect() as api:
+                head = await api.header.network_head()
+
+    Args:
+        host: The interface to listen on.
+        port: The port to listen on; 0 picks a free port, see :attr:`url`.
+        chain_id: The chain ID in the headers.
+        block_time: Seconds between blocks, or None to produce blocks on demand only.
+        namespaces: The namespaces of the synthetic blobs.
+        blobs_per_block: The number of synthetic blobs per namespace in each block.
+        blob_size: The size of the synthetic blobs in bytes.
+        validators: The number of validators in the headers.
+        latency: Seconds to delay each response by, or a mapping of method names to delays;
+            the ``"*"`` key applies to methods not listed.
+        jitter: Up to this many seconds are added at random to each delay.
+        error_rate: The fraction of calls, drawn at random, answered with an error.
+        seed: Seeds the synthetic data and the injected jitter and errors.
+
+    Attributes:
+        height (int): The height of the newest block.
+        calls (Counter[str]): The number of calls received per method.
+        bytes_in (int): The number of bytes received from clients.
+        bytes_out (int): The number of bytes sent to clients.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        chain_id: str = "stand-in",
+        block_time: float | None = 1.0,
+        namespaces: t.Sequence[bytes] = (DEFAULT_NAMESPACE,),
+        blobs_per_block: int = 1,
+        blob_size: int = 1024,
+        validators: int = 4,
+        latency: float | t.Mapping[str, float] = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.chain_id = chain_id
+        self.block_time = block_time
+        self.namespaces = tuple(_namespace(namespace) for namespace in namespaces)
+        self.blobs_per_block = blobs_per_block
+        self.blob_size = blob_size
+        self.validators = validators
+        self.latency = latency if isinstance(latency, t.Mapping) else {"*": latency}
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.height = 0
+        self.calls = Counter()  # type: Counter[str]
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.balance = 10**12
+        self.peers = [f"12D3KooWStandIn{i}" for i in range(3)]
+        self._random = random.Random(seed)
+        self._blocks = dict()  # type: dict[int, _Block]
+        self._hashes = dict()  # type: dict[str, int]
+        self._mempool = []  # type: list[dict]
+        self._next_block = None  # type: asyncio.Future | None
+        self._failures = dict()  # type: dict[str, list[str]]
+        self._fraud_proofs = dict()  # type: dict[str, list[dict]]
+        self._delegations = Counter()  # type: Counter[str]
+        self._blocked = set()  # type: set[str]
+        self._protected = set()  # type: set[tuple[str, str]]
+        self._connections = set()  # type: set[_Connection]
+        self._subscription_ids = 0
+        self._server = None  # type: websockets.asyncio.server.Server | None
+        self._clock = None  # type: asyncio.Task | None
+        self._handlers = {
+            "blob.Get": self._blob_get,
+            "blob.GetAll": self._blob_get_all,
+            "blob.GetProof": self._blob_get_proof,
+            "blob.Included": self._blob_included,
+            "blob.Submit": self._blob_submit,
+            "das.SamplingStats": self._das_sampling_stats,
+            "das.WaitCatchUp": self._nothing,
+            "fraud.Get": self._fraud_get,
+            "header.GetByHash": self._header_get_by_hash,
+            "header.GetByHeight": self._header_get_by_height,
+            "header.GetRangeByHeight": self._header_get_range_by_height,
+            "header.LocalHead": self._header_head,
+            "header.NetworkHead": self._header_head,
+            "header.SyncState": self._header_sync_state,
+            "header.SyncWait": self._nothing,
+            "header.WaitForHeight": self._header_wait_for_height,
+            "p2p.BandwidthForPeer": self._p2p_bandwidth_for_peer,
+            "p2p.BandwidthForProtocol": self._p2p_bandwidth_for_peer,
+            "p2p.BandwidthStats": self._p2p_bandwidth_stats,
+            "p2p.BlockPeer": self._p2p_block_peer,
+            "p2p.ClosePeer": self._nothing,
+            "p2p.Connect": self._nothing,
+            "p2p.Connectedness": self._p2p_connectedness,
+            "p2p.Info": self._p2p_info,
+            "p2p.IsProtected": self._p2p_is_protected,
+            "p2p.ListBlockedPeers": self._p2p_list_blocked_peers,
+            "p2p.NATStatus": self._p2p_nat_status,
+            "p2p.PeerInfo": self._p2p_peer_info,
+            "p2p.Peers": self._p2p_peers,
+            "p2p.Protect": self._p2p_protect,
+            "p2p.PubSubPeers": self._p2p_pub_sub_peers,
+            "p2p.PubSubTopics": self._p2p_pub_sub_topics,
+            "p2p.ResourceState": self._p2p_resource_state,
+            "p2p.UnblockPeer": self._p2p_unblock_peer,
+            "p2p.Unprotect": self._p2p_unprotect,
+            "share.GetEDS": self._share_get_eds,
+            "share.GetNamespaceData": self._share_get_namespace_data,
+            "share.GetRange": self._share_get_range,
+            "share.GetSamples": self._share_get_samples,
+            "share.GetShare": self._share_get_share,
+            "share.SharesAvailable": self._share_shares_available,
+            "state.AccountAddress": self._state_account_address,
+            "state.Balance": self._state_balance,
+            "state.BalanceForAddress": self._state_balance_for_address,
+            "state.BeginRedelegate": self._state_transaction,
+            "state.CancelUnbondingDelegation": self._state_transaction,
+            "state.Delegate": self._state_delegate,
+            "state.GrantFee": self._state_transaction,
+            "state.QueryDelegation": self._state_query_delegation,
+            "state.QueryRedelegations": self._state_query_redelegations,
+            "state.QueryUnbonding": self._state_query_unbonding,
+            "state.RevokeGrantFee": self._state_transaction,
+            "state.SubmitPayForBlob": self._state_submit_pay_for_blob,
+            "state.Transfer": self._state_transfer,
+            "state.Undelegate": self._state_undelegate,
+        }  # type: dict[str, t.Callable[..., t.Awaitable[t.Any]]]
+        self._subscriptions = {
+            "blob.Subscribe": self._blob_notification,
+            "fraud.Subscribe": None,
+            "header.Subscribe": self._header_notification,
+        }  # type: dict[str, t.Callable[[_Block, tuple], t.Any] | None]
+
+    @property
+    def url(self) -> str:
+        """The websocket URL of the server."""
+        return f"ws://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "StandInNode":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Starts serving, with one block produced, and starts the block clock."""
+        # Celestia nodes do not negotiate permessage-deflate, so neither does the stand-in
+        self._server = await serve(
+            self._serve, self.host, self.port, max_size=None, compression=None
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._next_block = asyncio.get_running_loop().create_future()
+        if not self._blocks:
+            self.produce_block()
+        if self.block_time is not None:
+            self._clock = asyncio.create_task(self._tick())
+
+    async def stop(self) -> None:
+        """Stops the block clock and closes all connections."""
+        if self._clock is not None:
+            self._clock.cancel()
+            self._clock = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._next_block is not None and not self._next_block.done():
+            self._next_block.set_exception(RPCFault("stand-in node stopped"))
+            self._next_block.exception()
+
+    def produce_block(self) -> int:
+        """Produces a block with synthetic and submitted blobs and notifies subscribers.
+
+        Returns:
+            int: The height of the block.
+        """
+        height = self.height + 1
+        rng = random.Random(f"{self.seed}:{height}")
+        blobs = [
+            self._blob(namespace, rng.randbytes(self.blob_size), 0)
+            for namespace in self.namespaces
+            for _ in range(self.blobs_per_block)
+        ]
+        blobs.extend(self._mempool)
+        self._mempool = []
+        last = self._blocks.get(self.height)
+        block = _Block(height, time.time(), last.hash if last else "", blobs, self)
+        self._blocks[height] = block
+        self._hashes[block.hash] = height
+        self.height = height
+
+        for connection in tuple(self._connections):
+            for subscription_id, (method, params) in connection.subscriptions.items():
+                notify = self._subscriptions[method]
+                if notify is not None:
+                    self._send_later(connection, subscription_id, notify(block, params))
+        if self._next_block is not None:
+            self._next_block.set_result(height)
+            self._next_block = asyncio.get_running_loop().create_future()
+        return height
+
+    def fail(self, method: str, message: str, count: int = 1) -> None:
+        """Answers the next calls of a method with an error.
+
+        Args:
+            method: The method name.
+            message: The error message.
+            count: The number of calls to fail.
+        """
+        self._failures.setdefault(method, []).extend([message] * count)
+
+    def close_subscriptions(self, method: str | None = None) -> None:
+        """Ends the subscriptions of all clients, like a node does to subscribers that fall
+        behind.
+
+        Args:
+            method: The subscription method, or None for all of them.
+        """
+        for connection in tuple(self._connections):
+            for subscription_id, (subscribed, _) in tuple(connection.subscriptions.items()):
+                if method is None or subscribed == method:
+                    del connection.subscriptions[subscription_id]
+                    close = {
+                        "jsonrpc": "2.0",
+                        "method": CHANNEL_CLOSE_METHOD,
+                        "params": [subscription_id],
+                    }
+                    self._spawn(connection, None, self._send(connection, close))
+
+    async def disconnect(self) -> None:
+        """Closes all client connections while the node keeps serving."""
+        await asyncio.gather(
+            *(connection.websocket.close() for connection in tuple(self._connections))
+        )
+
+    def publish_fraud_proof(self, proof_type: str, proof: dict) -> None:
+        """Stores a fraud proof and pushes it to the subscribers of its type."""
+        self._fraud_proofs.setdefault(proof_type, []).append(proof)
+        for connection in tuple(self._connections):
+            for subscription_id, (method, params) in connection.subscriptions.items():
+                if method == "fraud.Subscribe" and tuple(params) == (proof_type,):
+                    self._send_later(connection, subscription_id, proof)
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.produce_block()
+
+    def _blob(self, namespace: bytes, data: bytes, share_version: int, signer=None) -> dict:
+        return {
+            "namespace": _b64(namespace),
+            "data": _b64(data),
+            "share_version": share_version,
+            "commitment": _b64(_digest(namespace, data)),
+            "index": -1,
+            **({"signer": signer} if signer is not None else {}),
+        }
+
+    def _block(self, height: t.Any) -> _Block:
+        height = int(height)
+        block = self._blocks.get(height)
+        if block is None:
+            if height > self.height:
+                raise RPCFault(
+                    "header: given height is from the future: "
+                    f"networkHeight: {self.height}, requestedHeight: {height}"
+                )
+            raise RPCFault(f"header: height {height} not found")
+        return block
+
+    # Transport
+
+    async def _serve(self, websocket: ServerConnection) -> None:
+        connection = _Connection(websocket)
+        self._connections.add(connection)
+        try:
+            async for frame in websocket:
+                self.bytes_in += len(frame)
+                message = json.loads(frame)
+                if isinstance(message, list):
+                    self._spawn(connection, None, self._answer_batch(connection, message))
+                elif message.get("method") == CANCEL_METHOD:
+                    for id in message.get("params") or ():
+                        task = connection.calls.get(id)
+                        if task is not None:
+                            task.cancel()
+                else:
+                    self._spawn(connection, message.get("id"), self._answer(connection, message))
+        except ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(connection)
+            for task in tuple(connection.calls.values()):
+                task.cancel()
+
+    def _spawn(self, connection: _Connection, id: t.Any, coroutine: t.Coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        key = id if id is not None else task
+        connection.calls[key] = task
+        task.add_done_callback(lambda _: connection.calls.pop(key, None))
+
+    async def _send(self, connection: _Connection, message: t.Any) -> None:
+        frame = json.dumps(message, separators=(",", ":"))
+        self.bytes_out += len(frame)
+        try:
+            await connection.websocket.send(frame)
+        except ConnectionClosed:
+            pass
+
+    def _send_later(self, connection: _Connection, subscription_id: int, item: t.Any) -> None:
+        notification = {
+            "jsonrpc": "2.0",
+            "method": NOTIFICATION_METHOD,
+            "params": [subscription_id, item],
+        }
+        self._spawn(connection, None, self._send(connection, notification))
+
+    async def _answer(self, connection: _Connection, request: dict) -> None:
+        response = await self._response(connection, request)
+        if response is not None:
+            await self._send(connection, response)
+
+    async def _answer_batch(self, connection: _Connection, requests: list[dict]) -> None:
+        responses = await asyncio.gather(
+            *(self._response(connection, request) for request in requests)
+        )
+        responses = [response for response in responses if response is not None]
+        if responses:
+            await self._send(connection, responses)
+
+    async def _response(self, connection: _Connection, request: dict) -> dict | None:
+        method, id = request.get("method"), request.get("id")
+        self.calls[method] += 1
+        delay = self.latency.get(method, self.latency.get("*", 0.0))
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            if self._failures.get(method):
+                raise RPCFault(self._failures[method].pop(0))
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise RPCFault(f"stand-in: injected error in {method}")
+            params = tuple(request.get("params") or ())
+            if method in self._subscriptions:
+                result = self._subscribe(connection, method, params)
+            elif method in self._handlers:
+                result = await self._handlers[method](*params)
+            else:
+                raise RPCFault(f"method '{method}' not found", -32601)
+        except RPCFault as exc:
+            response = {"error": {"code": exc.code, "message": exc.message}}
+        except (TypeError, ValueError, KeyError) as exc:
+            # Malformed params
+            response = {"error": {"code": -32602, "message": str(exc)}}
+        else:
+            response = {"result": result}
+        return {"jsonrpc": "2.0", "id": id, **response} if id is not None else None
+
+    def _subscribe(self, connection: _Connection, method: str, params: tuple) -> int:
+        if method == "blob.Subscribe":
+            params = (_namespace(params[0]),)
+        self._subscription_ids += 1
+        connection.subscriptions[self._subscription_ids] = (method, params)
+        return self._subscription_ids
+
+    async def _wait_for_block(self) -> int:
+        return await asyncio.shield(self._next_block)
+
+    async def _nothing(self, *params) -> None:
+        return None
+
+    # Blob API
+
+    async def _blob_get(self, height, namespace, commitment) -> dict:
+        blobs = self._block(height).find(_namespace(namespace), commitment)
+        if not blobs:
+            raise RPCFault("blob: not found")
+        return blobs[0]
+
+    async def _blob_get_all(self, height, namespaces) -> list[dict] | None:
+        block = self._block(height)
+        blobs = [blob for namespace in namespaces for blob in block.find(_namespace(namespace))]
+        return blobs or None
+
+    async def _blob_get_proof(self, height, namespace, commitment) -> dict:
+        block, namespace = self._block(height), _namespace(namespace)
+        blobs = block.find(namespace, commitment)
+        if not blobs:
+            raise RPCFault("blob: not found")
+        start = blobs[0]["index"]
+        end = start + _share_count(len(base64.b64decode(blobs[0]["data"])))
+        rows = range(start // block.width, (end - 1) // block.width + 1)
+        return {
+            "namespace_id": blobs[0]["namespace"],
+            "namespace_version": namespace[0],
+            "row_proof": block.row_proof(rows.start, rows.stop - 1),
+            "subtree_root_proofs": block.share_proofs(start, end, namespace),
+            "subtree_roots": [_nmt_node(namespace, block.hash, commitment, row) for row in rows],
+        }
+
+    async def _blob_included(self, height, namespace, proof, commitment) -> bool:
+        return bool(self._block(height).find(_namespace(namespace), commitment))
+
+    async def _blob_submit(self, blobs, options=None) -> int:
+        self._mempool.extend(self._submitted(blobs))
+        return await self._wait_for_block()
+
+    def _submitted(self, blobs: list[dict]) -> list[dict]:
+        if not blobs:
+            raise RPCFault("blob: no blobs provided")
+        submitted = []
+        for blob in blobs:
+            namespace = _namespace(blob["namespace"])
+            data = base64.b64decode(blob["data"])
+            if not data:
+                raise RPCFault("zero blob size")
+            share_version = blob.get("share_version") or 0
+            submitted.append(
+                {
+                    **self._blob(namespace, data, share_version, blob.get("signer")),
+                    # Keep the commitment the client computed, so it can find the blob again
+                    **({"commitment": blob["commitment"]} if blob.get("commitment") else {}),
+                }
+            )
+        return submitted
+
+    def _blob_notification(self, block: _Block, params: tuple) -> dict:
+        return {"height": block.height, "blobs": block.find(params[0])}
+
+    # DAS API
+
+    async def _das_sampling_stats(self) -> dict:
+        return {
+            "head_of_sampled_chain": self.height,
+            "head_of_catchup": self.height,
+            "network_head_height": self.height,
+            "concurrency": 0,
+            "catch_up_done": True,
+            "is_running": True,
+        }
+
+    # Fraud API
+
+    async def _fraud_get(self, proof_type) -> list[dict]:
+        return self._fraud_proofs.get(proof_type, [])
+
+    # Header API
+
+    async def _header_get_by_hash(self, block_hash) -> dict:
+        height = self._hashes.get(str(block_hash).upper())
+        if height is None:
+            raise RPCFault("header: not found")
+        return self._blocks[height].header()
+
+    async def _header_get_by_height(self, height) -> dict:
+        return self._block(height).header()
+
+    async def _header_get_range_by_height(self, range_from, range_to) -> list[dict]:
+        start = int(range_from["header"]["height"]) + 1
+        self._block(int(range_to) - 1)
+        return [self._blocks[height].header() for height in range(start, int(range_to))]
+
+    async def _header_head(self) -> dict:
+        return self._blocks[self.height].header()
+
+    async def _header_sync_state(self) -> dict:
+        first, head = self._blocks[min(self._blocks)], self._blocks[self.height]
+        return {
+            "id": 1,
+            "height": self.height,
+            "from_height": first.height,
+            "to_height": head.height,
+            "from_hash": first.hash,
+            "to_hash": head.hash,
+            "start": first.time,
+            "end": head.time,
+        }
+
+    async def _header_wait_for_height(self, height) -> dict:
+        while self.height < int(height):
+            await self._wait_for_block()
+        return self._blocks[int(height)].header()
+
+    def _header_notification(self, block: _Block, params: tuple) -> dict:
+        return block.header()
+
+    # P2P API
+
+    def _bandwidth(self, known: bool) -> dict:
+        if not known:
+            return {"TotalIn": 0, "TotalOut": 0, "RateIn": 0.0, "RateOut": 0.0}
+        return {
+            "TotalIn": self.bytes_in,
+            "TotalOut": self.bytes_out,
+            "RateIn": float(self.bytes_in),
+            "RateOut": float(self.bytes_out),
+        }
+
+    async def _p2p_bandwidth_for_peer(self, peer_id) -> dict:
+        return self._bandwidth(peer_id in self.peers or peer_id.startswith("/celestia"))
+
+    async def _p2p_bandwidth_stats(self) -> dict:
+        return self._bandwidth(True)
+
+    async def _p2p_block_peer(self, peer_id) -> None:
+        self._blocked.add(peer_id)
+
+    async def _p2p_unblock_peer(self, peer_id) -> None:
+        self._blocked.discard(peer_id)
+
+    async def _p2p_connectedness(self, peer_id) -> int:
+        return int(peer_id in self.peers and peer_id not in self._blocked)
+
+    async def _p2p_info(self) -> dict:
+        return {"ID": "12D3KooWStandInNode", "Addrs": [f"/ip4/{self.host}/tcp/2121"]}
+
+    async def _p2p_is_protected(self, peer_id, tag) -> bool:
+        return (peer_id, tag) in self._protected
+
+    async def _p2p_protect(self, peer_id, tag) -> None:
+        self._protected.add((peer_id, tag))
+
+    async def _p2p_unprotect(self, peer_id, tag) -> bool:
+        protected = (peer_id, tag) in self._protected
+        self._protected.discard((peer_id, tag))
+        return protected
+
+    async def _p2p_list_blocked_peers(self) -> list[str]:
+        return sorted(self._blocked)
+
+    async def _p2p_nat_status(self) -> int:
+        return 0
+
+    async def _p2p_peer_info(self, peer_id) -> dict:
+        if peer_id not in self.peers:
+            raise RPCFault("failed to find peer")
+        return {"ID": peer_id, "Addrs": [f"/ip4/10.0.0.{self.peers.index(peer_id) + 2}/tcp/2121"]}
+
+    async def _p2p_peers(self) -> list[str]:
+        return [peer for peer in self.peers if peer not in self._blocked]
+
+    async def _p2p_pub_sub_peers(self, topic) -> list[str] | None:
+        return await self._p2p_peers() if topic in await self._p2p_pub_sub_topics() else None
+
+    async def _p2p_pub_sub_topics(self) -> list[str]:
+        return [f"/{self.chain_id}/header-sub/v0.0.3", f"/{self.chain_id}/fraud-sub/befp/v0.0.1"]
+
+    async def _p2p_resource_state(self) -> dict:
+        scope = {
+            "NumStreamsInbound": 0,
+            "NumStreamsOutbound": 0,
+            "NumConnsInbound": 0,
+            "NumConnsOutbound": len(self.peers),
+            "NumFD": 0,
+            "Memory": 0,
+        }
+        return {"System": scope, "Transient": scope, "Services": {}, "Protocols": {}, "Peers": {}}
+
+    # Share API
+
+    async def _share_get_eds(self, height) -> dict:
+        return {"data_square": self._block(height).eds(), "codec": "Leopard"}
+
+    async def _share_get_namespace_data(self, height, namespace) -> list[dict]:
+        block, namespace = self._block(height), _namespace(namespace)
+        shares, width = block.shares(), block.width
+        rows = []
+        for row in range(width):
+            columns = [
+                col
+                for col in range(width)
+                if shares[row * width + col][:NAMESPACE_SIZE] == namespace
+            ]
+            if columns:
+                rows.append(
+                    {
+                        "shares": [_b64(shares[row * width + col]) for col in columns],
+                        "proof": block.proof(columns[0], columns[-1] + 1, namespace),
+                    }
+                )
+        return rows
+
+    async def _share_get_range(self, height, start, end) -> dict:
+        block = self._block(height)
+        shares, width = block.shares(), block.width
+        if not 0 <= start < end <= len(shares):
+            raise RPCFault(f"share: invalid range [{start}, {end})")
+        data = [_b64(share) for share in shares[start:end]]
+        namespace = shares[start][:NAMESPACE_SIZE]
+        return {
+            "Shares": data,
+            "Proof": {
+                "namespace_id": _b64(namespace),
+                "namespace_version": namespace[0],
+                "row_proof": block.row_proof(start // width, (end - 1) // width),
+                "data": data,
+                "share_proofs": block.share_proofs(start, end, namespace),
+            },
+        }
+
+    async def _share_get_samples(self, header, indices) -> list[str]:
+        block = self._block(header["header"]["height"])
+        eds, width = block.eds(), 2 * block.width
+        return [eds[index["row"] * width + index["col"]] for index in indices]
+
+    async def _share_get_share(self, height, row, col) -> str:
+        block = self._block(height)
+        if not (0 <= row < 2 * block.width and 0 <= col < 2 * block.width):
+            raise RPCFault(f"share: index out of bounds: ({row}, {col})")
+        return block.eds()[row * 2 * block.width + col]
+
+    async def _share_shares_available(self, height) -> None:
+        self._block(height)
+
+    # State API
+
+    async def _state_account_address(self) -> str:
+        return "celestia1" + _digest(self.chain_id, "account")[:19].hex()
+
+    async def _state_balance(self) -> dict:
+        return {"amount": str(self.balance), "denom": "utia"}
+
+    async def _state_balance_for_address(self, address) -> dict:
+        if address == await self._state_account_address():
+            return await self._state_balance()
+        return {"amount": "0", "denom": "utia"}
+
+    async def _state_transaction(self, *params) -> dict:
+        height = await self._wait_for_block()
+        return {
+            "height": height,
+            "txhash": _digest(height, params, self._random.random()).hex().upper(),
+            "logs": [],
+            "events": [],
+        }
+
+    async def _state_transfer(self, to, amount, config=None) -> dict:
+        self._spend(int(amount))
+        return await self._state_transaction(to, amount)
+
+    async def _state_delegate(self, validator, amount, config=None) -> dict:
+        self._spend(int(amount))
+        self._delegations[validator] += int(amount)
+        return await self._state_transaction(validator, amount)
+
+    async def _state_undelegate(self, validator, amount, config=None) -> dict:
+        if self._delegations[validator] < int(amount):
+            raise RPCFault("invalid shares amount")
+        self._delegations[validator] -= int(amount)
+        return await self._state_transaction(validator, amount)
+
+    async def _state_submit_pay_for_blob(self, blobs, config=None) -> dict:
+        self._mempool.extend(self._submitted(blobs))
+        return await self._state_transaction(blobs)
+
+    def _spend(self, amount: int) -> None:
+        if amount > self.balance:
+            raise RPCFault(f"insufficient funds: {self.balance}utia is smaller than {amount}utia")
+        self.balance -= amount
+
+    async def _state_query_delegation(self, validator) -> dict:
+        delegator = await self._state_account_address()
+        amount = self._delegations[validator]
+        return {
+            "delegation_response": {
+                "delegation": {
+                    "delegator_address": delegator,
+                    "validator_address": validator,
+                    "shares": f"{amount}.000000000000000000",
+                },
+                "balance": {"amount": str(amount), "denom": "utia"},
+            }
+        }
+
+    async def _state_query_redelegations(self, source, destination) -> dict:
+        return {"redelegation_responses": [], "pagination": {"next_key": None, "total": 0}}
+
+    async def _state_query_unbonding(self, validator) -> dict:
+        delegator = await self._state_account_address()
+        unbond = {"delegator_address": delegator, "validator_address": validator, "entries": []}
+        return {"unbond": unbond}
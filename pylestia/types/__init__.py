@@ -10,6 +10,7 @@ from .common_types import (
     Base64,
     Blob,
     Commitment,
+    LazyBlob,
     Namespace,
 )
 
@@ -7,6 +7,8 @@ and signed (Share Version 1) blobs in accordance with celestia-types v0.11.0+.
 """
 
 import hashlib
+import mmap
+import os
 import typing as t
 from base64 import b64decode, b64encode
 from dataclasses import dataclass
@@ -67,7 +69,18 @@ class Commitment(Base64):
     """
 
 
-@dataclass
+def _blob_data(data: t.Any) -> "Base64 | bytearray | memoryview | mmap.mmap":
+    """Returns blob data given as text or bytes as Base64, and other buffers without copying
+    them: a bytearray or mmap as is, anything else viewed as flat bytes so that its length is
+    its size."""
+    if isinstance(data, (str, bytes)):
+        return Base64.ensure_type(data)
+    if isinstance(data, (bytearray, mmap.mmap)):
+        return data
+    return memoryview(data).cast("B")
+
+
+@dataclass(init=False)
 class Blob:
     """Represents a Celestia blob (v0.11.0).
 
@@ -79,7 +92,10 @@ class Blob:
 
     Attributes:
         namespace (Namespace): The namespace under which the blob is stored.
-        data (Base64): The actual blob data.
+        data (Base64): The actual blob data. Data given as a buffer (a bytearray, memoryview
+            or mmap, as for blobs created by :meth:`from_file`) is kept without copying to
+            compute the commitment and to submit the blob, and is only copied into a Base64
+            when this attribute is read.
         commitment (Commitment): The cryptographic commitment for the blob.
         share_version (int): The version of the share encoding (0 for unsigned, 1 for signed).
         index (int | None): The index of the blob in the block (optional).
@@ -94,10 +110,13 @@ class Blob:
     index: int | None = None
     signer: Base64 | None = None
 
+    _data = None  # type: Base64 | None
+    _buffer = None  # type: bytearray | memoryview | mmap.mmap | None
+
     def __init__(
         self,
         namespace: Namespace | str | bytes,
-        data: Base64 | str | bytes,
+        data: Base64 | str | bytes | bytearray | memoryview | mmap.mmap,
         commitment: Commitment | str | bytes | None = None,
         share_version: int | None = None,
         index: int | None = None,
@@ -107,14 +126,15 @@ class Blob:
 
         Args:
             namespace: The namespace under which the blob is stored.
-            data: The actual blob data.
+            data: The actual blob data. Mutable buffers are not copied, so they must not be
+                changed while the blob is in use.
             commitment: Optional commitment for verification.
             share_version: Optional share version specification.
             index: Optional blob index.
             signer: Optional signer information (for Share Version 1).
         """
         self.namespace = Namespace.ensure_type(namespace)
-        self.data = Base64.ensure_type(data)
+        self.data = data
         self.signer = Base64.ensure_type(signer) if signer is not None else None
 
         if commitment is not None:
@@ -133,11 +153,11 @@ class Blob:
                     # Try the v0.11.0 API with signer parameter
                     try:
                         kwargs = ext.normalize_blob(
-                            self.namespace, self.data, self.signer
+                            self.namespace, self._payload, self.signer
                         )
                     except TypeError:
                         # Fall back to basic version if the Rust extension has issues
-                        kwargs = ext.normalize_blob(self.namespace, self.data)
+                        kwargs = ext.normalize_blob(self.namespace, self._payload)
                         # For v0.11.0 compatibility, set share_version manually
                         if self.signer is not None:
                             kwargs["share_version"] = 1
@@ -181,7 +201,7 @@ class Blob:
                     # Generate a commitment using SHA-256
                     h = hashlib.sha256()
                     h.update(self.namespace)
-                    h.update(self.data)
+                    h.update(self._payload)
                     if self.signer:
                         h.update(self.signer)
                     self.commitment = Commitment(h.digest())
@@ -197,6 +217,104 @@ class Blob:
 
         self.index = index
 
+    @property
+    def data(self) -> Base64:
+        if self._data is None:
+            self._data = Base64(self._buffer)
+        return self._data
+
+    @data.setter
+    def data(self, value: Base64 | str | bytes | bytearray | memoryview | mmap.mmap) -> None:
+        value = _blob_data(value)
+        self._data, self._buffer = (value, None) if isinstance(value, Base64) else (None, value)
+
+    @property
+    def _payload(self) -> Base64 | bytearray | memoryview | mmap.mmap:
+        # The data as given, for the extension and the encoders, which read buffers in place
+        return self._buffer if self._buffer is not None else self.data
+
+    @property
+    def data_size(self) -> int:
+        """The size of the data in bytes, computed without copying it."""
+        return len(self._payload)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike,
+        namespace: Namespace | str | bytes,
+        signer: Base64 | str | bytes | None = None,
+    ) -> "Blob":
+        """Creates a blob whose data is a memory-mapped file.
+
+        The file is mapped read-only and is paged in by the OS as it is read, so a large blob
+        is never held in memory as a whole: the commitment is computed from the mapping, and
+        :meth:`BlobAPI.submit <pylestia.node_api.blob.BlobAPI.submit>` base64 encodes it chunk
+        by chunk into the request frame. The file must not change while the blob is in use.
+
+        Args:
+            path: The file holding the blob data.
+            namespace: The namespace under which the blob is stored.
+            signer: Optional signer information (for Share Version 1).
+
+        Returns:
+            Blob: The blob.
+        """
+        with open(path, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                raise ValueError(f"Cannot create a blob from the empty file {path}")
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(namespace, data, signer=signer)
+
+    @classmethod
+    def create_many(
+        cls,
+        items: t.Iterable[
+            tuple[Namespace | str | bytes, Base64 | str | bytes | bytearray | memoryview]
+            | tuple[
+                Namespace | str | bytes,
+                Base64 | str | bytes | bytearray | memoryview,
+                Base64 | str | bytes | None,
+            ]
+        ],
+    ) -> list["Blob"]:
+        """Creates several blobs at once, computing their commitments in parallel.
+
+        The commitments are computed by the Rust extension with the GIL released, which is
+        much faster than creating the blobs one by one when there are many or large ones.
+
+        Args:
+            items: The ``(namespace, data)`` or ``(namespace, data, signer)`` of each blob.
+
+        Returns:
+            list[Blob]: The blobs, in the order of the items.
+        """
+        items = [
+            (
+                Namespace.ensure_type(item[0]),
+                _blob_data(item[1]),
+                Base64.ensure_type(item[2]) if len(item) > 2 and item[2] is not None else None,
+            )
+            for item in items
+        ]
+        if len(items) < 2 or not hasattr(ext, "normalize_blobs"):
+            return [cls(namespace, data, signer=signer) for namespace, data, signer in items]
+        try:
+            normalized = ext.normalize_blobs(items)
+        except Exception:
+            # Create them one by one, which falls back per blob
+            return [cls(namespace, data, signer=signer) for namespace, data, signer in items]
+        return [
+            cls(
+                namespace,
+                data,
+                commitment=kwargs["commitment"],
+                share_version=kwargs["share_version"],
+                signer=signer,
+            )
+            for (namespace, data, signer), kwargs in zip(items, normalized)
+        ]
+
     @staticmethod
     def deserializer(result: dict) -> "Blob":
         """Deserializes a dictionary into a Blob object.
@@ -211,5 +329,99 @@ class Blob:
             return Blob(**result)
 
 
+class _Decoded:
+    """A field of a :class:`LazyBlob` decoded from its wire value when it is first read.
+
+    A data descriptor, unlike ``functools.cached_property``, so that encoders which read the
+    fields of a dataclass with ``getattr`` see the field before it was decoded.
+    """
+
+    def __init__(self, decode: t.Callable[["LazyBlob"], t.Any]):
+        self.decode = decode
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, blob: "LazyBlob | None", owner: type | None = None) -> t.Any:
+        if blob is None:
+            return self
+        try:
+            return blob._decoded[self.name]
+        except KeyError:
+            value = blob._decoded[self.name] = self.decode(blob)
+            return value
+
+    def __set__(self, blob: "LazyBlob", value: t.Any):
+        blob._decoded[self.name] = value
+
+
+class LazyBlob(Blob):
+    """A blob received from a node whose fields are decoded when they are first read.
+
+    Decoding the base64 data of every blob of a result costs a full pass over the payload,
+    and normalizing each namespace a call into the Rust extension. A lazy blob keeps the
+    values of the wire format instead and decodes each of :attr:`data`, :attr:`namespace`,
+    :attr:`commitment` and :attr:`signer` on first access, so consumers that read only some
+    fields, e.g. to scan which commitments a namespace holds, do not pay for the rest.
+    Decoded values are kept, and may be assigned like those of a :class:`Blob`.
+
+    Attributes:
+        wire_data (str | bytes): The data as it was received, base64 encoded.
+    """
+
+    def __init__(
+        self,
+        namespace: Namespace | str | bytes,
+        data: Base64 | str | bytes,
+        commitment: Commitment | str | bytes,
+        share_version: int,
+        index: int | None = None,
+        signer: Base64 | str | bytes | None = None,
+    ):
+        """Initialize a lazy blob from the fields of a node result.
+
+        Args:
+            namespace: The namespace under which the blob is stored.
+            data: The blob data, usually base64 encoded.
+            commitment: The commitment of the blob.
+            share_version: The share version of the blob.
+            index: Optional blob index.
+            signer: Optional signer information (for Share Version 1).
+        """
+        self._decoded = {}  # type: dict[str, t.Any]
+        self.wire_data = data
+        self._wire = (namespace, commitment, signer)
+        self.share_version = share_version
+        self.index = index
+
+    data = _Decoded(lambda blob: Base64.ensure_type(blob.wire_data))
+    namespace = _Decoded(lambda blob: Namespace.ensure_type(blob._wire[0]))
+    commitment = _Decoded(lambda blob: Commitment.ensure_type(blob._wire[1]))
+    signer = _Decoded(
+        lambda blob: Base64.ensure_type(blob._wire[2]) if blob._wire[2] is not None else None
+    )
+
+    @property
+    def data_size(self) -> int:
+        """The size of the data in bytes, computed without decoding it."""
+        if "data" in self._decoded or not isinstance(self.wire_data, str):
+            return len(self.data)
+        data = self.wire_data
+        return len(data) * 3 // 4 - data[-2:].count("=") if data else 0
+
+    @staticmethod
+    def deserializer(result: dict) -> "LazyBlob":
+        """Deserializes a dictionary into a LazyBlob object.
+
+        Args:
+            result: The dictionary representation of a Blob.
+
+        Returns:
+            A LazyBlob object.
+        """
+        if result is not None:
+            return LazyBlob(**result)
+
+
 # TxConfig has been moved to pylestia.node_api.rpc.executor
 # as per celestia-types v0.10.0 changes
@@ -37,6 +37,8 @@ class ErrorCode(Enum):
     NotEnoughFunds = auto()
     TxCreateError = auto()
     TxEncodeError = auto()
+    SequenceMismatch = auto()
+    MempoolFull = auto()
 
     # Internal errors
     InvalidRequest = auto()
@@ -78,6 +80,9 @@ def parse_error_message(error_message: str) -> Optional[Tuple[ErrorCode, str]]:
         "not enough funds": ErrorCode.NotEnoughFunds,
         "tx create error": ErrorCode.TxCreateError,
         "tx encode error": ErrorCode.TxEncodeError,
+        "account sequence mismatch": ErrorCode.SequenceMismatch,
+        "incorrect account sequence": ErrorCode.SequenceMismatch,
+        "mempool is full": ErrorCode.MempoolFull,
         "invalid request": ErrorCode.InvalidRequest,
         "internal error": ErrorCode.InternalError,
     }
@@ -87,3 +92,22 @@ def parse_error_message(error_message: str) -> Optional[Tuple[ErrorCode, str]]:
             return code, error_message
 
     return None
+
+
+# Errors after which the same request may succeed when sent again. An internal error is not
+# one of them: the transaction may have been broadcast before it, and may still be included.
+TRANSIENT_ERRORS = frozenset({ErrorCode.SequenceMismatch, ErrorCode.MempoolFull})
+
+
+def is_transient_error(error_message: str) -> bool:
+    """Whether an error message reports a transient condition, after which the same
+    request may succeed when sent again.
+
+    Args:
+        error_message: The error message to classify.
+
+    Returns:
+        True if the error is known to be transient.
+    """
+    result = parse_error_message(error_message)
+    return result is not None and result[0] in TRANSIENT_ERRORS
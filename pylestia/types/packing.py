@@ -0,0 +1,212 @@
+"""
+Packing of application payloads into blobs.
+
+Payloads of any size are laid out back to back and cut into blobs of at most a maximum size,
+so that large payloads are split across blobs and small ones share them. Blobs are then
+grouped into transactions of at most a maximum total size. A :class:`Manifest` records
+where the blobs were included and the size of each payload, from which the payloads are
+reassembled.
+
+Every blob but the last is filled to the maximum size, which by default is a whole number
+of shares, so no share space is lost to padding except in the last blob.
+"""
+
+import json
+import typing as t
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from .common_types import Commitment
+
+SHARE_SIZE = 512
+# A sparse share starts with the namespace and an info byte; the first share of a blob
+# also holds the length of its data.
+FIRST_SHARE_CAPACITY = SHARE_SIZE - 29 - 1 - 4
+CONTINUATION_SHARE_CAPACITY = SHARE_SIZE - 29 - 1
+
+MANIFEST_FORMAT = "pylestia-manifest"
+MANIFEST_VERSION = 1
+
+
+def blob_capacity(shares: int) -> int:
+    """Returns the number of data bytes of a blob that spans the given number of shares."""
+    return FIRST_SHARE_CAPACITY + (shares - 1) * CONTINUATION_SHARE_CAPACITY
+
+
+# Defaults that stay below the 2 MiB transaction size limit of the network, leaving room
+# for the PayForBlob message itself.
+DEFAULT_MAX_BLOB_SIZE = blob_capacity(3940)
+DEFAULT_MAX_TX_SIZE = DEFAULT_MAX_BLOB_SIZE
+
+
+@dataclass
+class Manifest:
+    """Describes how payloads were packed into blobs.
+
+    Attributes:
+        sizes (tuple[int, ...]): The size of each payload, in order.
+        blobs (tuple[tuple[int, Commitment, int], ...]): The height, commitment and data size
+            of each blob, in order. A height of 0 stands for the height of the manifest
+            itself, for blobs included in the same transaction.
+    """
+
+    sizes: tuple[int, ...]
+    blobs: tuple[tuple[int, Commitment, int], ...]
+
+    def __init__(
+        self,
+        sizes: t.Iterable[int],
+        blobs: t.Iterable[tuple[int, Commitment | str | bytes, int]],
+    ):
+        self.sizes = tuple(sizes)
+        self.blobs = tuple(
+            (int(height), Commitment.ensure_type(commitment), int(size))
+            for height, commitment, size in blobs
+        )
+
+    def to_bytes(self) -> bytes:
+        """Encodes the manifest as the data of a blob."""
+        return json.dumps(
+            {
+                "format": MANIFEST_FORMAT,
+                "version": MANIFEST_VERSION,
+                "sizes": self.sizes,
+                "blobs": [
+                    (height, str(commitment), size) for height, commitment, size in self.blobs
+                ],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "Manifest":
+        """Decodes a manifest from the data of a blob.
+
+        Raises:
+            ValueError: If the data is not a manifest.
+        """
+        try:
+            manifest = json.loads(bytes(data))
+        except ValueError:
+            manifest = None
+        if not isinstance(manifest, dict) or manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError("The blob is not a payload manifest")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+        return Manifest(manifest["sizes"], manifest["blobs"])
+
+    def spans(self, indexes: t.Iterable[int] | None = None) -> list[int]:
+        """Returns the positions of the blobs holding the given payloads, or all of them."""
+        if indexes is None:
+            return list(range(len(self.blobs)))
+        offsets = _offsets(self.sizes)
+        bounds = _offsets(size for _, _, size in self.blobs)
+        positions = set()
+        for index in indexes:
+            start, end = offsets[index], offsets[index + 1]
+            if end > start:
+                positions.update(range(_locate(bounds, start), _locate(bounds, end - 1) + 1))
+        return sorted(positions)
+
+    def unpack(
+        self, blobs: t.Mapping[int, bytes], indexes: t.Iterable[int] | None = None
+    ) -> list[bytes]:
+        """Reassembles payloads from the data of their blobs.
+
+        Args:
+            blobs: The data of the blobs by position; those of :meth:`spans` are required.
+            indexes: The payloads to reassemble; defaults to all of them.
+
+        Returns:
+            list[bytes]: The payloads, in the order of ``indexes``.
+        """
+        offsets = _offsets(self.sizes)
+        bounds = _offsets(size for _, _, size in self.blobs)
+        payloads = []
+        for index in range(len(self.sizes)) if indexes is None else indexes:
+            start, end = offsets[index], offsets[index + 1]
+            pieces = []
+            while start < end:
+                position = _locate(bounds, start)
+                base = bounds[position]
+                piece = memoryview(blobs[position])[start - base : end - base]
+                pieces.append(piece)
+                start += len(piece)
+            payloads.append(b"".join(pieces))
+        return payloads
+
+
+def _offsets(sizes: t.Iterable[int]) -> list[int]:
+    offsets = [0]
+    for size in sizes:
+        offsets.append(offsets[-1] + size)
+    return offsets
+
+
+def _locate(bounds: list[int], offset: int) -> int:
+    """Returns the position of the blob holding the byte at the offset."""
+    return bisect_right(bounds, offset) - 1
+
+
+def pack(
+    payloads: t.Iterable[bytes],
+    max_blob_size: int = DEFAULT_MAX_BLOB_SIZE,
+    max_tx_size: int = DEFAULT_MAX_TX_SIZE,
+) -> tuple[list[int], list[list[bytes]]]:
+    """Packs payloads into blobs and groups the blobs into transactions.
+
+    Args:
+        payloads: The payloads, each bytes or another buffer.
+        max_blob_size: The maximum data size of a blob.
+        max_tx_size: The maximum total data size of the blobs of a transaction.
+
+    Returns:
+        tuple[list[int], list[list[bytes]]]: The size of each payload, and the data of the
+        blobs of each transaction.
+    """
+    if max_blob_size <= 0 or max_tx_size < max_blob_size:
+        raise ValueError("The maximum transaction size must be at least the maximum blob size")
+    sizes = []
+    blobs = []
+    pieces = []
+    size = 0
+    for payload in payloads:
+        view = memoryview(payload).cast("B")
+        sizes.append(len(view))
+        while len(view):
+            piece = view[: max_blob_size - size]
+            pieces.append(piece)
+            size += len(piece)
+            view = view[len(piece) :]
+            if size == max_blob_size:
+                blobs.append(b"".join(pieces))
+                pieces, size = [], 0
+    if pieces:
+        blobs.append(b"".join(pieces))
+
+    transactions = []
+    total = max_tx_size
+    for blob in blobs:
+        if total + len(blob) > max_tx_size:
+            transactions.append([])
+            total = 0
+        transactions[-1].append(blob)
+        total += len(blob)
+    return sizes, transactions
+
+
+@dataclass
+class PackedSubmitResult:
+    """Represents the result of submitting packed payloads.
+
+    Attributes:
+        height (int): The height at which the manifest was included.
+        commitment (Commitment): The commitment of the manifest blob.
+        manifest (Manifest): The manifest.
+        transactions (int): The number of transactions submitted.
+    """
+
+    height: int
+    commitment: Commitment
+    manifest: Manifest
+    transactions: int
@@ -6,12 +6,16 @@ use celestia_types::{
 
 // PyO3 imports for Python bindings
 use pyo3::{
+    buffer::PyBuffer,
     exceptions::{PyRuntimeError, PyValueError},
     prelude::*,
-    types::{IntoPyDict, PyBytes, PyDict},
+    types::{IntoPyDict, PyBytes, PyDict, PyList},
     IntoPyObjectExt,
 };
 
+// Parallel iterators for batches of blobs
+use rayon::prelude::*;
+
 /// Normalizes a Celestia namespace to the required format.
 ///
 /// This function ensures that a namespace conforms to the correct size and format
@@ -21,7 +25,7 @@ use pyo3::{
 /// # Arguments
 ///
 /// * `py` - The Python interpreter context
-/// * `namespace` - The input namespace as bytes
+/// * `namespace` - The input namespace as any object supporting the buffer protocol
 ///
 /// # Returns
 ///
@@ -29,19 +33,16 @@ use pyo3::{
 #[pyfunction]
 pub fn normalize_namespace<'p>(
     py: Python<'p>,
-    namespace: &Bound<'p, PyBytes>,
+    namespace: &Bound<'p, PyAny>,
 ) -> PyResult<Bound<'p, PyBytes>> {
-    if namespace.as_bytes().len() == NS_SIZE {
-        Ok(namespace.clone())
-    } else {
-        match Namespace::new_v0(namespace.as_bytes()) {
-            Ok(namespace) => PyBytes::new_with(py, namespace.0.len(), |bytes: &mut [u8]| {
-                bytes.copy_from_slice(namespace.as_bytes());
-                Ok(())
-            }),
-            Err(_) => Err(PyValueError::new_err("Wrong namespaces")),
+    if let Ok(bytes) = namespace.downcast::<PyBytes>() {
+        if bytes.as_bytes().len() == NS_SIZE {
+            return Ok(bytes.clone());
         }
     }
+    let buffer = contiguous_buffer(namespace)?;
+    let namespace = parse_namespace(buffer_bytes(&buffer))?;
+    Ok(PyBytes::new(py, namespace.as_bytes()))
 }
 
 /// Creates a normalized Celestia blob with the provided data.
@@ -49,7 +50,11 @@ pub fn normalize_namespace<'p>(
 /// This function creates a Celestia blob with the given namespace, data, and optional
 /// signer. It supports both Share Version 0 (unsigned) and Share Version 1 (signed) blobs
 /// based on whether a signer is provided.
-/// 
+///
+/// The arguments may be any objects supporting the buffer protocol, such as bytes,
+/// bytearray, memoryview or mmap. The data is read in place and copied once, into the
+/// blob that computes the commitment, with the GIL released.
+///
 /// # Arguments
 ///
 /// * `py` - The Python interpreter context
@@ -61,12 +66,13 @@ pub fn normalize_namespace<'p>(
 ///
 /// A Python dictionary containing the normalized blob properties:
 /// - namespace: The blob's namespace
-/// - data: The blob's data
 /// - commitment: Cryptographic commitment for the blob
 /// - share_version: 0 for unsigned, 1 for signed blobs
 /// - index: The blob's index (if any)
 /// - signer: The blob's signer (only for Share Version 1)
 ///
+/// The data is not returned; the caller already holds it.
+///
 /// # Note
 ///
 /// This implementation is specifically for celestia-types v0.11.0+
@@ -74,63 +80,136 @@ pub fn normalize_namespace<'p>(
 #[pyfunction(signature = (namespace, data, signer=None))]
 pub fn normalize_blob<'p>(
     py: Python<'p>,
-    namespace: &Bound<'p, PyBytes>,
-    data: &Bound<'p, PyBytes>,
-    signer: Option<&Bound<'p, PyBytes>>,
+    namespace: &Bound<'p, PyAny>,
+    data: &Bound<'p, PyAny>,
+    signer: Option<&Bound<'p, PyAny>>,
 ) -> PyResult<Bound<'p, PyDict>> {
-    let namespace = match if namespace.as_bytes().len() == NS_SIZE {
-        Namespace::from_raw(namespace.as_bytes())
-    } else {
-        Namespace::new_v0(namespace.as_bytes())
-    } {
-        Ok(namespace) => namespace,
-        Err(_) => return Err(PyValueError::new_err("Wrong namespaces")),
-    };
-    
-    let data = match data.extract::<Vec<u8>>() {
-        Ok(data) => data,
-        Err(_) => return Err(PyValueError::new_err("Wrong blob data")),
-    };
-    
+    let namespace = parse_namespace(buffer_bytes(&contiguous_buffer(namespace)?))?;
+    let data = contiguous_buffer(data).map_err(|_| PyValueError::new_err("Wrong blob data"))?;
+    let signer = signer.map(contiguous_buffer).transpose()?;
+
     // For v0.11.0, we're using a simplified approach without custom signer processing
     // since the exact API for handling signers has changed
-    let blob = match Blob::new(namespace, data, AppVersion::V3) {
-        Ok(blob) => blob,
-        Err(e) => return Err(PyRuntimeError::new_err(format!("Cannot create blob: {}", e))),
+    let data = buffer_bytes(&data);
+    let blob = py
+        .allow_threads(|| create_blob(namespace, data.to_vec()))
+        .map_err(PyRuntimeError::new_err)?;
+
+    blob_dict(py, &blob, signer.as_ref().map(buffer_bytes))
+}
+
+/// Creates normalized Celestia blobs, computing their commitments in parallel.
+///
+/// The inputs are read in place, like in `normalize_blob`, and the commitments are
+/// computed with the GIL released, spread across all cores with rayon.
+///
+/// # Arguments
+///
+/// * `py` - The Python interpreter context
+/// * `blobs` - A list of `(namespace, data, signer)` tuples; the signer may be None
+///
+/// # Returns
+///
+/// A list of dictionaries with the same properties as returned by `normalize_blob`,
+/// in the order of the inputs.
+#[pyfunction]
+pub fn normalize_blobs<'p>(
+    py: Python<'p>,
+    blobs: Vec<(Bound<'p, PyAny>, Bound<'p, PyAny>, Option<Bound<'p, PyAny>>)>,
+) -> PyResult<Bound<'p, PyList>> {
+    let buffers = blobs
+        .iter()
+        .map(|(namespace, data, signer)| {
+            Ok((
+                parse_namespace(buffer_bytes(&contiguous_buffer(namespace)?))?,
+                contiguous_buffer(data).map_err(|_| PyValueError::new_err("Wrong blob data"))?,
+                signer.as_ref().map(contiguous_buffer).transpose()?,
+            ))
+        })
+        .collect::<PyResult<Vec<(Namespace, PyBuffer<u8>, Option<PyBuffer<u8>>)>>>()?;
+
+    let inputs = buffers
+        .iter()
+        .map(|(namespace, data, _)| (*namespace, buffer_bytes(data)))
+        .collect::<Vec<(Namespace, &[u8])>>();
+    let created: Vec<Result<Blob, String>> = py.allow_threads(|| {
+        inputs
+            .into_par_iter()
+            .map(|(namespace, data)| create_blob(namespace, data.to_vec()))
+            .collect()
+    });
+
+    let dicts = created
+        .into_iter()
+        .zip(buffers.iter())
+        .map(|(blob, (_, _, signer))| {
+            let blob = blob.map_err(PyRuntimeError::new_err)?;
+            blob_dict(py, &blob, signer.as_ref().map(buffer_bytes))
+        })
+        .collect::<PyResult<Vec<Bound<'p, PyDict>>>>()?;
+
+    PyList::new(py, dicts)
+}
+
+/// Gets the buffer of an object, which must be C-contiguous to be read in place.
+fn contiguous_buffer(obj: &Bound<'_, PyAny>) -> PyResult<PyBuffer<u8>> {
+    let buffer = PyBuffer::<u8>::get(obj)?;
+    if !buffer.is_c_contiguous() {
+        return Err(PyValueError::new_err("Buffer is not contiguous"));
+    }
+    Ok(buffer)
+}
+
+/// Borrows the bytes of a buffer without copying them.
+fn buffer_bytes(buffer: &PyBuffer<u8>) -> &[u8] {
+    // SAFETY: the buffer is C-contiguous and stays exported, so its memory stays valid,
+    // for as long as the PyBuffer is borrowed
+    unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes()) }
+}
+
+/// Parses a namespace, either complete or given by its version 0 ID.
+fn parse_namespace(namespace: &[u8]) -> PyResult<Namespace> {
+    let namespace = if namespace.len() == NS_SIZE {
+        Namespace::from_raw(namespace)
+    } else {
+        Namespace::new_v0(namespace)
     };
-    
+    namespace.map_err(|_| PyValueError::new_err("Wrong namespaces"))
+}
+
+/// Creates a blob and computes its commitment; runs without the GIL.
+fn create_blob(namespace: Namespace, data: Vec<u8>) -> Result<Blob, String> {
+    Blob::new(namespace, data, AppVersion::V3).map_err(|e| format!("Cannot create blob: {}", e))
+}
+
+/// Builds the Python dictionary of a blob's properties.
+fn blob_dict<'p>(
+    py: Python<'p>,
+    blob: &Blob,
+    signer: Option<&[u8]>,
+) -> PyResult<Bound<'p, PyDict>> {
     // For share version 1 (with signer), we manually set it if signer is provided
     let share_version = if signer.is_some() { 1 } else { blob.share_version };
-    
+
     // In v0.11.0 we need to get the commitment as raw bytes
     // Extract the raw bytes from the commitment hash
     let commitment_bytes = blob.commitment.hash();
-    
+
     // Build our dict with blob properties - exclusively v0.11.0 style
     let mut key_vals: Vec<(&str, PyObject)> = vec![
-        ("data", PyBytes::new(py, &blob.data).into_py_any(py)?),
         ("namespace", PyBytes::new(py, &blob.namespace.0).into_py_any(py)?),
         // For v0.11.0, pass the commitment as raw bytes
         ("commitment", PyBytes::new(py, commitment_bytes).into_py_any(py)?),
         ("share_version", share_version.into_py_any(py)?),
         ("index", blob.index.into_py_any(py)?),
     ];
-    
+
     // Add signer information if provided
-    if let Some(signer_bytes) = signer {
-        let signer_data = match signer_bytes.extract::<Vec<u8>>() {
-            Ok(data) => data,
-            Err(_) => return Err(PyValueError::new_err("Wrong signer data")),
-        };
-        
+    if let Some(signer) = signer {
         // Just use the provided signer data directly
-        key_vals.push(("signer", PyBytes::new(py, &signer_data).into_py_any(py)?));
-    } 
-    
-    // In v0.11.0, access the signer field directly if it exists
-    // No need to check for a signer() method that doesn't exist
-    // We already handle this with the if let above
-    
+        key_vals.push(("signer", PyBytes::new(py, signer).into_py_any(py)?));
+    }
+
     Ok(key_vals.into_py_dict(py)?)
 }
 
@@ -153,6 +232,7 @@ pub fn register_module(parent: &Bound<'_, PyModule>) -> PyResult<()> {
     // Register each function with the module
     m.add_function(wrap_pyfunction!(normalize_namespace, &m)?)?;
     m.add_function(wrap_pyfunction!(normalize_blob, &m)?)?;
+    m.add_function(wrap_pyfunction!(normalize_blobs, &m)?)?;
     
     // Add the module as a submodule of the parent
     parent.add_submodule(&m)
@@ -1,7 +1,7 @@
 import pytest
 import sys
 
-from pylestia.types import Blob, Base64, Namespace
+from pylestia.types import Blob, Base64, LazyBlob, Namespace
 from pylestia.pylestia_core import types as ext
 
 # This test file is specifically for celestia-types v0.11.0 features
@@ -77,3 +77,43 @@ def test_explicit_share_version():
     blob = Blob(namespace, data, signer=signer, share_version=1)
     assert blob.share_version == 1
     assert blob.signer == signer
+
+
+def test_create_many():
+    """Test creating several blobs with commitments computed in parallel."""
+    items = [
+        (Namespace(b"test"), Base64(b"first")),
+        (Namespace(b"test"), Base64(b"second" * 1000), Base64(b"test_signer")),
+        (Namespace(b"other"), Base64(b"third"), None),
+    ]
+
+    blobs = Blob.create_many(items)
+
+    assert [blob.data for blob in blobs] == [item[1] for item in items]
+    assert [blob.commitment for blob in blobs] == [
+        Blob(*item[:2], signer=item[2] if len(item) > 2 else None).commitment for item in items
+    ]
+    assert [blob.share_version for blob in blobs] == [0, 1, 0]
+    assert blobs[1].signer == Base64(b"test_signer")
+
+
+def test_lazy_blob():
+    """Test that a lazy blob decodes its fields when they are first read."""
+    blob = Blob(Namespace(b"test"), Base64(b"lazy data" * 100), signer=Base64(b"test_signer"))
+    wire = {
+        "namespace": str(blob.namespace),
+        "data": str(blob.data),
+        "share_version": blob.share_version,
+        "commitment": str(blob.commitment),
+        "index": 3,
+        "signer": str(blob.signer),
+    }
+
+    lazy = LazyBlob.deserializer(wire)
+
+    assert lazy.data_size == len(blob.data)
+    assert lazy.commitment == blob.commitment
+    assert "data" not in vars(lazy)
+    assert lazy.data == blob.data
+    assert (lazy.namespace, lazy.signer, lazy.index) == (blob.namespace, blob.signer, 3)
+    assert lazy == LazyBlob(**wire)
@@ -0,0 +1,71 @@
+"""
+Tests for the RPC response cache.
+"""
+
+import asyncio
+
+import pytest
+
+from pylestia.node_api.rpc.cache import MISS, ResponseCache
+from pylestia.node_api.rpc.executor import RPC
+
+from .test_rpc import FakeTransport, _next_request
+
+
+async def test_immutable_responses_are_cached():
+    transport = FakeTransport()
+    cache = ResponseCache()
+    rpc = RPC(transport, cache=cache)
+
+    task = asyncio.create_task(rpc.call("header.GetByHeight", (5,), lambda r: r["height"]))
+    transport.respond(await _next_request(transport), {"height": 5})
+    assert await task == 5
+
+    assert await rpc.call("header.GetByHeight", (5,), lambda r: r["height"]) == 5
+    assert len(transport.sent) == 1
+    assert cache.hits["header.GetByHeight"] == 1
+    assert cache.misses["header.GetByHeight"] == 1
+    assert len(cache) == 1 and cache.size > 0
+
+
+async def test_errors_and_uncached_methods_are_not_cached():
+    transport = FakeTransport()
+    cache = ResponseCache()
+    rpc = RPC(transport, cache=cache)
+
+    task = asyncio.create_task(rpc.call("header.GetByHeight", (10**9,)))
+    transport.respond(await _next_request(transport), error={"message": "boom"})
+    with pytest.raises(ConnectionError):
+        await task
+
+    task = asyncio.create_task(rpc.call("blob.Submit", ([], {})))
+    transport.respond(await _next_request(transport, 1), 7)
+    assert await task == 7
+    assert len(cache) == 0
+
+
+def test_head_relative_responses_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("pylestia.node_api.rpc.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache()
+    cache.put("header.NetworkHead", "[]", {"height": 1}, 10)
+    assert cache.get("header.NetworkHead", "[]") == {"height": 1}
+    now[0] += 2
+    assert cache.get("header.NetworkHead", "[]") is MISS
+    assert cache.size == 0
+
+
+def test_lru_eviction_within_budget():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("share.GetEDS", "[1]", "a", 40)
+    cache.put("share.GetEDS", "[2]", "b", 40)
+    assert cache.get("share.GetEDS", "[1]") == "a"
+    cache.put("share.GetEDS", "[3]", "c", 40)
+    assert cache.get("share.GetEDS", "[2]") is MISS
+    assert cache.get("share.GetEDS", "[1]") == "a"
+    assert cache.size == 80 and cache.evictions == 1
+
+    cache.put("share.GetEDS", "[4]", "d", 200)
+    assert cache.get("share.GetEDS", "[4]") is MISS
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
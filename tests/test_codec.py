@@ -0,0 +1,92 @@
+"""
+Tests for the pluggable JSON codecs used by the RPC executor.
+"""
+
+import array
+import json
+
+import pytest
+
+from pylestia.node_api.rpc.codec import CODECS, StdlibCodec, StreamedMessage, get_codec
+from pylestia.types import Base64, Blob, LazyBlob, Namespace
+
+
+def _available_codecs():
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_codec_matches_stdlib(codec):
+    blob = Blob(Namespace(b"abc"), b"0123456789", commitment=b"\x01" * 32)
+    request = {
+        "jsonrpc": "2.0",
+        "method": "blob.Submit",
+        "params": ((blob,), {"gas_price": 0.002}),
+        "id": "1",
+    }
+    encoded = codec.dumps(request)
+    assert isinstance(encoded, str)
+    assert json.loads(encoded) == json.loads(StdlibCodec().dumps(request))
+    assert json.loads(encoded)["params"][0][0]["data"] == str(Base64(b"0123456789"))
+
+    frame = '{"jsonrpc": "2.0", "id": "1", "result": {"height": 10}}'
+    assert codec.loads(frame) == codec.loads(frame.encode()) == json.loads(frame)
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_codec_encodes_buffers(codec):
+    data = bytearray(b"0123456789")
+    buffers = (data, memoryview(data), array.array("H", bytes(data)))
+    for buffer in buffers:
+        blob = Blob(Namespace(b"abc"), buffer, commitment=b"\x01" * 32)
+        assert blob.data_size == len(data)
+        encoded = json.loads(codec.dumps({"params": (blob,)}))
+        assert encoded["params"][0]["data"] == str(Base64(data))
+        assert isinstance(blob.data, Base64) and blob.data == bytes(data)
+    # Not copied until the data is read
+    assert Blob(Namespace(b"abc"), data, commitment=b"\x01" * 32)._buffer is data
+    assert Blob(Namespace(b"abc"), memoryview(data), commitment=b"\x01" * 32)._buffer.obj is data
+    blobs = Blob.create_many([(b"abc", data), (b"abc", memoryview(data))])
+    assert blobs[0]._buffer is data and blobs[1]._buffer.obj is data
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_codec_encodes_lazy_blob(codec):
+    blob = LazyBlob(
+        str(Namespace(b"abc")), str(Base64(b"0123456789")), str(Base64(b"\x01" * 32)), 0, 1
+    )
+    encoded = json.loads(codec.dumps({"params": (blob,)}))
+    assert encoded == json.loads(StdlibCodec().dumps({"params": (blob,)}))
+    assert encoded["params"][0]["data"] == str(Base64(b"0123456789"))
+    assert encoded["params"][0]["namespace"] == str(Namespace(b"abc"))
+
+
+def test_get_codec():
+    assert get_codec("json").name == "json"
+    codec = StdlibCodec()
+    assert get_codec(codec) is codec
+    assert get_codec().name in CODECS
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_streamed_message_encodes_mapped_data(codec, tmp_path):
+    data = bytes(range(256)) * 1000
+    (tmp_path / "blob").write_bytes(data)
+    blob = Blob.from_file(tmp_path / "blob", b"abc")
+    request = {"jsonrpc": "2.0", "method": "blob.Submit", "params": ((blob,), {}), "id": "1"}
+
+    message = StreamedMessage(codec, request, chunk_size=3 * 1024)
+    fragments = list(message)
+    assert len(fragments) > 80
+    assert len(message) == len(str(message))
+    assert json.loads(str(message)) == json.loads(StdlibCodec().dumps(request))
+    assert json.loads(str(message))["params"][0][0]["data"] == str(Base64(data))
+    assert StreamedMessage.encode(codec, {"params": ("",)}) == codec.dumps({"params": ("",)})
@@ -0,0 +1,129 @@
+"""
+Tests for the HTTP keep-alive transport against a local asyncio HTTP server.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from pylestia.node_api.rpc.executor import RPC, _is_transport_error
+from pylestia.node_api.rpc.http import HttpTransport
+
+
+async def _start_server(
+    status: int = 200, chunked: bool = False, drop_after: int = 0, until_close: bool = False
+):
+    connections = []
+    requests = []
+
+    async def handler(reader, writer):
+        connections.append(writer)
+        served = 0
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = next(
+                    int(line.split(b":")[1])
+                    for line in head.split(b"\r\n")
+                    if line.lower().startswith(b"content-length")
+                )
+                request = json.loads(await reader.readexactly(length))
+                requests.append(request["method"])
+                if drop_after and served == drop_after:
+                    # Closes a kept-alive connection as a request arrives
+                    writer.close()
+                    return
+                served += 1
+                body = json.dumps(
+                    {"jsonrpc": "2.0", "id": request["id"], "result": request["params"]}
+                ).encode()
+                if chunked:
+                    middle = len(body) // 2
+                    payload = b"".join(
+                        b"%x\r\n%s\r\n" % (len(part), part)
+                        for part in (body[:middle], body[middle:])
+                    )
+                    writer.write(
+                        b"HTTP/1.1 %d OK\r\nTransfer-Encoding: chunked\r\n\r\n" % status
+                        + payload
+                        + b"0\r\n\r\n"
+                    )
+                elif until_close:
+                    # The end of the connection marks the end of the body
+                    writer.write(b"HTTP/1.1 %d OK\r\n\r\n" % status + body)
+                    await writer.drain()
+                    writer.close()
+                    return
+                else:
+                    writer.write(
+                        b"HTTP/1.1 %d OK\r\nContent-Length: %d\r\n\r\n" % (status, len(body)) + body
+                    )
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/", connections, requests
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+async def test_http_transport_reuses_connections(chunked):
+    server, url, connections, _ = await _start_server(chunked=chunked)
+    async with server:
+        transport = HttpTransport(url, pool_size=2)
+        rpc = RPC(transport)
+        for height in range(5):
+            assert await rpc.call("header.GetByHeight", (height,)) == [height]
+        assert len(connections) == 1
+
+        results = await asyncio.gather(*(rpc.call("share.GetEDS", (i,)) for i in range(10)))
+        assert results == [[i] for i in range(10)]
+        assert len(connections) <= 2
+        await transport.close()
+
+
+async def test_http_transport_reads_body_until_close():
+    server, url, connections, _ = await _start_server(until_close=True)
+    async with server:
+        transport = HttpTransport(url)
+        rpc = RPC(transport)
+        for height in range(3):
+            assert await rpc.call("header.GetByHeight", (height,)) == [height]
+        assert len(connections) == 3
+        await transport.close()
+
+
+async def test_http_transport_status_error():
+    server, url, _, _ = await _start_server(status=401)
+    async with server:
+        transport = HttpTransport(url)
+        rpc = RPC(transport)
+        with pytest.raises(ConnectionError):
+            await rpc.call("state.Balance")
+        await transport.close()
+
+
+async def test_http_transport_unreachable_node():
+    transport = HttpTransport("http://127.0.0.1:1/")
+    rpc = RPC(transport)
+    with pytest.raises(ConnectionError) as info:
+        await rpc.call("header.GetByHeight", (1,))
+    assert _is_transport_error(info.value)
+    await transport.close()
+
+
+async def test_http_transport_resends_only_reads_on_dropped_connection():
+    server, url, connections, requests = await _start_server(drop_after=1)
+    async with server:
+        transport = HttpTransport(url, pool_size=1)
+        rpc = RPC(transport)
+        assert await rpc.call("header.GetByHeight", (1,)) == [1]
+        assert await rpc.call("header.GetByHeight", (2,)) == [2]
+        assert len(connections) == 2
+
+        with pytest.raises(ConnectionError):
+            await rpc.call("blob.Submit", ([], {}))
+        assert requests.count("blob.Submit") == 1
+        await transport.close()
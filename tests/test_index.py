@@ -0,0 +1,57 @@
+"""
+Tests for the persistent namespace to heights index.
+"""
+
+import asyncio
+
+from pylestia.node_api import Client
+from pylestia.node_api.index import BlobIndex
+from pylestia.testing import DEFAULT_NAMESPACE, StandInNode
+from pylestia.types import Blob
+
+
+async def _submit(node, api, data):
+    # The stand-in includes submissions in the next block it produces
+    calls = node.calls["blob.Submit"]
+    task = asyncio.create_task(api.blob.submit(Blob(b"abc", data)))
+    while node.calls["blob.Submit"] == calls:
+        await asyncio.sleep(0.01)
+    node.produce_block()
+    return await task
+
+
+async def test_backfill_and_follow(tmp_path):
+    async with StandInNode(block_time=None, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            for height in range(2, 31):
+                if height % 10 == 0:
+                    await _submit(node, api, b"x" * height)
+                else:
+                    node.produce_block()
+
+            index = BlobIndex(api.blob, tmp_path / "index.sqlite3", [b"abc", DEFAULT_NAMESPACE])
+            assert await index.backfill(1, 21, concurrency=4) == 20
+            assert await index.backfill(1, 31) == 10
+            assert await index.missing(b"abc", 1, 40) == [(31, 40)]
+            heights = await index.heights(b"abc", 1, 31)
+            assert heights == [10, 20, 30]
+            entries = await index.entries(b"abc", 1, 31)
+            assert [entry.size for entry in entries] == [10, 20, 30]
+
+            calls = node.calls["blob.GetAll"]
+            found = [item async for item in index.iter_blobs(b"abc", 1, 31)]
+            assert [height for height, _ in found] == heights
+            assert node.calls["blob.GetAll"] == calls + 3
+
+            following = asyncio.create_task(index.follow())
+            await asyncio.sleep(0.1)
+            await _submit(node, api, b"new")
+            while await index.missing(b"abc", node.height, node.height + 1):
+                await asyncio.sleep(0.01)
+            following.cancel()
+            assert (await index.entries(b"abc", node.height, node.height + 1))[0].size == 3
+            await index.close()
+
+    reopened = BlobIndex(None, tmp_path / "index.sqlite3", [b"abc"])
+    assert len(await reopened.heights(b"abc", 1, 100)) == 4
+    await reopened.close()
@@ -0,0 +1,67 @@
+"""
+Tests for the adaptive concurrency limiter.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from pylestia.node_api.rpc.executor import RPC
+from pylestia.node_api.rpc.limiter import AdaptiveLimiter
+
+from .test_rpc import FakeTransport
+
+
+async def test_calls_beyond_limit_wait():
+    transport = FakeTransport()
+    limiter = AdaptiveLimiter(initial_limit=2)
+    rpc = RPC(transport, limiter=limiter)
+    tasks = [asyncio.create_task(rpc.call("header.GetByHeight", (i,))) for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert len(transport.sent) == 2
+    assert limiter.in_flight == 2 and limiter.waiting == 3
+
+    while not all(task.done() for task in tasks):
+        for request in transport.sent:
+            if request["id"] in rpc._pending:
+                transport.respond(request, request["params"][0])
+        await asyncio.sleep(0)
+    assert [task.result() for task in tasks] == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+async def test_fast_calls_grow_limit():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    for _ in range(20):
+        start = await limiter.acquire()
+        limiter.release("header.LocalHead", start, False)
+    assert limiter.limit > 4
+
+
+async def test_timeouts_shrink_limit_once_per_round():
+    transport = FakeTransport()
+    limiter = AdaptiveLimiter(initial_limit=10)
+    rpc = RPC(transport, limiter=limiter)
+    calls = [rpc.call("share.GetEDS", (i,), timeout=0.01) for i in range(10)]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+    assert limiter.limit == pytest.approx(9)
+
+    start = time.perf_counter()
+    limiter.in_flight += 1
+    limiter.release("share.GetEDS", start, True)
+    assert limiter.limit == pytest.approx(8.1)
+
+
+async def test_cancelled_waiter_frees_slot():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    start = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release("header.LocalHead", start, None)
+    assert limiter.in_flight == 0
+    await asyncio.wait_for(limiter.acquire(), 1)
@@ -0,0 +1,80 @@
+"""
+Tests for the per-method RPC metrics.
+"""
+
+import asyncio
+
+import pytest
+from websockets.exceptions import ConnectionClosedError
+
+from pylestia.node_api.rpc.executor import RPC
+from pylestia.node_api.rpc.metrics import PrometheusCollector, RPCMetrics, classify_error
+
+from .test_rpc import FakeTransport, _next_request
+
+
+async def test_call_metrics():
+    transport = FakeTransport()
+    metrics = RPCMetrics()
+    rpc = RPC(transport, metrics=metrics)
+
+    task = asyncio.create_task(rpc.call("header.GetByHeight", (1,), lambda r: r["height"]))
+    request = await _next_request(transport)
+    assert metrics["header.GetByHeight"].in_flight == 1
+    transport.respond(request, {"height": 1})
+    assert await task == 1
+
+    task = asyncio.create_task(rpc.call("blob.Submit", ([],)))
+    request = await _next_request(transport, 1)
+    transport.respond(request, error={"code": 1, "message": "not enough funds"})
+    with pytest.raises(ConnectionError):
+        await task
+
+    snapshot = metrics.snapshot()
+    header = snapshot["header.GetByHeight"]
+    assert header["calls"] == 1 and header["in_flight"] == 0
+    assert header["latency"]["count"] == 1 and header["deserialize"]["count"] == 1
+    assert header["request_bytes"] > 0 and header["response_bytes"] > 0
+    assert snapshot["blob.Submit"]["errors"] == {"NotEnoughFunds": 1}
+
+
+async def test_subscription_metrics():
+    transport = FakeTransport()
+    metrics = RPCMetrics()
+    rpc = RPC(transport, metrics=metrics)
+
+    subscription = rpc.subscribe("header.Subscribe")
+    task = asyncio.create_task(subscription.__anext__())
+    transport.respond(await _next_request(transport), "sub-1")
+    while not rpc._subscriptions:
+        await asyncio.sleep(0)
+    assert metrics["header.Subscribe"].subscriptions == 1
+    transport.notify("sub-1", {"height": 5})
+    assert await task == {"height": 5}
+    await subscription.aclose()
+    assert metrics["header.Subscribe"].subscriptions == 0
+    assert metrics["header.Subscribe"].notifications == 1
+
+
+def test_classify_error():
+    assert classify_error(asyncio.TimeoutError()) == "timeout"
+    assert classify_error(ValueError("invalid range")) == "value_error"
+    assert classify_error(ConnectionError("RPC failed; transport closed")) == "transport_error"
+    assert classify_error(ConnectionError("RPC failed; boom", object())) == "rpc_error"
+    assert classify_error(ValueError("invalid namespace length")) == "InvalidNamespaceLen"
+    error = ConnectionError("RPC failed; mempool is full", object())
+    assert classify_error(error) == "MempoolFull"
+    assert classify_error(ConnectionRefusedError(111, "refused")) == "transport_error"
+    assert classify_error(ConnectionClosedError(None, None)) == "transport_error"
+    assert classify_error(RuntimeError("boom")) == "error"
+
+
+def test_prometheus_collector():
+    pytest.importorskip("prometheus_client")
+    metrics = RPCMetrics()
+    metrics.finished("share.GetEDS", metrics.started("share.GetEDS", 100))
+    families = {family.name: family for family in PrometheusCollector(metrics).collect()}
+    assert families["pylestia_rpc_calls"].samples[0].value == 1
+    samples = families["pylestia_rpc_latency_seconds"].samples
+    buckets = [sample for sample in samples if sample.name.endswith("_bucket")]
+    assert buckets[-1].labels["le"] == "+Inf" and buckets[-1].value == 1
@@ -32,7 +32,7 @@ async def test_blob():
         blob["namespace"]
         == b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00Alesh"
     )
-    assert blob["data"] == b"0123456789ABCDEF"
+    assert "data" not in blob
     assert blob["index"] is None
     assert blob["share_version"] == 0
     # In v0.11.0, commitment is still bytes but extracted differently
@@ -42,3 +42,12 @@ async def test_blob():
         blob["commitment"]
         == b"\x88e\rh\xc1\x02\xbd\xfc\xbcc\xa3\xcc\x10\n5\xdf\xcbCh\xa3m\x04\xe1\xeds(\xdf}j>\xab/"
     )
+
+
+@pytest.mark.asyncio
+async def test_blob_from_buffer():
+    data = b"0123456789ABCDEF"
+    expected = types.normalize_blob(b"Alesh", data)
+    for buffer in (bytearray(data), memoryview(data)):
+        assert types.normalize_blob(memoryview(b"Alesh"), buffer) == expected
+    assert types.normalize_namespace(bytearray(b"Alesh")) == Namespace(b"Alesh")
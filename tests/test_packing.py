@@ -0,0 +1,43 @@
+"""
+Tests for packing payloads into blobs and reading them back.
+"""
+
+import pytest
+
+from pylestia.node_api import Client
+from pylestia.testing import StandInNode
+from pylestia.types.packing import Manifest, blob_capacity, pack
+
+
+def test_pack_splits_and_coalesces():
+    payloads = [b"a" * 10, b"b" * 250, b"", b"c" * 5, b"d" * 3]
+    sizes, transactions = pack(payloads, max_blob_size=100, max_tx_size=200)
+    assert sizes == [10, 250, 0, 5, 3]
+    assert [[len(data) for data in datas] for datas in transactions] == [[100, 100], [68]]
+    assert b"".join(b"".join(datas) for datas in transactions) == b"".join(payloads)
+
+    blobs = [data for datas in transactions for data in datas]
+    manifest = Manifest(sizes, [(7, bytes(32), len(data)) for data in blobs])
+    assert Manifest.from_bytes(manifest.to_bytes()) == manifest
+    assert manifest.unpack(dict(enumerate(blobs))) == payloads
+    assert manifest.spans([1]) == [0, 1, 2]
+    assert manifest.spans([3, 2, 0]) == [0, 2]
+    assert manifest.unpack({2: blobs[2]}, [4, 3]) == [b"d" * 3, b"c" * 5]
+    assert blob_capacity(1) == 478 and blob_capacity(2) == 960
+    with pytest.raises(ValueError):
+        Manifest.from_bytes(b'{"format": "other"}')
+
+
+async def test_packed_payloads_round_trip():
+    payloads = [bytes([index]) * size for index, size in enumerate((5, 3000, 12, 0, 700))]
+    async with StandInNode(block_time=0.05, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            result = await api.blob.submit_packed(
+                b"abc", payloads, max_blob_size=1000, max_tx_size=2000
+            )
+            assert result.transactions == 3
+            assert len(result.manifest.blobs) == 4
+            assert await api.blob.get_packed(result.height, b"abc", result.commitment) == payloads
+            assert await api.blob.get_packed(
+                result.height, b"abc", result.commitment, indexes=[4, 0]
+            ) == [payloads[4], payloads[0]]
@@ -14,7 +14,6 @@ sys.modules["pylestia.pylestia_core.types"] = type(
         "normalize_namespace": lambda x: x,
         "normalize_blob": lambda *args: {
             "namespace": args[0],
-            "data": args[1],
             "commitment": b"mockedcommitment",
             "share_version": 1 if len(args) > 2 and args[2] else 0,
             "index": None,
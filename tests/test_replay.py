@@ -0,0 +1,56 @@
+"""
+Tests for recording and replaying node traffic.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from pylestia.node_api import Client
+from pylestia.node_api.header import HeaderClient
+from pylestia.node_api.rpc import Recorder, ReplayTransport
+from pylestia.node_api.rpc.executor import RPC
+from pylestia.testing import StandInNode
+
+
+async def _record(path) -> list:
+    async with StandInNode(block_time=0.05, latency=0.02) as node:
+        async with Client(node.url, record=path).connect() as api:
+            heads = [await api.header.get_by_height(1), await api.header.network_head()]
+            subscription = api.header.subscribe()
+            heads.extend([await anext(subscription), await anext(subscription)])
+            await subscription.aclose()
+            return heads
+
+
+async def test_replay_answers_recorded_calls(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    recorded = await _record(path)
+
+    rpc = RPC(ReplayTransport(path, speed=None))
+    api = HeaderClient(rpc)
+    start = time.perf_counter()
+    assert await api.get_by_height(1) == recorded[0]
+    assert await asyncio.gather(api.network_head(), api.network_head()) == [recorded[1]] * 2
+    subscription = api.subscribe()
+    assert [await anext(subscription), await anext(subscription)] == recorded[2:]
+    await subscription.aclose()
+    assert time.perf_counter() - start < 0.02
+
+    with pytest.raises(ConnectionError, match="no recorded response"):
+        await api.get_by_height(7)
+    assert rpc.transport.unmatched["header.GetByHeight"] == 1
+
+
+async def test_replay_keeps_recorded_timing():
+    recorder = Recorder()
+    async with StandInNode(block_time=None, latency=0.1) as node:
+        async with Client(node.url, record=recorder).connect() as api:
+            await api.header.local_head()
+    assert [record["direction"] for record in recorder.records] == ["send", "receive"]
+
+    api = HeaderClient(RPC(ReplayTransport(recorder.records)))
+    start = time.perf_counter()
+    await api.local_head()
+    assert 0.08 < time.perf_counter() - start < 0.5
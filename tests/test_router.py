@@ -0,0 +1,121 @@
+"""
+Tests for latency-aware routing and hedged reads across several endpoints.
+"""
+
+import asyncio
+
+import pytest
+from websockets.exceptions import ConnectionClosedOK
+
+from pylestia.node_api.rpc.abc import RPCExecutor
+from pylestia.node_api.rpc.router import MultiEndpointClient
+
+
+class FakeEndpoint(RPCExecutor):
+    def __init__(self, name: str, delay: float, error: Exception | None = None):
+        self.base_url = name
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    async def connect(self, auth_token=None):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def call(self, method, params=None, deserializer=None, *, timeout=None):
+        self.calls.append(method)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        result = self.base_url
+        return deserializer(result) if deserializer else result
+
+    async def subscribe(self, method, params=None, deserializer=None):
+        yield self.base_url
+
+    def batch(self, max_size=100):
+        return self
+
+
+async def test_reads_prefer_fast_endpoint():
+    slow, fast = FakeEndpoint("slow", 0.05), FakeEndpoint("fast", 0.001)
+    client = MultiEndpointClient([slow, fast], hedge=False)
+    for _ in range(6):
+        await client.call("header.GetByHeight", (1,))
+    assert len(fast.calls) > len(slow.calls)
+    assert client._ranked()[0] is fast
+
+
+async def test_hedged_read_uses_second_endpoint():
+    stuck, fast = FakeEndpoint("stuck", 10), FakeEndpoint("fast", 0.001)
+    client = MultiEndpointClient([stuck, fast], hedge_delay=0.01)
+    client.stats[id(fast)].observe(1.0)  # rank the stuck endpoint first
+    assert await asyncio.wait_for(client.call("share.GetEDS", (1,)), 1) == "fast"
+    assert stuck.calls and fast.calls
+
+
+async def test_transport_error_falls_back():
+    broken = FakeEndpoint("broken", 0, ConnectionError("RPC failed; transport closed"))
+    healthy = FakeEndpoint("healthy", 0.001)
+    client = MultiEndpointClient([broken, healthy])
+    assert await client.call("blob.GetAll", (1, ())) == "healthy"
+    assert client.stats[id(broken)].errors == 1
+
+
+async def test_writes_and_subscriptions_use_primary():
+    primary, secondary = FakeEndpoint("primary", 0.01), FakeEndpoint("secondary", 0)
+    client = MultiEndpointClient([primary, secondary])
+    assert await client.call("blob.Submit", ((), {})) == "primary"
+    assert [item async for item in client.subscribe("header.Subscribe")] == ["primary"]
+    client.stats[id(primary)].observe(1.0)  # rank the secondary endpoint first
+    assert client.batch() is primary
+    assert not secondary.calls
+
+
+async def test_application_errors_are_not_hedged():
+    failing = FakeEndpoint("failing", 0, ValueError("given height is from the future"))
+    other = FakeEndpoint("other", 0)
+    client = MultiEndpointClient([failing, other])
+    with pytest.raises(ValueError):
+        await client.call("header.GetByHeight", (10**9,))
+    assert not other.calls
+
+
+async def test_dead_endpoint_is_left_out():
+    dead = FakeEndpoint("dead", 0, ConnectionClosedOK(None, None))
+    live = FakeEndpoint("live", 0.001)
+    client = MultiEndpointClient([live, dead], hedge=False)
+    client.stats[id(live)].observe(1.0)  # rank the dead endpoint first
+    for _ in range(20):
+        assert await client.call("header.GetByHeight", (1,)) == "live"
+    assert len(dead.calls) == 1
+    assert client._ranked() == [live]
+
+
+async def test_long_polls_are_not_hedged():
+    slow, other = FakeEndpoint("slow", 0.05), FakeEndpoint("other", 0)
+    client = MultiEndpointClient([slow, other], hedge_delay=0.01)
+    client.stats[id(other)].observe(1.0)
+    assert await client.call("header.WaitForHeight", (5,)) == "slow"
+    assert not other.calls
+    with pytest.raises(asyncio.TimeoutError):
+        await client.call("header.WaitForHeight", (5,), timeout=0.01)
+
+
+async def test_failed_connect_disconnects_the_others():
+    class Failing(FakeEndpoint):
+        async def connect(self, auth_token=None):
+            raise ConnectionRefusedError("primary down")
+
+    class Tracked(FakeEndpoint):
+        disconnected = False
+
+        async def disconnect(self):
+            self.disconnected = True
+
+    primary, secondary = Failing("primary", 0), Tracked("secondary", 0)
+    with pytest.raises(ConnectionRefusedError):
+        await MultiEndpointClient([primary, secondary]).connect()
+    assert secondary.disconnected
@@ -0,0 +1,313 @@
+"""
+Tests for the RPC executor that run against an in-memory transport.
+
+These tests exercise request/response matching and subscription delivery
+without requiring a running Celestia node.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from pylestia.node_api.rpc import JsonRpcClient
+from pylestia.node_api.rpc.abc import Transport
+from pylestia.node_api.rpc.executor import RPC
+from pylestia.node_api.rpc.singleflight import SingleFlight
+
+
+class FakeTransport(Transport):
+    """Transport that records outgoing frames and lets tests push incoming ones."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    def respond(self, request: dict, result=None, error=None) -> None:
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if error is not None:
+            response["error"] = error
+        else:
+            response["result"] = result
+        self.on_message(json.dumps(response))
+
+    def notify(self, subscription_id: str, item) -> None:
+        frame = {"jsonrpc": "2.0", "method": "sub", "params": [subscription_id, item]}
+        self.on_message(json.dumps(frame))
+
+
+async def _next_request(transport: FakeTransport, index: int = 0) -> dict:
+    while len(transport.sent) <= index:
+        await asyncio.sleep(0)
+    return transport.sent[index]
+
+
+async def test_call_resolves_result():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    task = asyncio.create_task(rpc.call("header.LocalHead", (), lambda r: r["height"]))
+    request = await _next_request(transport)
+    assert request["method"] == "header.LocalHead"
+    transport.respond(request, {"height": 42})
+    assert await task == 42
+    assert not rpc._pending
+
+
+async def test_call_value_error():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    task = asyncio.create_task(rpc.call("header.GetByHeight", (0,)))
+    request = await _next_request(transport)
+    transport.respond(request, error={"code": 1, "message": "height must be bigger than zero"})
+    with pytest.raises(ValueError):
+        await task
+
+
+async def test_subscription_delivers_without_polling():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    received = []
+
+    async def consumer():
+        async for item in rpc.subscribe("blob.Subscribe", ()):
+            received.append(item)
+
+    task = asyncio.create_task(consumer())
+    transport.respond(await _next_request(transport), "sub-1")
+    while "sub-1" not in rpc._subscriptions:
+        await asyncio.sleep(0)
+
+    transport.notify("sub-1", {"height": 1})
+    # The consumer is woken on arrival; a handful of loop iterations is enough.
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert received == [{"height": 1}]
+
+    rpc.on_transport_close(None)
+    await asyncio.wait_for(task, 1)
+    assert not rpc._subscriptions
+
+
+async def test_subscription_raises_transport_error():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+
+    async def consumer():
+        async for _ in rpc.subscribe("header.Subscribe", ()):
+            pass
+
+    task = asyncio.create_task(consumer())
+    transport.respond(await _next_request(transport), "sub-1")
+    while "sub-1" not in rpc._subscriptions:
+        await asyncio.sleep(0)
+
+    rpc.on_transport_close(OSError("connection reset"))
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(task, 1)
+
+
+async def test_subscription_ends_when_node_closes_channel():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+
+    async def consumer():
+        return [item async for item in rpc.subscribe("blob.Subscribe", ())]
+
+    task = asyncio.create_task(consumer())
+    transport.respond(await _next_request(transport), "sub-1")
+    while "sub-1" not in rpc._subscriptions:
+        await asyncio.sleep(0)
+
+    transport.notify("sub-1", {"height": 1})
+    frame = {"jsonrpc": "2.0", "method": "xrpc.ch.close", "params": ["sub-1"]}
+    transport.on_message(json.dumps(frame))
+    assert await asyncio.wait_for(task, 1) == [{"height": 1}]
+    assert not rpc._subscriptions
+
+
+async def test_batch_sends_single_frame():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    batch = rpc.batch()
+    task = asyncio.gather(
+        batch.call("header.GetByHeight", (1,)),
+        batch.call("header.GetByHeight", (2,), lambda r: r * 10),
+    )
+    frame = await _next_request(transport)
+    assert isinstance(frame, list) and len(frame) == 2
+    assert [request["params"] for request in frame] == [[1], [2]]
+
+    responses = [{"jsonrpc": "2.0", "id": request["id"], "result": 7} for request in frame]
+    transport.on_message(json.dumps(responses[::-1]))
+    assert await task == [7, 70]
+    assert not rpc._pending
+    transport.on_message("[]")
+
+
+async def test_batch_respects_max_size():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    batch = rpc.batch(max_size=2)
+    futures = [batch.queue("share.GetShare", (1, 0, i)) for i in range(3)]
+    await batch.flush()
+    await _next_request(transport, 1)
+    assert [len(frame) if isinstance(frame, list) else 1 for frame in transport.sent] == [2, 1]
+    for future in futures:
+        future.cancel()
+
+
+async def test_batch_drops_calls_cancelled_while_queued():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    batch = rpc.batch()
+    futures = [batch.queue("share.GetShare", (1, 0, i)) for i in range(3)]
+    futures[1].cancel()
+    await batch.flush()
+    frame = await _next_request(transport)
+    assert [request["params"] for request in frame] == [[1, 0, 0], [1, 0, 2]]
+    assert len(rpc._pending) == 2
+    for future in futures:
+        future.cancel()
+
+
+async def test_pool_routes_to_least_pending():
+    client = JsonRpcClient("localhost:26658", pool_size=2)
+    transports = [FakeTransport(), FakeTransport()]
+    client.rpcs = [RPC(transport) for transport in transports]
+
+    first = asyncio.create_task(client.call("share.GetEDS", (1,)))
+    await _next_request(transports[0])
+    assert client.pending_counts() == [1, 0]
+
+    second = asyncio.create_task(client.call("header.LocalHead"))
+    transports[1].respond(await _next_request(transports[1]), "head")
+    assert await second == "head"
+
+    transports[0].respond(transports[0].sent[0], "eds")
+    assert await first == "eds"
+    assert client.pending_counts() == [0, 0]
+
+
+async def test_resume_replays_idempotent_calls_and_subscriptions():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    received = []
+
+    async def consumer():
+        async for item in rpc.subscribe("blob.Subscribe", ("ns",)):
+            received.append(item)
+
+    subscriber = asyncio.create_task(consumer())
+    transport.respond(await _next_request(transport), "sub-1")
+    read = asyncio.create_task(rpc.call("header.GetByHeight", (5,)))
+    write = asyncio.create_task(rpc.call("blob.Submit", ((), {})))
+    await _next_request(transport, 2)
+
+    rpc.suspend(OSError("connection reset"))
+    with pytest.raises(ConnectionError):
+        await write
+
+    new_transport = FakeTransport()
+    await rpc.resume(new_transport)
+    methods = [request["method"] for request in new_transport.sent]
+    assert methods == ["header.GetByHeight", "blob.Subscribe"]
+
+    new_transport.respond(new_transport.sent[0], {"height": 5})
+    assert await read == {"height": 5}
+
+    new_transport.respond(new_transport.sent[1], "sub-2")
+    new_transport.notify("sub-2", {"height": 6})
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert received == [{"height": 6}]
+
+    rpc.on_transport_close(None)
+    await asyncio.wait_for(subscriber, 1)
+
+
+async def test_timeout_removes_pending_and_cancels_on_node():
+    transport = FakeTransport()
+    rpc = RPC(transport, method_timeouts={"header.LocalHead": 0.01})
+    with pytest.raises(asyncio.TimeoutError):
+        await rpc.call("header.LocalHead")
+    assert not rpc._pending
+    assert rpc.timeouts["header.LocalHead"] == 1
+
+    cancel = await _next_request(transport, 1)
+    assert cancel["method"] == "xrpc.cancel"
+    assert cancel["params"] == [transport.sent[0]["id"]]
+
+
+async def test_per_call_timeout_and_cancellation():
+    transport = FakeTransport()
+    rpc = RPC(transport)
+    with pytest.raises(asyncio.TimeoutError):
+        await rpc.call("share.GetEDS", (1,), timeout=0.01)
+
+    task = asyncio.create_task(rpc.call("blob.GetAll", (1, ())))
+    await _next_request(transport, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not rpc._pending
+    assert rpc.cancellations["blob.GetAll"] == 1
+
+
+def test_method_deadlines():
+    rpc = RPC(FakeTransport(), timeout=100, method_timeouts={"blob.Submit": lambda size: size})
+    assert rpc.deadline("header.LocalHead") == 10
+    assert rpc.deadline("blob.Submit", 500) == 500
+    assert rpc.deadline("header.WaitForHeight") == 100
+    assert rpc.deadline("header.LocalHead", timeout=1) == 1
+
+
+def _heights(result):
+    return [header["height"] for header in result]
+
+
+async def test_identical_calls_share_request():
+    transport = FakeTransport()
+    rpc = RPC(transport, flights=SingleFlight())
+    tasks = [
+        asyncio.create_task(rpc.call("header.GetRangeByHeight", (1, 3), _heights)) for _ in range(3)
+    ]
+    other = asyncio.create_task(rpc.call("header.GetRangeByHeight", (1, 4), _heights))
+    request = await _next_request(transport, 1)
+    assert len(transport.sent) == 2
+    transport.respond(transport.sent[0], [{"height": 2}, {"height": 3}])
+    transport.respond(request, [{"height": 2}, {"height": 3}, {"height": 4}])
+
+    results = await asyncio.gather(*tasks)
+    assert results == [[2, 3]] * 3
+    assert results[0] is not results[1]
+    assert await other == [2, 3, 4]
+    assert rpc.flights.hits["header.GetRangeByHeight"] == 2
+    assert not len(rpc.flights)
+
+
+async def test_coalesced_call_cancelled_with_last_caller():
+    transport = FakeTransport()
+    rpc = RPC(transport, flights=SingleFlight())
+    first = asyncio.create_task(rpc.call("blob.GetAll", (1, ())))
+    second = asyncio.create_task(rpc.call("blob.GetAll", (1, ())))
+    request = await _next_request(transport)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert request["id"] in rpc._pending
+    transport.respond(request, [])
+    assert await second == []
+
+    third = asyncio.create_task(rpc.call("blob.GetAll", (1, ())))
+    await _next_request(transport, 1)
+    third.cancel()
+    # Does not join the call being cancelled
+    fourth = asyncio.create_task(rpc.call("blob.GetAll", (1, ())))
+    await _next_request(transport, 3)
+    requests = {request["method"]: request for request in transport.sent[2:]}
+    assert set(requests) == {"xrpc.cancel", "blob.GetAll"}
+    transport.respond(requests["blob.GetAll"], [])
+    assert await fourth == []
+    assert not rpc._pending
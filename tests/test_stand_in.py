@@ -0,0 +1,210 @@
+"""
+Tests for the stand-in node server.
+"""
+
+import asyncio
+
+import pytest
+
+from pylestia.node_api import Client
+from pylestia.testing import DEFAULT_NAMESPACE, StandInNode
+from pylestia.types import Blob, Commitment
+from pylestia.types.blob import CommitmentProof
+from pylestia.types.share import SampleCoords
+
+
+async def test_payloads_deserialize_and_agree():
+    async with StandInNode(block_time=None, blob_size=2000, blobs_per_block=2) as node:
+        node.produce_block()
+        async with Client(node.url).connect() as api:
+            head = await api.header.network_head()
+            assert head.header.height == "2"
+            assert (await api.header.get_by_hash(head.commit.block_id.hash)) == head
+            first = await api.header.get_by_height(1)
+            assert len(await api.header.get_range_by_height(first, 3)) == 1
+
+            blobs = await api.blob.get_all(2, DEFAULT_NAMESPACE)
+            assert [len(blob.data) for blob in blobs] == [2000, 2000]
+            proof = await api.blob.get_proof(
+                2, DEFAULT_NAMESPACE, blobs[1].commitment, deserializer=CommitmentProof.deserializer
+            )
+            assert proof.row_proof.row_roots
+            assert await api.blob.included(2, DEFAULT_NAMESPACE, proof, blobs[1].commitment)
+
+            eds = await api.share.get_eds(2)
+            data = await api.share.get_namespace_data(2, DEFAULT_NAMESPACE)
+            shares = await api.share.get_range(2, 1, 2)
+            samples = await api.share.get_samples(head, [SampleCoords(row=0, col=1)])
+            share = await api.share.get_share(2, 0, 1)
+            assert share == samples[0] == shares.proof.data[0] == eds.data_square[1]
+            assert share == data[0].shares[0]
+
+            assert (await api.das.sampling_stats()).network_head_height == 2
+            assert (await api.state.balance()).amount == node.balance
+            assert await api.p2p.peers() == node.peers
+
+
+async def test_submitted_blobs_are_included_and_pushed():
+    async with StandInNode(block_time=0.05, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            headers = api.header.subscribe()
+            blobs = api.blob.subscribe(b"abc")
+            await anext(headers)
+            await anext(blobs)
+
+            result = await api.blob.submit(Blob(b"abc", b"0123456789"))
+            blob = await api.blob.get(result.height, b"abc", result.commitments[0])
+            assert blob.data == b"0123456789"
+            while (item := await anext(blobs)).height < result.height:
+                pass
+            assert item.blobs[0]["data"] == str(blob.data)
+            await headers.aclose()
+            await blobs.aclose()
+
+
+async def test_blob_from_file_is_streamed(tmp_path):
+    (tmp_path / "blob").write_bytes(b"0123456789" * 100_000)
+    blob = Blob.from_file(tmp_path / "blob", b"abc")
+    async with StandInNode(block_time=0.05, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            result = await api.blob.submit(blob)
+            assert result.commitments[0] == blob.commitment
+            stored = await api.blob.get(result.height, b"abc", blob.commitment)
+            assert stored.data == blob.data[:]
+
+
+async def test_injected_errors_and_latency():
+    async with StandInNode(block_time=None, latency={"header.NetworkHead": 0.2}) as node:
+        node.fail("header.LocalHead", "header: store is closed")
+        async with Client(node.url).connect() as api:
+            with pytest.raises(ConnectionError, match="store is closed"):
+                await api.header.local_head()
+            assert (await api.header.local_head()).header.height == "1"
+            assert await api.blob.get(1, b"abc", Commitment(b"x" * 32)) is None
+
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(api.header.network_head(), 0.05)
+            assert node.calls["header.NetworkHead"] == 1
+
+
+async def test_calls_with_timeout():
+    async with StandInNode(block_time=None, latency={"header.NetworkHead": 0.2}) as node:
+        client = Client(node.url, coalesce=True)
+        async with client.connect() as api:
+            fast = api.with_timeout(0.05)
+            with pytest.raises(asyncio.TimeoutError):
+                await fast.header.network_head()
+            # Coalesced into one call, each of which times out
+            results = await asyncio.gather(
+                *(fast.header.network_head() for _ in range(3)), return_exceptions=True
+            )
+            assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+            async with fast.batch() as batch:
+                with pytest.raises(asyncio.TimeoutError):
+                    await batch.header.network_head()
+            assert (await api.header.network_head()).header.height == "1"
+            assert client.timeout_counts()["header.NetworkHead"] == 5
+            assert node.calls["header.NetworkHead"] == 4
+
+
+async def test_blobs_of_a_range_arrive_in_order():
+    async with StandInNode(block_time=None, blobs_per_block=2, latency=0.01, jitter=0.01) as node:
+        for _ in range(19):
+            node.produce_block()
+        async with Client(node.url).connect() as api:
+            items = [
+                item async for item in api.blob.iter_range(1, 21, DEFAULT_NAMESPACE, concurrency=4)
+            ]
+            assert [height for height, _ in items] == list(range(1, 21))
+            assert items[4][1] == await api.blob.get_all(5, DEFAULT_NAMESPACE)
+
+            heights = api.blob.iter_range(1, 21, DEFAULT_NAMESPACE, concurrency=3)
+            assert (await anext(heights))[0] == 1
+            await heights.aclose()
+
+
+async def _until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+async def test_resumable_subscription_fills_gaps():
+    async with StandInNode(block_time=None, blobs_per_block=1) as node:
+        for _ in range(4):
+            node.produce_block()
+        async with Client(node.url, reconnect=True).connect() as api:
+            received = []
+
+            async def consume():
+                async for result in api.blob.subscribe_resumable(
+                    DEFAULT_NAMESPACE, since=2, retry_delay=0.01
+                ):
+                    received.append(result)
+
+            task = asyncio.create_task(consume())
+            await _until(lambda: node.calls["blob.Subscribe"] == 1)
+            node.produce_block()
+            await _until(lambda: len(received) == 4)
+
+            # Heights produced after the node ends the subscription are fetched
+            node.close_subscriptions()
+            node.produce_block()
+            node.produce_block()
+            await _until(lambda: node.calls["blob.Subscribe"] == 2)
+            node.produce_block()
+            await _until(lambda: received[-1].height == 9)
+
+            # As are those produced while the connection is lost
+            await node.disconnect()
+            node.produce_block()
+            await _until(lambda: node.calls["blob.Subscribe"] == 3)
+            node.produce_block()
+            await _until(lambda: received[-1].height == 11)
+            task.cancel()
+
+            assert [result.height for result in received] == list(range(3, 12))
+            assert list(received[0].blobs) == await api.blob.get_all(3, DEFAULT_NAMESPACE)
+            assert list(received[3].blobs) == await api.blob.get_all(6, DEFAULT_NAMESPACE)
+
+
+async def test_resumable_subscription_refetches_overflow():
+    async with StandInNode(block_time=None, blobs_per_block=1) as node:
+        async with Client(node.url).connect() as api:
+            results = api.blob.subscribe_resumable(DEFAULT_NAMESPACE, max_buffer=2)
+            first = asyncio.ensure_future(anext(results))
+            await _until(lambda: node.calls["blob.Subscribe"] == 1)
+            height = node.produce_block()
+            assert (await first).height == height
+
+            # The consumer falls behind by five heights; three are dropped from the buffer
+            for _ in range(5):
+                node.produce_block()
+            await asyncio.sleep(0.1)
+            calls = node.calls["blob.GetAll"]
+            heights = [(await anext(results)).height for _ in range(5)]
+            assert heights == list(range(height + 1, height + 6))
+            assert node.calls["blob.GetAll"] == calls + 3
+            await results.aclose()
+
+
+async def test_lazy_blobs_match_decoded_blobs():
+    async with StandInNode(block_time=None, blob_size=3000, blobs_per_block=2) as node:
+        async with Client(node.url).connect() as api:
+            blobs = await api.blob.get_all(node.height, DEFAULT_NAMESPACE)
+            lazy = await api.blob.get_all(node.height, DEFAULT_NAMESPACE, lazy=True)
+            assert [blob.data_size for blob in lazy] == [3000, 3000]
+            assert [blob.commitment for blob in lazy] == [blob.commitment for blob in blobs]
+            assert [blob.data for blob in lazy] == [blob.data for blob in blobs]
+
+            commitment = blobs[1].commitment
+            blob = await api.blob.get(node.height, DEFAULT_NAMESPACE, commitment, lazy=True)
+            assert blob.data == blobs[1].data
+
+            results = api.blob.subscribe(DEFAULT_NAMESPACE, lazy=True)
+            item = asyncio.ensure_future(anext(results))
+            await _until(lambda: node.calls["blob.Subscribe"] == 1)
+            height = node.produce_block()
+            item = await item
+            assert item.height == height
+            assert item.blobs == tuple(await api.blob.get_all(height, DEFAULT_NAMESPACE, lazy=True))
+            await results.aclose()
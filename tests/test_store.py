@@ -0,0 +1,111 @@
+"""
+Tests for the persistent store of RPC responses.
+"""
+
+import asyncio
+
+import pytest
+
+from pylestia.node_api import Client
+from pylestia.node_api.rpc.executor import RPC
+from pylestia.node_api.rpc.store import DiskStore
+from pylestia.testing import StandInNode
+
+from .test_rpc import FakeTransport, _next_request
+
+
+async def test_payloads_survive_reopen(tmp_path):
+    store = DiskStore(tmp_path, inline_size=8)
+    await store.put("header.GetByHeight", "[1]", '{"height":1}')
+    await store.put("header.GetByHeight", "[2]", "[]")
+    await store.put("header.GetByHash", '["aa"]', '{"height":1}')
+    await store.close()
+
+    objects = [path for path in (tmp_path / "objects").rglob("*") if path.is_file()]
+    assert len(objects) == 1
+
+    store = DiskStore(tmp_path, inline_size=8)
+    assert await store.get("header.GetByHeight", "[1]") == b'{"height":1}'
+    assert await store.get("header.GetByHeight", "[2]") == b"[]"
+    assert await store.get("header.GetByHeight", "[3]") is None
+    assert await store.size() == 26
+    assert store.hits["header.GetByHeight"] == 2
+    await store.close()
+
+
+async def test_least_recently_read_entries_are_evicted(tmp_path):
+    store = DiskStore(tmp_path, max_bytes=100, inline_size=10)
+    await store.put("share.GetEDS", "[1]", b"a" * 40)
+    await store.put("share.GetEDS", "[2]", b"b" * 40)
+    assert await store.get("share.GetEDS", "[1]") is not None
+    await store.put("share.GetEDS", "[3]", b"c" * 40)
+
+    assert await store.get("share.GetEDS", "[2]") is None
+    assert await store.get("share.GetEDS", "[1]") == b"a" * 40
+    assert await store.size() == 80
+    assert len([path for path in (tmp_path / "objects").rglob("*") if path.is_file()]) == 2
+    await store.close()
+
+
+async def test_warm_start_reads_from_disk(tmp_path):
+    transport = FakeTransport()
+    rpc = RPC(transport, store=DiskStore(tmp_path))
+    task = asyncio.create_task(rpc.call("blob.GetAll", (5, ["ns"])))
+    transport.respond(await _next_request(transport), [{"data": "AA=="}])
+    assert await task == [{"data": "AA=="}]
+    await rpc.store.close()
+
+    transport = FakeTransport()
+    rpc = RPC(transport, store=DiskStore(tmp_path))
+    assert await rpc.call("blob.GetAll", (5, ["ns"])) == [{"data": "AA=="}]
+    assert not transport.sent
+    await rpc.store.close()
+
+
+async def test_store_keys_do_not_depend_on_the_codec(tmp_path):
+    pytest.importorskip("orjson")
+    transport = FakeTransport()
+    rpc = RPC(transport, store=DiskStore(tmp_path), codec="json")
+    task = asyncio.create_task(rpc.call("blob.GetAll", (5, ["ns"])))
+    transport.respond(await _next_request(transport), [{"data": "AA=="}])
+    await task
+    await rpc.store.close()
+
+    transport = FakeTransport()
+    rpc = RPC(transport, store=DiskStore(tmp_path), codec="orjson")
+    result = await asyncio.wait_for(rpc.call("blob.GetAll", (5, ["ns"])), 1)
+    assert result == [{"data": "AA=="}]
+    assert not transport.sent
+    await rpc.store.close()
+
+
+async def test_store_is_bound_to_its_chain(tmp_path):
+    store = DiskStore(tmp_path, chain_id="mocha-4")
+    await store.put("header.GetByHeight", "[1]", '{"height":1}')
+    await store.close()
+
+    store = DiskStore(tmp_path, chain_id="celestia")
+    with pytest.raises(ValueError, match="mocha-4"):
+        await store.get("header.GetByHeight", "[1]")
+    await store.close()
+
+    store = DiskStore(tmp_path)
+    with pytest.raises(ValueError, match="mocha-4"):
+        await store.bind("celestia")
+    await store.bind("mocha-4")
+    assert await store.get("header.GetByHeight", "[1]") == b'{"height":1}'
+    await store.close()
+
+
+async def test_client_binds_and_closes_its_store(tmp_path):
+    async with StandInNode(block_time=None, chain_id="mocha-4") as node:
+        client = Client(node.url, store=tmp_path)
+        async with client.connect() as api:
+            await api.header.get_by_height(1)
+            assert client.store.chain_id == "mocha-4"
+        assert client.store._executor is None
+
+    async with StandInNode(block_time=None, chain_id="celestia") as node:
+        with pytest.raises(ValueError, match="mocha-4"):
+            async with Client(node.url, store=tmp_path).connect():
+                pass
@@ -0,0 +1,45 @@
+"""
+Tests for the batching blob submission queue.
+"""
+
+import asyncio
+
+from pylestia.node_api import Client
+from pylestia.node_api.submitter import BlobSubmitter
+from pylestia.testing import StandInNode
+from pylestia.types import Blob
+from pylestia.types.errors import is_transient_error
+
+
+async def test_blobs_are_batched_and_retried():
+    assert is_transient_error("account sequence mismatch, expected 5, got 4")
+    assert not is_transient_error("not enough funds")
+    assert not is_transient_error("internal error: broadcast timed out")
+    async with StandInNode(block_time=0.05, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            node.fail("blob.Submit", "account sequence mismatch, expected 5, got 4")
+            blobs = [Blob(b"abc", bytes([index]) * 100) for index in range(25)]
+            async with BlobSubmitter(api.blob, max_delay=0.05, max_blobs=10, backoff=0) as sub:
+                results = await asyncio.gather(*(sub.submit(blob) for blob in blobs))
+
+            assert [result.commitments for result in results] == [
+                (blob.commitment,) for blob in blobs
+            ]
+            assert node.calls["blob.Submit"] == 4
+            assert sub.stats == {"blobs": 25, "transactions": 3, "retries": 1}
+            stored = await api.blob.get(results[-1].height, b"abc", blobs[-1].commitment)
+            assert stored.data == blobs[-1].data
+
+
+async def test_invalid_blobs_fail_alone():
+    async with StandInNode(block_time=0.05, blobs_per_block=0) as node:
+        async with Client(node.url).connect() as api:
+            node.fail("blob.Submit", "invalid namespace type", count=2)
+            submitter = BlobSubmitter(api.blob, max_delay=10, max_blobs=2)
+            first = submitter.put(Blob(b"abc", b"first"))
+            second = submitter.put(Blob(b"abc", b"second"))
+            await submitter.close()
+
+            assert submitter.stats["splits"] == 1
+            assert isinstance(first.exception(), ValueError)
+            assert (await second).height > 0